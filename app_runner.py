@@ -126,6 +126,7 @@ def create_basic_app():
     main_content = '''import tkinter as tk
 from tkinter import ttk
 import psutil
+import queue
 import threading
 import time
 import sys
@@ -258,8 +259,8 @@ class ZioBoosterApp:
         self.status_label.config(text="Status: Manual Optimization Complete", fg="green")
         print(f"Manual optimization result: {result}")
         
-        # Update process list after optimization
-        self.update_process_list()
+        # Refresh the process list off the Tk thread after optimization
+        threading.Thread(target=self.refresh_process_list, daemon=True).start()
         
         # Reset status after a few seconds
         self.root.after(3000, lambda: self.status_label.config(text="Status: Idle", fg="black") if not self.is_running else None)
@@ -273,49 +274,74 @@ class ZioBoosterApp:
     def monitor_system(self):
         """Monitor system and optimize in the background"""
         while self.is_running:
-            # Update process list
-            self.update_process_list()
+            # Queue a fresh process list for the Tk thread
+            self.refresh_process_list()
             time.sleep(5)  # Update every 5 seconds
     
+    def sample_system_info(self):
+        """Sample system metrics off the Tk thread and queue them for the UI"""
+        psutil.cpu_percent(interval=None)
+        while True:
+            try:
+                # interval=None reports usage since the previous call instead of sleeping
+                cpu_percent = psutil.cpu_percent(interval=None)
+                memory_percent = psutil.virtual_memory().percent
+                cpu_temp = None
+                try:
+                    temps = psutil.sensors_temperatures()
+                    if temps and 'coretemp' in temps:
+                        cpu_temp = temps['coretemp'][0].current
+                except:
+                    pass
+                self.metrics_queue.put(('system', (cpu_percent, memory_percent, cpu_temp)))
+            except Exception as e:
+                print(f"Error sampling system info: {e}")
+                self.metrics_queue.put(('system', None))
+            time.sleep(2)
+
     def update_system_info(self):
-        """Update system information labels"""
-        try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory_percent = psutil.virtual_memory().percent
-            
+        """Apply the newest queued samples and process list on the Tk thread"""
+        if not hasattr(self, 'metrics_queue'):
+            self.metrics_queue = queue.Queue()
+            threading.Thread(target=self.sample_system_info, daemon=True).start()
+        
+        sample = False
+        rows = False
+        while not self.metrics_queue.empty():
+            kind, data = self.metrics_queue.get_nowait()
+            if kind == 'system':
+                sample = data
+            elif kind == 'processes':
+                rows = data
+        
+        if rows is not False:
+            self.update_process_list(rows)
+        
+        if sample is None:
+            self.cpu_label.config(text="Error")
+            self.memory_label.config(text="Error")
+            self.temp_label.config(text="Error")
+        elif sample:
+            cpu_percent, memory_percent, cpu_temp = sample
             self.cpu_label.config(text=f"{cpu_percent}%")
             self.memory_label.config(text=f"{memory_percent}%")
             
-            # Attempt to get temperature
-            try:
-                # Try to get temperature from psutil sensors
-                temps = psutil.sensors_temperatures()
-                if temps and 'coretemp' in temps:
-                    cpu_temp = temps['coretemp'][0].current
-                    self.temp_label.config(text=f"{cpu_temp:.1f}°C")
-                else:
-                    # Simulate temperature if not available
-                    simulated_temp = cpu_percent * 0.7 + 20  # Base temperature + load factor
-                    self.temp_label.config(text=f"{simulated_temp:.1f}°C")
-            except:
-                # If temperature sensors are not available, simulate
-                simulated_temp = cpu_percent * 0.7 + 20
+            if cpu_temp is not None:
+                self.temp_label.config(text=f"{cpu_temp:.1f}°C")
+            else:
+                # Simulate temperature if not available
+                simulated_temp = cpu_percent * 0.7 + 20  # Base temperature + load factor
                 self.temp_label.config(text=f"{simulated_temp:.1f}°C")
-        except Exception as e:
-            print(f"Error updating system info: {e}")
-            self.cpu_label.config(text="Error")
-            self.memory_label.config(text="Error")
-            self.temp_label.config(text="Error")
         
-        # Schedule next update
-        self.root.after(2000, self.update_system_info)
+        # Drain the queue again shortly
+        self.root.after(50, self.update_system_info)
 
-    def update_process_list(self):
-        """Update the list of processes, highlighting high-temperature ones"""
-        # Clear existing items
-        for item in self.process_tree.get_children():
-            self.process_tree.delete(item)
-        
+    def refresh_process_list(self):
+        """Read the process list off the Tk thread and queue it for the UI"""
+        self.metrics_queue.put(('processes', self.read_process_list()))
+
+    def read_process_list(self):
+        """Return the top processes by temperature score, or None on error"""
         try:
             # Get all processes with their resource usage
             processes = []
@@ -340,12 +366,23 @@ class ZioBoosterApp:
             
             # Sort by temperature score (resource usage)
             processes.sort(key=lambda x: float(x[4]), reverse=True)
-            
-            # Add top processes to the treeview
-            for i, proc in enumerate(processes[:20]):  # Show top 20 processes
-                self.process_tree.insert("", "end", values=proc)
+            return processes[:20]  # Show top 20 processes
         except Exception as e:
-            print(f"Error updating process list: {e}")
+            print(f"Error reading process list: {e}")
+            return None
+
+    def update_process_list(self, rows):
+        """Update the list of processes, highlighting high-temperature ones"""
+        if rows is None:
+            return
+        
+        # Clear existing items
+        for item in self.process_tree.get_children():
+            self.process_tree.delete(item)
+        
+        # Add top processes to the treeview
+        for proc in rows:
+            self.process_tree.insert("", "end", values=proc)
     
     def run(self):
         """Run the application"""
@@ -0,0 +1,173 @@
+"""
+Benchmark harness for Zio-Booster FPS Booster
+Registers benchmarks, times them with perf_counter_ns, optionally measures their
+allocations with tracemalloc, and compares JSON results across commits
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+# name -> (group, setup, number, repeat, memory)
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup function when a benchmark cannot run here (missing library, no sensors)"""
+
+
+def benchmark(name: str, group: str, number: int = 10, repeat: int = 5, memory: bool = False):
+    """
+    Register a benchmark. The decorated setup function receives the run
+    parameters and returns the callable to time; it may also return a
+    (callable, teardown) pair. With memory=True one extra call is traced
+    and the memory its return value keeps alive is reported too.
+    """
+    def register(setup: Callable):
+        BENCHMARKS[name] = (group, setup, number, repeat, memory)
+        return setup
+    return register
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def time_callable(function: Callable, number: int, repeat: int, warmup: int = 1) -> List[float]:
+    """Seconds per call for each of repeat rounds of number calls"""
+    for _ in range(warmup):
+        function()
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            function()
+        rounds.append((time.perf_counter_ns() - start) / number / 1e9)
+    return rounds
+
+
+def measure_memory(function: Callable) -> Dict[str, int]:
+    """Bytes and blocks still held by one call's result, and the call's peak traced memory"""
+    tracemalloc.start()
+    try:
+        ignore_tracemalloc = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        before = tracemalloc.take_snapshot().filter_traces(ignore_tracemalloc)
+        if hasattr(tracemalloc, 'reset_peak'):
+            # Python 3.9+; earlier versions report the peak since start()
+            tracemalloc.reset_peak()
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(ignore_tracemalloc)
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    del result
+    return {
+        'retained_bytes': sum(stat.size_diff for stat in stats),
+        'retained_blocks': sum(stat.count_diff for stat in stats),
+        'peak_bytes': peak
+    }
+
+
+def run_benchmarks(params: Dict, name_filter: Optional[str] = None, repeat: Optional[int] = None,
+                   quick: bool = False) -> Dict:
+    """Run every registered benchmark whose name contains name_filter"""
+    results = {}
+    for name, (group, setup, number, default_repeat, memory) in sorted(BENCHMARKS.items()):
+        if name_filter and name_filter not in name:
+            continue
+        rounds = repeat or default_repeat
+        if quick:
+            number, rounds = max(1, number // 5), min(rounds, 3)
+
+        teardown = None
+        try:
+            prepared = setup(params)
+            function, teardown = prepared if isinstance(prepared, tuple) else (prepared, None)
+            timings = time_callable(function, number, rounds)
+            allocations = measure_memory(function) if memory else {}
+        except SkipBenchmark as e:
+            results[name] = {'group': group, 'skipped': str(e)}
+            print(f"{name:40s} skipped: {e}")
+            continue
+        except Exception as e:
+            results[name] = {'group': group, 'error': repr(e)}
+            print(f"{name:40s} error: {e!r}")
+            continue
+        finally:
+            if teardown:
+                teardown()
+
+        median = statistics.median(timings)
+        results[name] = {
+            'group': group,
+            'number': number,
+            'repeat': rounds,
+            'min_s': min(timings),
+            'median_s': median,
+            'mean_s': statistics.fmean(timings),
+            'stdev_s': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            'ops_per_s': 1.0 / median if median else 0.0,
+            **allocations
+        }
+        print(f"{name:40s} {median * 1e6:12.1f} us/op  (min {min(timings) * 1e6:.1f}, {rounds}x{number})")
+        if allocations:
+            print(f"{'':40s} {allocations['retained_bytes'] / 1024:12.1f} KB kept in "
+                  f"{allocations['retained_blocks']} blocks, peak {allocations['peak_bytes'] / 1024:.1f} KB")
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.time(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'params': params
+        },
+        'results': results
+    }
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Compare median times benchmark by benchmark. A benchmark regresses when
+    its median is more than threshold slower than the baseline and the
+    difference is larger than the baseline's own round-to-round spread.
+    """
+    rows = []
+    for name, result in sorted(current['results'].items()):
+        base = baseline['results'].get(name)
+        if not base or 'median_s' not in base or 'median_s' not in result:
+            continue
+        ratio = result['median_s'] / base['median_s'] if base['median_s'] else float('inf')
+        noise = 2 * base.get('stdev_s', 0.0)
+        slower = result['median_s'] - base['median_s']
+        rows.append({
+            'name': name,
+            'baseline_s': base['median_s'],
+            'current_s': result['median_s'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold and slower > noise,
+            'improvement': ratio < 1 - threshold and -slower > noise
+        })
+    return rows
+
+
+def load_results(path: str) -> Dict:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_results(results: Dict, path: str):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
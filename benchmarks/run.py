@@ -0,0 +1,69 @@
+"""
+Command line runner for the Zio-Booster benchmark suite
+Writes results as JSON and compares them with a baseline from another commit
+"""
+import argparse
+import os
+import sys
+
+# Allow running as a script from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import compare_results, load_results, run_benchmarks, save_results
+import benchmarks.suite  # noqa: F401  registers the benchmarks
+
+
+def print_comparison(rows, threshold: float):
+    """Print baseline and current medians side by side"""
+    print(f"\n{'benchmark':40s} {'baseline':>12s} {'current':>12s} {'change':>8s}")
+    for row in rows:
+        change = (row['ratio'] - 1) * 100
+        marker = "  REGRESSION" if row['regression'] else ("  faster" if row['improvement'] else "")
+        print(f"{row['name']:40s} {row['baseline_s'] * 1e6:10.1f}us {row['current_s'] * 1e6:10.1f}us "
+              f"{change:+7.1f}%{marker}")
+    regressions = [row for row in rows if row['regression']]
+    print(f"\n{len(regressions)} regression(s) above {threshold * 100:.0f}%")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Zio-Booster benchmark suite")
+    parser.add_argument('--process-count', type=int, default=500, help="Synthetic process table size")
+    parser.add_argument('--profile-count', type=int, default=200, help="Game profiles to save and load")
+    parser.add_argument('--training-rows', type=int, default=500, help="AI training rows")
+    parser.add_argument('--ledger-entries', type=int, default=5000, help="Ledger entries to verify")
+    parser.add_argument('--seed', type=int, default=1, help="Seed for synthetic data")
+    parser.add_argument('--filter', help="Only run benchmarks whose name contains this text")
+    parser.add_argument('--repeat', type=int, help="Override the number of timing rounds")
+    parser.add_argument('--quick', action='store_true', help="Fewer calls and rounds, for a smoke run")
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--compare', metavar='BASELINE', help="Compare with results saved from another commit")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    params = {
+        'process_count': args.process_count,
+        'profile_count': args.profile_count,
+        'training_rows': args.training_rows,
+        'ledger_entries': args.ledger_entries,
+        'seed': args.seed
+    }
+    results = run_benchmarks(params, name_filter=args.filter, repeat=args.repeat, quick=args.quick)
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        if baseline['meta'].get('params') != params:
+            print(f"Warning: baseline was run with {baseline['meta'].get('params')}")
+        print(f"Comparing with {baseline['meta'].get('commit')}")
+        if print_comparison(compare_results(baseline, results, args.threshold), args.threshold):
+            return 1
+    return 0
+
+
+# Example usage
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+"""
+Benchmarks for the Zio-Booster sampling and optimization hot paths
+"""
+import os
+import random
+import shutil
+import tempfile
+
+from benchmarks.harness import SkipBenchmark, benchmark
+from benchmarks.synthetic import make_process_table, synthetic_process_iter
+
+
+def _temp_dir():
+    path = tempfile.mkdtemp(prefix="zio_bench_")
+    return path, lambda: shutil.rmtree(path, ignore_errors=True)
+
+
+# Process scans
+
+@benchmark('process_scan.live', 'process_scan', number=3, repeat=5)
+def process_scan_live(params):
+    """Score every process on this machine"""
+    from utils.temperature_monitor import TemperatureMonitor
+    return TemperatureMonitor().get_process_temperatures
+
+
+@benchmark('process_scan.synthetic', 'process_scan', number=10, repeat=5)
+def process_scan_synthetic(params):
+    """Score a synthetic table of process_count processes"""
+    from utils.temperature_monitor import TemperatureMonitor
+    monitor = TemperatureMonitor()
+    table = make_process_table(params['process_count'], params['seed'])
+
+    def run():
+        with synthetic_process_iter(table):
+            monitor.get_process_temperatures()
+    return run
+
+
+@benchmark('process_scan.procfs', 'process_scan', number=2, repeat=3)
+def process_scan_procfs(params):
+    """Score process_count processes parsed by psutil from a synthetic /proc tree"""
+    from utils.procfs_fixture import ProcfsFixture
+    from utils.temperature_monitor import TemperatureMonitor
+    fixture = ProcfsFixture(process_count=params['process_count'], seed=params['seed'])
+    monitor = TemperatureMonitor(sys_root=fixture.sys_root)
+
+    def run():
+        with fixture.activate():
+            monitor.get_process_temperatures()
+    return run, fixture.cleanup
+
+
+@benchmark('process_rows.dicts', 'process_rows', number=10, repeat=5, memory=True)
+def process_rows_dicts(params):
+    """Score process_count rows kept as as_dict() copies, as scans did before ProcessRecord"""
+    table = make_process_table(params['process_count'], params['seed'])
+    attrs = ['pid', 'name', 'cpu_percent', 'memory_percent', 'memory_info']
+
+    def run():
+        rows = []
+        for info in table:
+            row = {attr: info[attr] for attr in attrs}
+            row['temperature_score'] = round(min(100, row['cpu_percent'] * 0.7
+                                                 + row['memory_info'].rss / 1024 / 1024 / 100 * 0.3), 2)
+            rows.append(row)
+        return rows
+    return run
+
+
+@benchmark('process_rows.records', 'process_rows', number=10, repeat=5, memory=True)
+def process_rows_records(params):
+    """Score process_count rows into slotted ProcessRecords, straight from process_iter's info dicts"""
+    from utils.temperature_monitor import ProcessRecord
+    table = make_process_table(params['process_count'], params['seed'])
+
+    def run():
+        return [ProcessRecord.from_info(info) for info in table]
+    return run
+
+
+@benchmark('snapshot.history', 'snapshot', number=5, repeat=3, memory=True)
+def snapshot_history(params):
+    """An hour of one-second PerformanceSnapshots in a BoundedHistory"""
+    from utils.bounded_history import BoundedHistory
+    from utils.performance_metrics import PerformanceSnapshot
+
+    def run():
+        history = BoundedHistory(capacity=3600)
+        for second in range(3600):
+            history.append(PerformanceSnapshot(float(second), 35.0 + second % 7, 60.0, None, 1e6 * second,
+                                               2e6 * second, 1e5 * second, 4e5 * second, 310, 0), timestamp=second)
+        return history
+    return run
+
+
+@benchmark('thermal.storm', 'thermal', number=5, repeat=3)
+def thermal_storm(params):
+    """One simulated second of a thermal storm followed by a temperature read"""
+    from utils.procfs_fixture import ProcfsFixture
+    from utils.temperature_monitor import TemperatureMonitor
+    fixture = ProcfsFixture(process_count=params['process_count'], seed=params['seed'])
+    fixture.thermal_storm(duration=3600, extra=40)
+    monitor = TemperatureMonitor(sys_root=fixture.sys_root)
+
+    def run():
+        fixture.advance(1.0)
+        monitor.get_cpu_temperature()
+    return run, fixture.cleanup
+
+
+# Snapshot capture
+
+@benchmark('snapshot.capture', 'snapshot', number=1, repeat=3)
+def snapshot_capture(params):
+    """PerformanceMetrics.capture_snapshot, including its blocking CPU sample"""
+    from utils.performance_metrics import PerformanceMetrics
+    return PerformanceMetrics().capture_snapshot
+
+
+# Native versus psutil reads
+
+@benchmark('system_info.psutil', 'system_info', number=200, repeat=5)
+def system_info_psutil(params):
+    """Non-blocking psutil CPU, memory and temperature read used by the sampler"""
+    from utils.metrics_sampler import read_system_metrics
+    return read_system_metrics
+
+
+@benchmark('system_info.native', 'system_info', number=200, repeat=5)
+def system_info_native(params):
+    """Same read through the C++ library"""
+    try:
+        from utils.fast_optimizer import get_fast_optimizer
+    except Exception as e:
+        raise SkipBenchmark(f"C++ library unavailable: {e}")
+    return get_fast_optimizer().get_system_info_fast
+
+
+# AI inference and training
+
+def _trained_ai_optimizer(params, directory):
+    try:
+        from utils.ai_optimizer import AIOptimizer
+    except ImportError as e:
+        raise SkipBenchmark(f"AI dependencies unavailable: {e}")
+
+    # The optimizer reads and writes its model files in the working directory
+    previous = os.getcwd()
+    os.chdir(directory)
+    try:
+        optimizer = AIOptimizer(model_path=os.path.join(directory, "ai_model.pkl"))
+    finally:
+        os.chdir(previous)
+    optimizer.scaler_path = os.path.join(directory, "ai_scaler.pkl")
+    optimizer.data_path = os.path.join(directory, "ai_training_data.json")
+
+    rng = random.Random(params['seed'])
+    optimizer.training_data = [
+        [rng.uniform(0, 100), rng.uniform(20, 95), rng.uniform(10, 90), rng.uniform(0, 1e9),
+         rng.uniform(0, 1e9), rng.randint(150, 450), rng.uniform(1, 16), rng.uniform(10, 500),
+         rng.uniform(0, 86400)]
+        for _ in range(params['training_rows'])
+    ]
+    optimizer.train_model()
+    return optimizer
+
+
+@benchmark('ai.inference', 'ai', number=50, repeat=5)
+def ai_inference(params):
+    """Anomaly prediction and recommendations for one feature vector"""
+    directory, cleanup = _temp_dir()
+    try:
+        optimizer = _trained_ai_optimizer(params, directory)
+    except SkipBenchmark:
+        cleanup()
+        raise
+    features = optimizer.training_data[0]
+
+    def run():
+        optimizer.predict_anomaly(features)
+        optimizer.get_optimization_recommendation(features)
+    return run, cleanup
+
+
+@benchmark('ai.training', 'ai', number=1, repeat=3)
+def ai_training(params):
+    """Fit the scaler and isolation forest on training_rows rows and save them"""
+    directory, cleanup = _temp_dir()
+    try:
+        optimizer = _trained_ai_optimizer(params, directory)
+    except SkipBenchmark:
+        cleanup()
+        raise
+    return optimizer.train_model, cleanup
+
+
+# Policy replay
+
+@benchmark('policy.replay', 'policy', number=3, repeat=3)
+def policy_replay(params):
+    """Replay a two-hour synthetic trace through the optimization policy"""
+    from utils.trace_replay import read_trace, replay, synthetic_trace
+    directory, cleanup = _temp_dir()
+    path = os.path.join(directory, "session.trace")
+    synthetic_trace(path, hours=2.0, seed=params['seed'])
+    events = read_trace(path)
+    return (lambda: replay(events)), cleanup
+
+
+# Profiles
+
+def _profile_manager(params, directory):
+    from utils.profile_manager import GameProfile, ProfileManager
+    manager = ProfileManager(profiles_file=os.path.join(directory, "game_profiles.json"))
+    for i in range(params['profile_count']):
+        manager.profiles[f"Game {i}"] = GameProfile(
+            name=f"Game {i}",
+            executable_path=f"/opt/games/game{i}/game{i}.exe",
+            temp_threshold=60.0 + i % 20
+        )
+    manager.save_profiles()
+    return manager
+
+
+@benchmark('profiles.save', 'profiles', number=20, repeat=5)
+def profiles_save(params):
+    """Write profile_count profiles to disk"""
+    directory, cleanup = _temp_dir()
+    manager = _profile_manager(params, directory)
+    return manager.save_profiles, cleanup
+
+
+@benchmark('profiles.bulk_update', 'profiles', number=5, repeat=5)
+def profiles_bulk_update(params):
+    """Update every profile, then flush the batched changes once"""
+    directory, cleanup = _temp_dir()
+    manager = _profile_manager(params, directory)
+    names = list(manager.profiles)
+
+    def run():
+        for name in names:
+            manager.update_profile(name, temp_threshold=65.0)
+        manager.flush()
+    return run, cleanup
+
+
+@benchmark('profiles.load', 'profiles', number=20, repeat=5)
+def profiles_load(params):
+    """Read profile_count profiles from disk"""
+    directory, cleanup = _temp_dir()
+    manager = _profile_manager(params, directory)
+    return manager.load_profiles, cleanup
+
+
+
+def _profile_store_manager(params, directory):
+    from utils.profile_store import SqliteProfileStore
+    manager = _profile_manager(params, directory)
+    store = SqliteProfileStore(os.path.join(directory, "profiles.db"))
+    store.import_json(manager.profiles_file)
+    store.close()
+    return store.path
+
+
+@benchmark('profiles.store_open', 'profiles', number=20, repeat=5)
+def profiles_store_open(params):
+    """Open a SQLite store of profile_count profiles (profiles load lazily)"""
+    from utils.profile_manager import ProfileManager
+    directory, cleanup = _temp_dir()
+    path = _profile_store_manager(params, directory)
+    return (lambda: ProfileManager(profiles_file=path)), cleanup
+
+
+@benchmark('profiles.store_match', 'profiles', number=200, repeat=5)
+def profiles_store_match(params):
+    """Match an executable against a SQLite store of profile_count profiles"""
+    from utils.profile_manager import ProfileManager
+    directory, cleanup = _temp_dir()
+    manager = ProfileManager(profiles_file=_profile_store_manager(params, directory))
+    exe = f"/opt/games/game{params['profile_count'] - 1}/game{params['profile_count'] - 1}.exe"
+    return (lambda: manager.match_executable(exe, "")), cleanup
+
+# Ledger
+
+@benchmark('ledger.append', 'ledger', number=1000, repeat=5)
+def ledger_append(params):
+    """Append one performance record to the hash-chained ledger"""
+    from utils.performance_ledger import PerformanceLedger
+    directory, cleanup = _temp_dir()
+    ledger = PerformanceLedger(os.path.join(directory, "ledger.jsonl"))
+    record = {'optimization_type': 'benchmark', 'cpu_percent': 42.5, 'memory_percent': 61.0,
+              'terminated': [1001, 1002], 'duration': 0.125}
+
+    def teardown():
+        ledger.close()
+        cleanup()
+    return (lambda: ledger.append(record)), teardown
+
+
+@benchmark('ledger.verify_full', 'ledger', number=1, repeat=5)
+def ledger_verify_full(params):
+    """Re-verify every entry of a ledger with ledger_entries entries"""
+    from utils.performance_ledger import PerformanceLedger
+    directory, cleanup = _temp_dir()
+    ledger = PerformanceLedger(os.path.join(directory, "ledger.jsonl"))
+    for i in range(params['ledger_entries']):
+        ledger.append({'index': i, 'cpu_percent': i % 100})
+    ledger.flush()
+
+    def teardown():
+        ledger.close()
+        cleanup()
+    return (lambda: ledger.verify(full=True)), teardown
+
+
+# UI refresh
+
+def _ranked_ticks(params, ticks: int = 50, visible: int = 20, churn: float = 0.3):
+    """Top-N process rows for a sequence of ticks in which a share of processes change"""
+    rng = random.Random(params['seed'])
+    table = make_process_table(params['process_count'], params['seed'])
+    cpu = {row['pid']: row['cpu_percent'] for row in table}
+    names = {row['pid']: row['name'] for row in table}
+    sequence = []
+    for _ in range(ticks):
+        for pid in cpu:
+            if rng.random() < churn:
+                cpu[pid] = max(0.0, cpu[pid] + rng.gauss(0, 2))
+        ranked = sorted(cpu.items(), key=lambda item: item[1], reverse=True)[:visible]
+        sequence.append([(names[pid], pid, f"{value:.1f}", "1.0", f"{value * 0.7:.1f}") for pid, value in ranked])
+    return sequence
+
+
+@benchmark('ui.refresh.full_rebuild', 'ui', number=50, repeat=5)
+def ui_refresh_full_rebuild(params):
+    """Original Treeview refresh: delete every row, insert the new ones"""
+    from ui.process_table import CountingTree, replace_all_rows
+    tree = CountingTree()
+    ticks = _ranked_ticks(params)
+    state = {'tick': 0}
+
+    def run():
+        replace_all_rows(tree, ticks[state['tick'] % len(ticks)])
+        state['tick'] += 1
+    return run
+
+
+@benchmark('ui.refresh.keyed_diff', 'ui', number=50, repeat=5)
+def ui_refresh_keyed_diff(params):
+    """Keyed Treeview diff"""
+    from ui.process_table import CountingTree, ProcessTreeUpdater
+    updater = ProcessTreeUpdater(CountingTree())
+    ticks = _ranked_ticks(params)
+    state = {'tick': 0}
+
+    def run():
+        updater.update(ticks[state['tick'] % len(ticks)])
+        state['tick'] += 1
+    return run
+
+
+@benchmark('ui.render_frame', 'ui', number=200, repeat=5)
+def ui_render_frame(params):
+    """Twelve label updates coalesced into one frame"""
+    from ui.render_scheduler import CountingWidget, FrameRenderer, ManualRoot
+    root = ManualRoot()
+    renderer = FrameRenderer(root)
+    widgets = [CountingWidget() for _ in range(6)]
+    rng = random.Random(params['seed'])
+    values = [rng.randint(0, 100) for _ in range(1000)]
+    state = {'tick': 0}
+
+    def run():
+        tick = state['tick']
+        for i in range(12):
+            renderer.set(widgets[i % 6], text=f"{values[(tick + i) % 1000]}%")
+        root.run_pending()
+        state['tick'] += 1
+    return run
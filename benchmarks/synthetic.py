@@ -0,0 +1,79 @@
+"""
+Synthetic process tables for Zio-Booster benchmarks
+Generates reproducible process lists and serves them through psutil.process_iter
+"""
+import random
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Dict, List
+
+import psutil
+
+MemoryInfo = namedtuple('MemoryInfo', ['rss', 'vms'])
+
+PROCESS_NAMES = ['chrome', 'firefox', 'steam', 'discord', 'code', 'python3', 'java', 'node',
+                 'Xorg', 'pulseaudio', 'systemd', 'kworker', 'game.exe', 'obs', 'spotify']
+
+
+class SyntheticProcess:
+    """Stand-in for psutil.Process exposing the attributes the optimizer reads"""
+    __slots__ = ('pid', '_info', 'info')
+
+    def __init__(self, info: Dict):
+        self.pid = info['pid']
+        self._info = info
+        self.info = {}
+
+    def as_dict(self, attrs=None):
+        if attrs is None:
+            return dict(self._info)
+        return {attr: self._info.get(attr) for attr in attrs}
+
+    def name(self):
+        return self._info['name']
+
+    def cpu_percent(self, interval=None):
+        return self._info['cpu_percent']
+
+    def memory_percent(self):
+        return self._info['memory_percent']
+
+    def nice(self, value=None):
+        return 0
+
+
+def make_process_table(count: int, seed: int = 1) -> List[Dict]:
+    """Process rows shaped like psutil.Process.as_dict() output"""
+    rng = random.Random(seed)
+    table = []
+    for i in range(count):
+        rss = int(rng.lognormvariate(17, 1.5))
+        table.append({
+            'pid': 1000 + i,
+            'name': f"{rng.choice(PROCESS_NAMES)}-{i}",
+            'cpu_percent': round(rng.expovariate(0.2), 1),
+            'memory_percent': round(rss / (16 * 1024 ** 3) * 100, 3),
+            'memory_info': MemoryInfo(rss=rss, vms=rss * 2),
+            'username': rng.choice(['root', 'user']),
+            'status': 'running'
+        })
+    return table
+
+
+@contextmanager
+def synthetic_process_iter(table: List[Dict]):
+    """Temporarily make psutil.process_iter yield the synthetic table"""
+    original = psutil.process_iter
+
+    def process_iter(attrs=None, ad_value=None):
+        for row in table:
+            process = SyntheticProcess(row)
+            if attrs is not None:
+                process.info = process.as_dict(attrs)
+            yield process
+
+    psutil.process_iter = process_iter
+    try:
+        yield
+    finally:
+        psutil.process_iter = original
@@ -9,6 +9,7 @@ typedef struct PerformanceOptimizer PerformanceOptimizer;
 
 PerformanceOptimizer* create_optimizer();
 void destroy_optimizer(PerformanceOptimizer* opt);
+void set_fs_roots(PerformanceOptimizer* opt, const char* proc_root, const char* sys_root);
 double get_system_memory_usage(PerformanceOptimizer* opt);
 double get_system_load(PerformanceOptimizer* opt);
 double get_cpu_temperature(PerformanceOptimizer* opt);
@@ -18,6 +18,28 @@ class PerformanceOptimizer {
 private:
     std::vector<int> process_ids;
     bool gaming_mode = false;
+    // Roots of the proc and sys filesystems; tests point them at a fixture tree
+    std::string proc_root = "/proc";
+    std::string sys_root = "/sys";
+    
+    bool roots_redirected() const {
+        return proc_root != "/proc";
+    }
+    
+    // Read a "Key:  value kB" field from meminfo under proc_root
+    long long read_meminfo_kb(const std::string& key) {
+        std::ifstream meminfo(proc_root + "/meminfo");
+        std::string line;
+        while (std::getline(meminfo, line)) {
+            if (line.compare(0, key.size() + 1, key + ":") == 0) {
+                std::istringstream iss(line.substr(key.size() + 1));
+                long long value = 0;
+                iss >> value;
+                return value;
+            }
+        }
+        return 0;
+    }
     
 public:
     PerformanceOptimizer() {
@@ -25,8 +47,18 @@ public:
         setpriority(PRIO_PROCESS, 0, -10);
     }
     
+    // Read system state from another proc/sys tree instead of the live one
+    void set_fs_roots(const std::string& proc, const std::string& sys) {
+        proc_root = proc;
+        sys_root = sys;
+    }
+    
     // Get system memory info in MB
     double get_system_memory_usage() {
+        if (roots_redirected()) {
+            return (read_meminfo_kb("MemTotal") - read_meminfo_kb("MemFree")) / 1024.0;
+        }
+        
         struct sysinfo memInfo;
         sysinfo(&memInfo);
         
@@ -42,6 +74,13 @@ public:
     
     // Get system load average
     double get_system_load() {
+        if (roots_redirected()) {
+            std::ifstream loadFile(proc_root + "/loadavg");
+            double load = 0.0;
+            loadFile >> load;
+            return load;
+        }
+        
         double loadavg[3];
         if (getloadavg(loadavg, 3) != -1) {
             return loadavg[0]; // 1-minute average
@@ -51,7 +90,7 @@ public:
     
     // Get CPU temperature (Linux)
     double get_cpu_temperature() {
-        std::ifstream tempFile("/sys/class/thermal/thermal_zone0/temp");
+        std::ifstream tempFile(sys_root + "/class/thermal/thermal_zone0/temp");
         if (!tempFile.is_open()) {
             return 0.0;
         }
@@ -70,7 +109,7 @@ public:
     
     // Get process CPU usage (simplified)
     double get_process_cpu_usage(int pid) {
-        std::string statPath = "/proc/" + std::to_string(pid) + "/stat";
+        std::string statPath = proc_root + "/" + std::to_string(pid) + "/stat";
         std::ifstream statFile(statPath);
         
         if (!statFile.is_open()) {
@@ -199,6 +238,10 @@ public:
     
     // Get available memory in MB
     double get_available_memory() {
+        if (roots_redirected()) {
+            return read_meminfo_kb("MemFree") / 1024.0;
+        }
+        
         struct sysinfo memInfo;
         sysinfo(&memInfo);
         
@@ -210,6 +253,10 @@ public:
     
     // Get total memory in MB
     double get_total_memory() {
+        if (roots_redirected()) {
+            return read_meminfo_kb("MemTotal") / 1024.0;
+        }
+        
         struct sysinfo memInfo;
         sysinfo(&memInfo);
         
@@ -221,7 +268,7 @@ public:
     
     // Get CPU usage percentage
     double get_cpu_usage() {
-        std::ifstream statFile("/proc/stat");
+        std::ifstream statFile(proc_root + "/stat");
         if (!statFile.is_open()) return 0.0;
         
         std::string line;
@@ -265,7 +312,7 @@ public:
     
     // Get system uptime in seconds
     double get_system_uptime() {
-        std::ifstream uptimeFile("/proc/uptime");
+        std::ifstream uptimeFile(proc_root + "/uptime");
         if (!uptimeFile.is_open()) return 0.0;
         
         double uptime;
@@ -290,6 +337,10 @@ extern "C" {
         delete static_cast<struct PerformanceOptimizer*>(opt);
     }
     
+    void set_fs_roots(PerformanceOptimizer* opt, const char* proc_root, const char* sys_root) {
+        reinterpret_cast<PerformanceOptimizer*>(opt)->set_fs_roots(proc_root, sys_root);
+    }
+    
     double get_system_memory_usage(PerformanceOptimizer* opt) {
         return reinterpret_cast<PerformanceOptimizer*>(opt)->get_system_memory_usage();
     }
@@ -11,6 +11,7 @@ cdef extern from "cpp_performance.h":
 
     cdef PerformanceOptimizer* create_optimizer()
     cdef void destroy_optimizer(PerformanceOptimizer* opt)
+    cdef void set_fs_roots(PerformanceOptimizer* opt, const char* proc_root, const char* sys_root)
     cdef double get_system_memory_usage(PerformanceOptimizer* opt)
     cdef double get_system_load(PerformanceOptimizer* opt)
     cdef double get_cpu_temperature(PerformanceOptimizer* opt)
@@ -32,6 +33,9 @@ cdef class PyPerformanceOptimizer:
         if self.thisptr:
             destroy_optimizer(self.thisptr)
     
+    def set_fs_roots(self, proc_root, sys_root):
+        set_fs_roots(self.thisptr, proc_root.encode(), sys_root.encode())
+    
     def get_system_memory_usage(self):
         return get_system_memory_usage(self.thisptr)
     
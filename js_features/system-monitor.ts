@@ -5,8 +5,8 @@
 interface SystemMetrics {
   cpuUsage: number;
   memoryUsage: number;
-  diskUsage: number;
-  networkUsage: number;
+  diskUsage: number;     // MB/s read + written
+  networkUsage: number;  // MB/s sent + received
   timestamp: Date;
   processCount: number;
   temperature?: number;
@@ -18,67 +18,102 @@ interface OptimizationResult {
   performanceBoost: number;
 }
 
+/**
+ * Snapshot fields pushed by the Python metrics stream (utils/metrics_stream.py)
+ */
+interface StreamSnapshot {
+  timestamp: number;
+  cpu_percent: number;
+  memory_percent: number;
+  cpu_temp: number | null;
+  disk_io_read: number;
+  disk_io_write: number;
+  network_sent: number;
+  network_recv: number;
+  processes_count: number;
+  active_optimizations: number;
+}
+
 class WebSystemMonitor {
   private metricsHistory: SystemMetrics[] = [];
   private isMonitoring: boolean = false;
-  private updateInterval: number | null = null;
+  private eventSource: EventSource | null = null;
+  private state: Partial<StreamSnapshot> = {};
+  private lastTimestamp: number | null = null;
   private readonly maxHistory: number = 100;
 
+  constructor(private readonly streamUrl: string = 'http://127.0.0.1:8765/events') {}
+
   /**
    * Start monitoring system metrics
+   * The server pushes a full snapshot on connect and deltas afterwards
    */
   startMonitoring(): void {
     if (this.isMonitoring) return;
     
     this.isMonitoring = true;
-    console.log('Starting system monitoring...');
+    console.log(`Starting system monitoring from ${this.streamUrl}...`);
     
-    this.updateInterval = window.setInterval(() => {
-      const metrics = this.collectMetrics();
-      this.metricsHistory.push(metrics);
-      
-      // Keep history within limits
-      if (this.metricsHistory.length > this.maxHistory) {
-        this.metricsHistory.shift();
-      }
-      
-      this.updateUI(metrics);
-    }, 1000); // Update every second
+    this.eventSource = new EventSource(this.streamUrl);
+    this.eventSource.addEventListener('snapshot', (event) => {
+      this.state = JSON.parse((event as MessageEvent).data);
+      this.applyState();
+    });
+    this.eventSource.addEventListener('delta', (event) => {
+      Object.assign(this.state, JSON.parse((event as MessageEvent).data));
+      this.applyState();
+    });
+    this.eventSource.onerror = () => {
+      // EventSource reconnects by itself and receives a fresh snapshot
+      console.warn('Metrics stream disconnected, reconnecting...');
+    };
   }
 
   /**
    * Stop monitoring system metrics
    */
   stopMonitoring(): void {
-    if (this.updateInterval) {
-      clearInterval(this.updateInterval);
-      this.updateInterval = null;
+    if (this.eventSource) {
+      this.eventSource.close();
+      this.eventSource = null;
     }
     this.isMonitoring = false;
     console.log('Stopped system monitoring');
   }
 
   /**
-   * Collect simulated system metrics
-   * In a real implementation, this would call an API
+   * Record and display the current stream state
    */
-  private collectMetrics(): SystemMetrics {
-    // Simulate metrics collection
-    const cpuUsage = Math.min(100, Math.max(0, 20 + Math.random() * 60));
-    const memoryUsage = Math.min(100, Math.max(0, 30 + Math.random() * 50));
-    const diskUsage = Math.min(100, Math.max(0, 40 + Math.random() * 40));
-    const networkUsage = Math.min(100, Math.max(0, 10 + Math.random() * 30));
-    const processCount = Math.floor(50 + Math.random() * 100);
-    const temperature = Math.min(100, Math.max(30, 40 + Math.random() * 40));
+  private applyState(): void {
+    const metrics = this.toSystemMetrics(this.state);
+    this.metricsHistory.push(metrics);
+    
+    // Keep history within limits
+    if (this.metricsHistory.length > this.maxHistory) {
+      this.metricsHistory.shift();
+    }
+    
+    this.updateUI(metrics);
+  }
+
+  /**
+   * Convert a stream snapshot into display metrics
+   * Disk and network counters are bytes since the previous sample, shown as MB/s
+   */
+  private toSystemMetrics(snapshot: Partial<StreamSnapshot>): SystemMetrics {
+    const timestamp = snapshot.timestamp ?? Date.now() / 1000;
+    const elapsed = this.lastTimestamp !== null ? Math.max(timestamp - this.lastTimestamp, 0.001) : 1;
+    this.lastTimestamp = timestamp;
+    const toRate = (bytes: number) => parseFloat((bytes / 1048576 / elapsed).toFixed(2));
 
     return {
-      cpuUsage: parseFloat(cpuUsage.toFixed(2)),
-      memoryUsage: parseFloat(memoryUsage.toFixed(2)),
-      diskUsage: parseFloat(diskUsage.toFixed(2)),
-      networkUsage: parseFloat(networkUsage.toFixed(2)),
-      timestamp: new Date(),
-      processCount,
-      temperature
+      cpuUsage: snapshot.cpu_percent ?? 0,
+      memoryUsage: snapshot.memory_percent ?? 0,
+      diskUsage: toRate((snapshot.disk_io_read ?? 0) + (snapshot.disk_io_write ?? 0)),
+      networkUsage: toRate((snapshot.network_sent ?? 0) + (snapshot.network_recv ?? 0)),
+      timestamp: new Date(timestamp * 1000),
+      processCount: snapshot.processes_count ?? 0,
+      temperature: snapshot.cpu_temp ?? undefined
     };
   }
 
@@ -96,16 +131,17 @@ class WebSystemMonitor {
     
     if (cpuElement) cpuElement.textContent = `${metrics.cpuUsage}%`;
     if (memoryElement) memoryElement.textContent = `${metrics.memoryUsage}%`;
-    if (diskElement) diskElement.textContent = `${metrics.diskUsage}%`;
-    if (networkElement) networkElement.textContent = `${metrics.networkUsage}%`;
-    if (tempElement) tempElement.textContent = `${metrics.temperature}°C`;
+    if (diskElement) diskElement.textContent = `${metrics.diskUsage} MB/s`;
+    if (networkElement) networkElement.textContent = `${metrics.networkUsage} MB/s`;
+    if (tempElement) tempElement.textContent = metrics.temperature !== undefined ? `${metrics.temperature}°C` : 'N/A';
     if (processElement) processElement.textContent = metrics.processCount.toString();
     
     // Update progress bars
     this.updateProgressBar('cpu-bar', metrics.cpuUsage);
     this.updateProgressBar('memory-bar', metrics.memoryUsage);
-    this.updateProgressBar('disk-bar', metrics.diskUsage);
-    this.updateProgressBar('network-bar', metrics.networkUsage);
+    // Disk and network bars are full at 100 MB/s
+    this.updateProgressBar('disk-bar', Math.min(100, metrics.diskUsage));
+    this.updateProgressBar('network-bar', Math.min(100, metrics.networkUsage));
   }
 
   /**
@@ -208,7 +244,7 @@ class SystemMonitorElement extends HTMLElement {
 
   constructor() {
     super();
-    this.monitor = new WebSystemMonitor();
+    this.monitor = new WebSystemMonitor(this.getAttribute('stream-url') || undefined);
     this.init();
   }
 
@@ -234,16 +270,16 @@ class SystemMonitorElement extends HTMLElement {
           </div>
           
           <div class="metric-card">
-            <h4>Disk Usage</h4>
-            <div class="value" id="disk-usage">0%</div>
+            <h4>Disk I/O</h4>
+            <div class="value" id="disk-usage">0 MB/s</div>
             <div class="progress">
               <div class="progress-bar" id="disk-bar" style="width: 0%"></div>
             </div>
           </div>
           
           <div class="metric-card">
-            <h4>Network Usage</h4>
-            <div class="value" id="network-usage">0%</div>
+            <h4>Network I/O</h4>
+            <div class="value" id="network-usage">0 MB/s</div>
             <div class="progress">
               <div class="progress-bar" id="network-bar" style="width: 0%"></div>
             </div>
@@ -38,6 +38,7 @@ setup(
     entry_points={
         "console_scripts": [
             "zio-booster=src.main:main",
+            "zio-booster-service=src.service:main",
         ],
     },
 )
\ No newline at end of file
@@ -1,27 +1,32 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import psutil
-import threading
-import time
 import sys
 import os
 import random
 import json
 import subprocess
+import threading
 from datetime import datetime
 
 # Add the project root to the path so we can import utilities
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from ui.process_table import ProcessTreeUpdater
+from utils.tracing import traced
+from utils.metrics_sampler import MetricsSampler
+
 class ZioBoosterApp:
     def __init__(self):
         # FPS optimization variables
         self.is_running = False
-        self.monitoring_thread = None
         self.optimization_log = []
         self.system_profiles = {}
         self.current_profile = "default"
         
+        # psutil sampling runs on a producer thread; the Tk thread only drains its queue
+        self.sampler = MetricsSampler(interval=2.0, process_reader=self.read_process_rows, process_interval=5.0)
+        
         # Initialize UI (using basic tkinter for now to avoid dependency issues)
         self.root = tk.Tk()
         self.root.title("Zio-Booster FPS Booster - Advanced Mode")
@@ -133,14 +138,29 @@ class ZioBoosterApp:
             self.process_tree.column(col, width=120)
         
         self.process_tree.pack(fill="both", expand=True, pady=5)
+        self.process_tree_updater = ProcessTreeUpdater(self.process_tree)
         
         # Add scrollbar
         scrollbar = ttk.Scrollbar(temp_frame, orient="vertical", command=self.process_tree.yview)
         self.process_tree.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side="right", fill="y")
         
-        # Update system info periodically
-        self.update_system_info()
+        # Start sampling and drain results on the Tk thread
+        self.sampler.start()
+        self.drain_metrics_queue()
+    
+    def drain_metrics_queue(self):
+        """Apply the latest sampled metrics; runs on the Tk thread"""
+        latest = self.sampler.drain()
+        if 'system' in latest:
+            self.update_system_info(latest['system'])
+        if 'processes' in latest:
+            self.update_process_list(latest['processes'])
+        if 'terminated' in latest:
+            self.finish_terminate_processes(latest['terminated'])
+        
+        # Drain again shortly
+        self.root.after(50, self.drain_metrics_queue)
     
     def start_boosting(self):
         """Start the FPS boosting process"""
@@ -149,13 +169,14 @@ class ZioBoosterApp:
         self.start_button.config(state="disabled")
         self.stop_button.config(state="normal")
         
-        # Start monitoring in a separate thread
-        self.monitoring_thread = threading.Thread(target=self.monitor_system, daemon=True)
-        self.monitoring_thread.start()
+        # Refresh the process list from the sampler while boosting
+        self.sampler.sample_processes = True
+        self.sampler.request_processes()
     
     def stop_boosting(self):
         """Stop the FPS boosting process"""
         self.is_running = False
+        self.sampler.sample_processes = False
         self.status_label.config(text="Status: Stopped", fg="red")
         self.start_button.config(state="normal")
         self.stop_button.config(state="disabled")
@@ -171,7 +192,7 @@ class ZioBoosterApp:
         print(f"Manual optimization result: {result}")
         
         # Update process list after optimization
-        self.update_process_list()
+        self.sampler.request_processes()
         
         # Reset status after a few seconds
         self.root.after(3000, lambda: self.status_label.config(text="Status: Idle", fg="black") if not self.is_running else None)
@@ -186,95 +207,84 @@ class ZioBoosterApp:
         result = messagebox.askquestion("Confirm Action", 
                                        "This will terminate processes using high CPU/Memory resources. Continue?")
         if result == 'yes':
-            terminated_count = self.terminate_high_resource_processes()
-            self.status_label.config(text=f"Status: Terminated {terminated_count} high resource processes", fg="orange")
+            self.status_label.config(text="Status: Terminating high resource processes", fg="orange")
             
-            # Update process list after termination
-            self.update_process_list()
+            # Scanning and waiting on processes takes seconds, so run it off the Tk thread
+            def run_terminate():
+                self.sampler.post('terminated', self.terminate_high_resource_processes())
             
-            # Reset status after a few seconds
-            self.root.after(3000, lambda: self.status_label.config(text="Status: Idle", fg="black") 
-                           if not self.is_running else None)
+            threading.Thread(target=run_terminate, daemon=True).start()
+    
+    def finish_terminate_processes(self, terminated_count):
+        """Report terminated processes; runs on the Tk thread"""
+        self.status_label.config(text=f"Status: Terminated {terminated_count} high resource processes", fg="orange")
+        
+        # Update process list after termination
+        self.sampler.request_processes()
+        
+        # Reset status after a few seconds
+        self.root.after(3000, lambda: self.status_label.config(text="Status: Idle", fg="black") 
+                       if not self.is_running else None)
 
     def on_profile_change(self, event=None):
         """Handle profile selection change"""
         selected_profile = self.profile_var.get()
         self.apply_profile(selected_profile)
     
-    def monitor_system(self):
-        """Monitor system and optimize in the background"""
-        while self.is_running:
-            # Update process list
-            self.update_process_list()
-            time.sleep(5)  # Update every 5 seconds
-    
-    def update_system_info(self):
-        """Update system information labels"""
+    @traced(category="ui")
+    def update_system_info(self, metrics):
+        """Update system information labels from a sampled metrics dict"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory_percent = psutil.virtual_memory().percent
+            cpu_percent = metrics['cpu_percent']
+            memory_percent = metrics['memory_percent']
             
             self.cpu_label.config(text=f"{cpu_percent}%")
             self.memory_label.config(text=f"{memory_percent}%")
             
-            # Attempt to get temperature
-            try:
-                # Try to get temperature from psutil sensors
-                temps = psutil.sensors_temperatures()
-                if temps and 'coretemp' in temps:
-                    cpu_temp = temps['coretemp'][0].current
-                    self.temp_label.config(text=f"{cpu_temp:.1f}°C")
-                else:
-                    # Simulate temperature if not available
-                    simulated_temp = cpu_percent * 0.7 + 20  # Base temperature + load factor
-                    self.temp_label.config(text=f"{simulated_temp:.1f}°C")
-            except:
-                # If temperature sensors are not available, simulate
-                simulated_temp = cpu_percent * 0.7 + 20
+            if metrics['cpu_temp'] is not None:
+                self.temp_label.config(text=f"{metrics['cpu_temp']:.1f}°C")
+            else:
+                # Simulate temperature if not available
+                simulated_temp = cpu_percent * 0.7 + 20  # Base temperature + load factor
                 self.temp_label.config(text=f"{simulated_temp:.1f}°C")
         except Exception as e:
             print(f"Error updating system info: {e}")
             self.cpu_label.config(text="Error")
             self.memory_label.config(text="Error")
             self.temp_label.config(text="Error")
-        
-        # Schedule next update
-        self.root.after(2000, self.update_system_info)
 
-    def update_process_list(self):
+    def read_process_rows(self):
+        """Collect process rows sorted by resource score; runs on the sampler thread"""
+        processes = []
+        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
+            try:
+                # Get CPU and memory usage
+                cpu_usage = proc.info['cpu_percent'] or 0
+                memory_usage = proc.info['memory_percent'] or 0
+                
+                # Calculate a "temperature score" based on resource usage
+                temp_score = cpu_usage * 0.6 + memory_usage * 0.4
+                
+                processes.append((
+                    proc.info['name'],
+                    proc.info['pid'],
+                    f"{cpu_usage:.1f}",
+                    f"{memory_usage:.1f}",
+                    f"{temp_score:.1f}"
+                ))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        
+        # Sort by temperature score (resource usage)
+        processes.sort(key=lambda x: float(x[4]), reverse=True)
+        return processes[:20]  # Show top 20 processes
+
+    @traced(category="ui")
+    def update_process_list(self, rows):
         """Update the list of processes, highlighting high-temperature ones"""
-        # Clear existing items
-        for item in self.process_tree.get_children():
-            self.process_tree.delete(item)
-        
         try:
-            # Get all processes with their resource usage
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    # Get CPU and memory usage
-                    cpu_usage = proc.info['cpu_percent'] or 0
-                    memory_usage = proc.info['memory_percent'] or 0
-                    
-                    # Calculate a "temperature score" based on resource usage
-                    temp_score = cpu_usage * 0.6 + memory_usage * 0.4
-                    
-                    processes.append((
-                        proc.info['name'],
-                        proc.info['pid'],
-                        f"{cpu_usage:.1f}",
-                        f"{memory_usage:.1f}",
-                        f"{temp_score:.1f}"
-                    ))
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-            
-            # Sort by temperature score (resource usage)
-            processes.sort(key=lambda x: float(x[4]), reverse=True)
-            
-            # Add top processes to the treeview
-            for i, proc in enumerate(processes[:20]):  # Show top 20 processes
-                self.process_tree.insert("", "end", values=proc)
+            # Touch only the rows that changed
+            self.process_tree_updater.update(rows)
         except Exception as e:
             print(f"Error updating process list: {e}")
     
@@ -405,7 +415,10 @@ class ZioBoosterApp:
 
     def run(self):
         """Run the application"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.sampler.stop()
 
 if __name__ == "__main__":
     app = ZioBoosterApp()
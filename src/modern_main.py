@@ -22,12 +22,25 @@ except ImportError:
 from utils.temperature_monitor import TemperatureMonitor
 from utils.optimizer import SystemOptimizer
 from utils.performance_metrics import PerformanceMetrics
+from ui.process_table import ProcessTreeUpdater
+from ui.render_scheduler import FrameRenderer
+from utils.tracing import traced
+from utils.metrics_sampler import MetricsSampler, read_system_metrics
+from utils.booster_service import ServiceClient
 
 class ZioBoosterApp:
     def __init__(self):
-        # Initialize temperature monitor and optimizer
-        self.temp_monitor = TemperatureMonitor()
-        self.optimizer = SystemOptimizer()
+        # When the headless service is running, act as a thin client of it: the service owns
+        # affinity, priorities and profiles, so no local optimizer is built to compete with it
+        self.service = ServiceClient.connect_if_running()
+        if self.service:
+            print(f"Connected to Zio-Booster service at {self.service.socket_path}")
+            self.optimizer = None
+            self.temp_monitor = TemperatureMonitor()
+        else:
+            self.optimizer = SystemOptimizer()
+            # Scans the optimizer's event-driven process table while boosting
+            self.temp_monitor = TemperatureMonitor(process_table=self.optimizer.process_table)
         self.performance_metrics = PerformanceMetrics()
         
         # FPS optimization variables
@@ -56,8 +69,22 @@ class ZioBoosterApp:
             # Create UI elements
             self.create_basic_ui()
         
-        # Update system info periodically
-        self.update_system_info()
+        # Coalesce widget updates and apply them once per frame
+        self.renderer = FrameRenderer(self.root)
+        
+        # Refresh the process list as a keyed diff instead of rebuilding it
+        tree = self.ui.process_tree if CUSTOM_TK_AVAILABLE else self.process_tree
+        self.process_tree_updater = ProcessTreeUpdater(tree)
+        
+        # Sample metrics on a producer thread; the Tk thread only drains the queue
+        self.sampler = MetricsSampler(
+            interval=2.0,
+            system_reader=self.read_service_metrics if self.service else self.read_system_info,
+            process_reader=self.read_service_processes if self.service else self.read_process_rows,
+            process_interval=5.0
+        )
+        self.sampler.start()
+        self.drain_metrics_queue()
     
     def create_basic_ui(self):
         """Create basic UI when customtkinter is not available"""
@@ -144,13 +171,30 @@ class ZioBoosterApp:
         self.is_running = True
         
         if CUSTOM_TK_AVAILABLE:
-            self.ui.status_label.configure(text="Status: Active - Optimizing System")
-            self.ui.start_button.configure(state="disabled")
-            self.ui.stop_button.configure(state="normal")
+            self.renderer.set(self.ui.status_label, text="Status: Active - Optimizing System")
+            self.renderer.set(self.ui.start_button, state="disabled")
+            self.renderer.set(self.ui.stop_button, state="normal")
         else:
-            self.status_label.config(text="Status: Active - Optimizing System", fg="green")
-            self.start_button.config(state="disabled")
-            self.stop_button.config(state="normal")
+            self.renderer.set(self.status_label, text="Status: Active - Optimizing System", fg="green")
+            self.renderer.set(self.start_button, state="disabled")
+            self.renderer.set(self.stop_button, state="normal")
+        
+        # Refresh the process list from the sampler while boosting
+        self.sampler.sample_processes = True
+        self.sampler.request_processes()
+        
+        if self.service:
+            try:
+                self.service.call('start_boosting')
+            except (RuntimeError, OSError, ValueError) as e:
+                print(f"Service command start_boosting failed: {e}")
+                self.is_running = False
+                self.sampler.sample_processes = False
+                self.show_stopped_status()
+            return
+        
+        # Switch to a game's profile as soon as it launches
+        self.optimizer.start_game_detection()
         
         # Start monitoring in a separate thread
         self.monitoring_thread = threading.Thread(target=self.monitor_system, daemon=True)
@@ -159,57 +203,85 @@ class ZioBoosterApp:
     def stop_boosting(self):
         """Stop the FPS boosting process"""
         self.is_running = False
-        
+        self.sampler.sample_processes = False
+        if self.service:
+            try:
+                self.service.call('stop_boosting')
+            except (RuntimeError, OSError, ValueError) as e:
+                print(f"Service command stop_boosting failed: {e}")
+        else:
+            self.optimizer.stop_game_detection()
+        self.show_stopped_status()
+    
+    def show_stopped_status(self):
+        """Show the stopped state in the status label and buttons"""
         if CUSTOM_TK_AVAILABLE:
-            self.ui.status_label.configure(text="Status: Stopped")
-            self.ui.start_button.configure(state="normal")
-            self.ui.stop_button.configure(state="disabled")
+            self.renderer.set(self.ui.status_label, text="Status: Stopped")
+            self.renderer.set(self.ui.start_button, state="normal")
+            self.renderer.set(self.ui.stop_button, state="disabled")
         else:
-            self.status_label.config(text="Status: Stopped", fg="red")
-            self.start_button.config(state="normal")
-            self.stop_button.config(state="disabled")
+            self.renderer.set(self.status_label, text="Status: Stopped", fg="red")
+            self.renderer.set(self.start_button, state="normal")
+            self.renderer.set(self.stop_button, state="disabled")
     
     def manual_optimize(self):
         """Manually run an optimization cycle"""
         if CUSTOM_TK_AVAILABLE:
-            self.ui.status_label.configure(text="Status: Manual Optimization Running")
+            self.renderer.set(self.ui.status_label, text="Status: Manual Optimization Running")
         else:
-            self.status_label.config(text="Status: Manual Optimization Running", fg="orange")
+            self.renderer.set(self.status_label, text="Status: Manual Optimization Running", fg="orange")
         
-        result = self.optimizer.run_optimization_cycle()
+        # The cycle takes seconds, so run it off the Tk thread and report back through the queue
+        def run_cycle():
+            result = self.run_action('optimize', lambda: self.optimizer.run_optimization_cycle())
+            self.sampler.post('manual_optimization', result)
         
+        threading.Thread(target=run_cycle, daemon=True).start()
+    
+    def finish_manual_optimize(self, result):
+        """Report a finished manual optimization; runs on the Tk thread"""
         if CUSTOM_TK_AVAILABLE:
-            self.ui.status_label.configure(text="Status: Manual Optimization Complete")
+            self.renderer.set(self.ui.status_label, text="Status: Manual Optimization Complete")
         else:
-            self.status_label.config(text="Status: Manual Optimization Complete", fg="green")
+            self.renderer.set(self.status_label, text="Status: Manual Optimization Complete", fg="green")
         
         print(f"Manual optimization result: {result}")
         
         # Update process list after optimization
-        self.update_process_list()
+        self.sampler.request_processes()
         
         # Reset status after a few seconds if not running
         def reset_status():
             if not self.is_running:
                 if CUSTOM_TK_AVAILABLE:
-                    self.ui.status_label.configure(text="Status: Idle")
+                    self.renderer.set(self.ui.status_label, text="Status: Idle")
                 else:
-                    self.status_label.config(text="Status: Idle", fg="black")
+                    self.renderer.set(self.status_label, text="Status: Idle", fg="black")
         
         self.root.after(3000, reset_status)
     
     def monitor_system(self):
-        """Monitor system and optimize in the background"""
+        """Optimize in the background; the sampler refreshes the process list"""
         while self.is_running:
-            # Update process list
-            self.update_process_list()
             # Run optimization cycle periodically
-            if self.is_running:  # Check again in case it was stopped during process update
-                self.optimizer.run_optimization_cycle()
+            self.optimizer.run_optimization_cycle()
             time.sleep(5)  # Update every 5 seconds
 
-    def update_system_info(self):
-        """Update system information labels"""
+    def drain_metrics_queue(self):
+        """Apply the latest sampled results; runs on the Tk thread"""
+        latest = self.sampler.drain()
+        if 'system' in latest:
+            self.update_system_info(latest['system'])
+        if 'processes' in latest:
+            self.update_process_list(latest['processes'])
+        if 'manual_optimization' in latest:
+            self.finish_manual_optimize(latest['manual_optimization'])
+        
+        # Drain again shortly; nothing is drawn while the window is hidden, so poll less
+        self.root.after(50 if self.renderer.is_visible() else 500, self.drain_metrics_queue)
+
+    def read_system_info(self):
+        """Read CPU, memory and temperature; runs on the sampler thread"""
         # Use fast C++ implementation for system info when available
         try:
             system_info = self.optimizer.get_fast_system_info()
@@ -219,75 +291,88 @@ class ZioBoosterApp:
             memory_percent = ((total_memory - available_memory) / total_memory) * 100 if total_memory > 0 else 0
             cpu_temp = system_info['cpu_temp']
         except:
-            # Fallback to psutil if C++ implementation fails
-            import psutil
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory_percent = psutil.virtual_memory().percent
+            # Fallback to non-blocking psutil reads if C++ implementation fails
+            metrics = read_system_metrics()
+            cpu_percent = metrics['cpu_percent']
+            memory_percent = metrics['memory_percent']
+            cpu_temp = metrics['cpu_temp']
+        
+        # C++ implementation returns 0 if temperature is not available
+        if cpu_temp is None or cpu_temp <= 0:
             cpu_temp = self.temp_monitor.get_cpu_temperature()
         
+        return {'cpu_percent': cpu_percent, 'memory_percent': memory_percent, 'cpu_temp': cpu_temp,
+                'optimization_count': self.optimizer.optimization_count}
+
+    @traced(category="ui")
+    def update_system_info(self, metrics):
+        """Update system information labels from a sampled metrics dict"""
+        cpu_percent = metrics['cpu_percent']
+        memory_percent = metrics['memory_percent']
+        cpu_temp = metrics['cpu_temp']
+        
         if CUSTOM_TK_AVAILABLE:
-            self.ui.cpu_label.configure(text=f"CPU Usage: {cpu_percent:.1f}%")
-            self.ui.memory_label.configure(text=f"Memory Usage: {memory_percent:.1f}%")
+            self.renderer.set(self.ui.cpu_label, text=f"CPU Usage: {cpu_percent:.1f}%")
+            self.renderer.set(self.ui.memory_label, text=f"Memory Usage: {memory_percent:.1f}%")
             
             # Update additional labels that may exist in the modern UI
             try:
                 # Update optimization count
-                self.ui.optimization_count_label.configure(text=f"Optimizations: {self.optimizer.optimization_count}")
+                self.renderer.set(self.ui.optimization_count_label, text=f"Optimizations: {metrics.get('optimization_count', 0)}")
                 
                 # Update gaming mode status
                 if self.gaming_mode_active:
-                    self.ui.gaming_mode_label.configure(text="Gaming Mode: Active")
+                    self.renderer.set(self.ui.gaming_mode_label, text="Gaming Mode: Active")
                 else:
-                    self.ui.gaming_mode_label.configure(text="Gaming Mode: Inactive")
+                    self.renderer.set(self.ui.gaming_mode_label, text="Gaming Mode: Inactive")
             except AttributeError:
                 pass  # Some UI elements may not exist
         else:
-            self.cpu_label.config(text=f"{cpu_percent:.1f}%")
-            self.memory_label.config(text=f"{memory_percent:.1f}%")
+            self.renderer.set(self.cpu_label, text=f"{cpu_percent:.1f}%")
+            self.renderer.set(self.memory_label, text=f"{memory_percent:.1f}%")
         
         # Update temperature
-        if cpu_temp is not None and cpu_temp > 0:  # C++ implementation returns 0 if not available
+        if cpu_temp is not None:
             if CUSTOM_TK_AVAILABLE:
-                self.ui.temp_label.configure(text=f"CPU Temp: {cpu_temp:.1f}°C")
+                self.renderer.set(self.ui.temp_label, text=f"CPU Temp: {cpu_temp:.1f}°C")
             else:
-                self.temp_label.config(text=f"{cpu_temp:.1f}°C")
+                self.renderer.set(self.temp_label, text=f"{cpu_temp:.1f}°C")
         else:
-            # Fallback to temperature monitor if C++ doesn't provide temperature
-            temp_fallback = self.temp_monitor.get_cpu_temperature()
-            if temp_fallback is not None:
-                if CUSTOM_TK_AVAILABLE:
-                    self.ui.temp_label.configure(text=f"CPU Temp: {temp_fallback:.1f}°C")
-                else:
-                    self.temp_label.config(text=f"{temp_fallback:.1f}°C")
+            if CUSTOM_TK_AVAILABLE:
+                self.renderer.set(self.ui.temp_label, text="CPU Temp: N/A")
             else:
-                if CUSTOM_TK_AVAILABLE:
-                    self.ui.temp_label.configure(text="CPU Temp: N/A")
-                else:
-                    self.temp_label.config(text="N/A")
-        
-        # Schedule next update
-        self.root.after(2000, self.update_system_info)
+                self.renderer.set(self.temp_label, text="N/A")
+    
+    def run_action(self, command: str, local_action, **args):
+        """Send an optimizer command to the service when connected to one, otherwise run it locally"""
+        if not self.service:
+            return local_action()
+        try:
+            return self.service.call(command, **args)
+        except (RuntimeError, OSError, ValueError) as e:
+            print(f"Service command {command} failed: {e}")
+            return False
     
     def toggle_gaming_mode(self):
         """Toggle gaming mode on/off"""
         if self.gaming_mode_active:
             # Disable gaming mode
-            self.optimizer.disable_gaming_mode()
+            self.run_action('disable_gaming_mode', lambda: self.optimizer.disable_gaming_mode())
             self.gaming_mode_active = False
             if CUSTOM_TK_AVAILABLE:
-                self.ui.gaming_mode_label.configure(text="Gaming Mode: Off")
-                self.ui.gaming_mode_button.configure(text="Enable Gaming Mode", fg_color="#FF9800")
+                self.renderer.set(self.ui.gaming_mode_label, text="Gaming Mode: Off")
+                self.renderer.set(self.ui.gaming_mode_button, text="Enable Gaming Mode", fg_color="#FF9800")
             else:
                 # For basic UI, we would need to implement this
                 pass
             print("Gaming mode disabled")
         else:
             # Enable gaming mode
-            self.optimizer.enable_gaming_mode()
+            self.run_action('enable_gaming_mode', lambda: self.optimizer.enable_gaming_mode())
             self.gaming_mode_active = True
             if CUSTOM_TK_AVAILABLE:
-                self.ui.gaming_mode_label.configure(text="Gaming Mode: Active")
-                self.ui.gaming_mode_button.configure(text="Disable Gaming Mode", fg_color="#795548")
+                self.renderer.set(self.ui.gaming_mode_label, text="Gaming Mode: Active")
+                self.renderer.set(self.ui.gaming_mode_button, text="Disable Gaming Mode", fg_color="#795548")
             else:
                 # For basic UI, we would need to implement this
                 pass
@@ -298,16 +383,17 @@ class ZioBoosterApp:
         if CUSTOM_TK_AVAILABLE:
             profile_name = self.ui.profile_var.get()
             if profile_name and profile_name != "Default":
-                success = self.optimizer.apply_profile(profile_name)
+                success = self.run_action('apply_profile', lambda: self.optimizer.apply_profile(profile_name),
+                                          name=profile_name)
                 if success:
                     print(f"Applied profile: {profile_name}")
                     # Update status to indicate profile is active
                     if self.is_running:
                         if CUSTOM_TK_AVAILABLE:
-                            self.ui.status_label.configure(text=f"Status: Active - Profile: {profile_name}")
+                            self.renderer.set(self.ui.status_label, text=f"Status: Active - Profile: {profile_name}")
                     else:
                         if CUSTOM_TK_AVAILABLE:
-                            self.ui.status_label.configure(text=f"Status: Profile Applied - {profile_name}")
+                            self.renderer.set(self.ui.status_label, text=f"Status: Profile Applied - {profile_name}")
                 else:
                     print(f"Failed to apply profile: {profile_name}")
             else:
@@ -315,34 +401,55 @@ class ZioBoosterApp:
         else:
             print("Profile selection not available in basic UI")
 
-    def update_process_list(self):
-        """Update the list of processes, highlighting high-temperature ones"""
-        # Get all processes using our temperature monitor
-        processes = self.temp_monitor.get_process_temperatures()
-        
-        if CUSTOM_TK_AVAILABLE:
-            # For customtkinter, we use the standard tkinter treeview
-            tree = self.ui.process_tree
-        else:
-            tree = self.process_tree
-        
-        # Clear existing items
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        # Add top processes to the treeview
-        for i, proc in enumerate(processes[:20]):  # Show top 20 processes
-            tree.insert("", "end", values=(
+    def read_service_metrics(self):
+        """Read metrics from the headless service; runs on the sampler thread"""
+        metrics = self.service.call('metrics')
+        metrics['optimization_count'] = self.service.call('status')['optimization_count']
+        return metrics
+
+    def read_service_processes(self):
+        """Read the process list from the headless service; runs on the sampler thread"""
+        return [
+            (
                 proc['name'],
                 proc['pid'],
-                f"{proc['cpu_percent']:.1f}" if proc['cpu_percent'] else "0.0",
-                f"{proc['memory_percent']:.1f}" if proc['memory_percent'] else "0.0",
+                f"{proc['cpu_percent']:.1f}",
+                f"{proc['memory_percent']:.1f}",
                 f"{proc['temperature_score']:.1f}"
-            ))
+            )
+            for proc in self.service.call('processes', limit=20)
+        ]
+
+    def read_process_rows(self):
+        """Collect the top 20 process rows; runs on the sampler thread"""
+        # Get all processes using our temperature monitor
+        processes = self.temp_monitor.get_process_temperatures()
+        
+        return [
+            (
+                proc.name,
+                proc.pid,
+                f"{proc.cpu_percent:.1f}",
+                f"{proc.memory_percent:.1f}",
+                f"{proc.temperature_score:.1f}"
+            )
+            for proc in processes[:20]
+        ]
+
+    @traced(category="ui")
+    def update_process_list(self, rows):
+        """Update the list of processes, highlighting high-temperature ones"""
+        # Touch only the rows that changed, at most once per frame
+        self.renderer.schedule('process_list', lambda: self.process_tree_updater.update(rows))
     
     def run(self):
         """Run the application"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.sampler.stop()
+            if self.service:
+                self.service.close()
 
 if __name__ == "__main__":
     app = ZioBoosterApp()
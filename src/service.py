@@ -0,0 +1,61 @@
+"""
+Headless entry point for Zio-Booster FPS Booster
+Runs the optimizer as a background service, or sends commands to a running one
+"""
+import argparse
+import json
+import sys
+import os
+
+# Add the project root to the path so we can import utilities
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.booster_service import ServiceClient, default_socket_path, run_service
+
+
+def main(argv=None):
+    """Run the service, or with --command talk to a running one"""
+    parser = argparse.ArgumentParser(description="Zio-Booster headless service")
+    parser.add_argument("--socket", default=default_socket_path(), help="control socket path")
+    parser.add_argument("--boost", action="store_true", help="start optimization cycles immediately")
+    parser.add_argument("--no-ai", action="store_true", help="do not run the AI optimization loop")
+    parser.add_argument("--cycle-interval", type=float, default=5.0, help="seconds between optimization cycles")
+    parser.add_argument("--stream-port", type=int, help="serve metrics to web dashboards as Server-Sent Events on this port")
+    parser.add_argument("--stream-origin", help="web origin allowed to read the stream cross-origin, e.g. http://localhost:3000")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics at /metrics on this port")
+    parser.add_argument("--command", help="send a command (e.g. status, metrics, start_boosting) to a running service")
+    parser.add_argument("--args", default="{}", help="JSON object of command arguments")
+    options = parser.parse_args(argv)
+
+    if options.command:
+        client = ServiceClient.connect_if_running(options.socket)
+        if client is None:
+            print(f"No Zio-Booster service is running on {options.socket}")
+            return 1
+        with client:
+            try:
+                result = client.call(options.command, **json.loads(options.args))
+            except RuntimeError as e:
+                print(f"Error: {e}")
+                return 1
+        print(json.dumps(result, indent=2, default=str))
+        return 0
+
+    try:
+        run_service(
+            socket_path=options.socket,
+            boost=options.boost,
+            enable_ai=not options.no_ai,
+            cycle_interval=options.cycle_interval,
+            stream_port=options.stream_port,
+            stream_origin=options.stream_origin,
+            metrics_port=options.metrics_port
+        )
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
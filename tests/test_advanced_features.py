@@ -0,0 +1,48 @@
+"""
+Tests for the advanced optimization features
+"""
+import os
+import subprocess
+import sys
+import time
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.advanced_features import (EdgeComputingOptimizer, SystemConfigurationModel, _anneal_seeds,
+                                     _best_annealing_result)
+
+
+def _model():
+    return SystemConfigurationModel(cpu_count=4, process_cpu=[0.9, 0.5, 0.2], memory_percent=60.0, pids=[1, 2, 3])
+
+
+def test_annealing_restarts_run_on_the_workers():
+    edge = EdgeComputingOptimizer(local_workers=1)
+    try:
+        assert len(edge.discover_edge_nodes()) == 1
+        outcome = edge.distribute_optimization_task({
+            'function': partial(_anneal_seeds, model=_model(), iterations=5),
+            'items': [1, 2, 3, 4],
+            'merge': _best_annealing_result,
+            'deadline': time.time() + 30,
+            'serial_below': 0
+        })
+        assert outcome['distributed']
+        assert outcome['complete']
+        assert edge.distributed_tasks[-1]['distributed']
+        assert edge.distributor.workers[0].tasks_completed > 0
+    finally:
+        edge.shutdown()
+
+
+def test_from_system_sees_busy_processes_on_the_first_call():
+    busy = subprocess.Popen([sys.executable, '-c', 'while True: pass'])
+    try:
+        time.sleep(0.2)
+        model = SystemConfigurationModel.from_system(max_processes=64)
+        assert busy.pid in model.pids
+        assert model.process_count > 0
+    finally:
+        busy.kill()
+        busy.wait()
@@ -0,0 +1,102 @@
+"""
+Tests for the service's control socket protocol
+"""
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.booster_service import ServiceClient, _ControlHandler, _ControlServer, encode_message
+
+
+class FakeService:
+    is_serving = True
+
+    class sampler:
+        interval = 0.05
+
+    def handle_command(self, command, args):
+        if command == 'slow':
+            time.sleep(0.5)
+        return {'command': command, 'args': args}
+
+    def get_metrics(self):
+        return {'cpu_percent': 1.0}
+
+    def wait_for_sample(self, interval):
+        time.sleep(interval)
+
+
+def _serve(path, handler=_ControlHandler):
+    server = _ControlServer(path, handler)
+    server.service = FakeService()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    path = str(tmp_path / 'zio.sock')
+    yield path
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def test_timed_out_call_does_not_answer_the_next_one(socket_path):
+    server = _serve(socket_path)
+    client = ServiceClient(socket_path, timeout=0.2)
+    try:
+        with pytest.raises(OSError):
+            client.call('slow')
+        time.sleep(0.5)
+        assert client.call('status') == {'command': 'status', 'args': {}}
+        assert client.call('echo', value=1) == {'command': 'echo', 'args': {'value': 1}}
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_replies_to_other_requests_are_skipped(socket_path):
+    class StaleHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                request = json.loads(line)
+                self.wfile.write(encode_message({'id': request['id'] - 1, 'ok': True, 'result': 'stale'}))
+                self.wfile.write(encode_message({'id': request['id'], 'ok': True, 'result': 'fresh'}))
+
+    server = _serve(socket_path, StaleHandler)
+    client = ServiceClient(socket_path, timeout=2.0)
+    try:
+        assert client.call('status') == 'fresh'
+        assert client.call('status') == 'fresh'
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_null_args_are_accepted(socket_path):
+    server = _serve(socket_path)
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(2.0)
+    conn.connect(socket_path)
+    reader = conn.makefile('rb')
+    try:
+        conn.sendall(b'{"id": 1, "cmd": "status", "args": null}\n')
+        assert json.loads(reader.readline()) == {'id': 1, 'ok': True, 'result': {'command': 'status', 'args': {}}}
+        conn.sendall(b'{"id": 2, "cmd": "subscribe", "args": null}\n')
+        assert json.loads(reader.readline())['result'] == 'subscribed'
+        assert json.loads(reader.readline())['event'] == 'metrics'
+    finally:
+        reader.close()
+        conn.close()
+        server.shutdown()
+        server.server_close()
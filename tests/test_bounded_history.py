@@ -0,0 +1,38 @@
+"""
+Tests for the bounded history containers
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.bounded_history import BoundedHistory, NumericHistory
+
+
+def test_numeric_history_rejects_rows_of_the_wrong_width():
+    history = NumericHistory(width=3, capacity=4)
+    history.append((1.0, 2.0, 3.0), timestamp=1.0)
+    for row in [(1.0, 2.0), (1.0, 2.0, 3.0, 4.0), ()]:
+        with pytest.raises(ValueError):
+            history.append(row, timestamp=2.0)
+    assert len(history) == 1
+    assert history.total_appended == 1
+    assert list(history) == [(1.0, 2.0, 3.0)]
+    assert history.memory_report()['approx_bytes'] == NumericHistory(width=3, capacity=4).memory_report()['approx_bytes']
+
+
+def test_numeric_history_overwrites_oldest_rows():
+    history = NumericHistory(width=2, capacity=3)
+    for index in range(5):
+        history.append((index, index * 10), timestamp=float(index))
+    assert list(history) == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)]
+    assert history.since(3.0) == [(3.0, 30.0), (4.0, 40.0)]
+
+
+def test_bounded_history_drops_entries_past_ttl():
+    history = BoundedHistory(capacity=10, ttl=5.0)
+    for index in range(8):
+        history.append(index, timestamp=float(index))
+    assert list(history) == [2, 3, 4, 5, 6, 7]
@@ -0,0 +1,42 @@
+"""
+Tests for giving cores back after a core partition
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import core_partitioning
+from utils.core_partitioning import PF_KTHREAD, CorePartitioner
+
+
+def _proc_tree(root, tasks, kernel=()):
+    for pid, tids in tasks.items():
+        (root / str(pid) / 'task').mkdir(parents=True)
+        for tid in tids:
+            (root / str(pid) / 'task' / str(tid)).mkdir()
+        flags = PF_KTHREAD if pid in kernel else 0
+        (root / str(pid) / 'stat').write_text(f"{pid} (proc) S 1 {pid} {pid} 0 -1 {flags} 0 0\n")
+
+
+def test_restore_widens_threads_started_during_the_partition(tmp_path, monkeypatch):
+    _proc_tree(tmp_path, {10: [10, 11], 20: [20], 30: [30], 40: [40]}, kernel={40})
+    masks = {10: {2, 3}, 11: {2, 3}, 20: {2, 3}, 30: {3}, 40: {2, 3}}
+    monkeypatch.setattr(core_partitioning.os, 'sched_getaffinity', lambda tid: set(masks[tid]))
+    monkeypatch.setattr(core_partitioning.os, 'sched_setaffinity', lambda tid, cpus: masks.__setitem__(tid, set(cpus)))
+
+    partitioner = CorePartitioner(proc_root=str(tmp_path))
+    partitioner.game_pids = {99}
+    partitioner.game_cpus, partitioner.background_cpus = [0, 1], [2, 3]
+    # Threads pinned by the partition itself
+    partitioner.original_affinity = {10: {0, 1, 2, 3}, 11: {1, 2, 3}}
+
+    partitioner.restore()
+    assert masks[10] == {0, 1, 2, 3}
+    assert masks[11] == {1, 2, 3}
+    # Started during the partition and inherited the background mask
+    assert masks[20] == {0, 1, 2, 3}
+    # Narrowed by someone else, and a kernel thread: left alone
+    assert masks[30] == {3}
+    assert masks[40] == {2, 3}
+    assert not partitioner.is_active
@@ -0,0 +1,101 @@
+"""
+Tests for game detection from process start and exit events
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.game_detector import GameDetector
+from utils.profile_manager import GameProfile
+
+
+class Profiles:
+    """Stands in for ProfileManager: profiles by process name"""
+
+    def __init__(self, *profiles):
+        self.profiles = {os.path.basename(profile.executable_path): profile for profile in profiles}
+
+    def match_executable(self, exe, name=""):
+        return self.profiles.get(name)
+
+
+class Events:
+    def subscribe(self, on_start, on_exit):
+        pass
+
+    def unsubscribe(self, on_start, on_exit):
+        pass
+
+
+@pytest.fixture
+def sleeper():
+    child = subprocess.Popen(['sleep', '30'])
+    yield child
+    child.kill()
+    child.wait()
+
+
+def _detector(*profiles):
+    events = []
+    detector = GameDetector(Profiles(*profiles), event_bus=Events(),
+                            on_game_start=lambda profile, pid: events.append(('start', profile.name, pid)),
+                            on_game_exit=lambda profile, pid: events.append(('exit', profile.name, pid)))
+    return detector, events
+
+
+def test_exec_into_a_program_without_profile_reports_exit():
+    wrapper = GameProfile("Wrapped", executable_path="/opt/game/run.sh")
+    detector, events = _detector(wrapper)
+    detector.handle_start(100, "/opt/game/run.sh", "run.sh")
+    detector.handle_start(100, "/opt/game/game.bin", "game.bin")
+    detector.handle_exit(100)
+    assert events == [('start', "Wrapped", 100), ('exit', "Wrapped", 100)]
+    assert detector.running_games == {}
+
+
+def test_exec_into_another_game_switches_profile():
+    launcher = GameProfile("Launcher", executable_path="/opt/game/launcher")
+    game = GameProfile("Game", executable_path="/opt/game/game.bin")
+    detector, events = _detector(launcher, game)
+    detector.handle_start(100, "/opt/game/launcher", "launcher")
+    detector.handle_start(100, "/opt/game/game.bin", "game.bin")
+    detector.handle_exit(100)
+    assert events == [('start', "Launcher", 100), ('exit', "Launcher", 100),
+                      ('start', "Game", 100), ('exit', "Game", 100)]
+
+
+def test_repeated_start_of_the_same_game_is_reported_once():
+    game = GameProfile("Game", executable_path="/opt/game/game.bin")
+    detector, events = _detector(game)
+    detector.handle_start(100, "/opt/game/game.bin", "game.bin")
+    detector.handle_start(100, "/opt/game/game.bin", "game.bin")
+    assert events == [('start', "Game", 100)]
+
+
+def test_fork_of_a_game_is_not_reported(sleeper):
+    # This test process plays the game; the sleeper is its fork
+    game = GameProfile("Game", executable_path="/opt/game/game.bin")
+    detector, events = _detector(game)
+    detector.handle_start(os.getpid(), "/opt/game/game.bin", "game.bin")
+    detector.handle_start(sleeper.pid, "/opt/game/game.bin", "game.bin")
+    assert sleeper.pid not in detector.running_games
+    # The fork execs a helper and exits
+    detector.handle_start(sleeper.pid, "/bin/sh", "sh")
+    detector.handle_exit(sleeper.pid)
+    assert events == [('start', "Game", os.getpid())]
+    assert detector.forked == {}
+
+
+def test_fork_of_a_game_that_execs_a_game_is_reported(sleeper):
+    game = GameProfile("Game", executable_path="/opt/game/game.bin")
+    detector, events = _detector(game)
+    detector.handle_start(os.getpid(), "/opt/game/game.bin", "game.bin")
+    detector.handle_start(sleeper.pid, "/opt/game/game.bin", "game.bin")
+    detector.handle_start(sleeper.pid, "/opt/game/game.bin", "game.bin")
+    detector.handle_exit(sleeper.pid)
+    assert events == [('start', "Game", os.getpid()), ('start', "Game", sleeper.pid),
+                      ('exit', "Game", sleeper.pid)]
@@ -0,0 +1,34 @@
+"""
+Tests for the Prometheus text exposition
+"""
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.metrics_exporter import MetricsRegistry, _format_value
+
+
+def test_non_finite_values_use_exposition_spellings():
+    assert _format_value(math.inf) == "+Inf"
+    assert _format_value(-math.inf) == "-Inf"
+    assert _format_value(math.nan) == "NaN"
+    assert _format_value(3.0) == "3"
+    assert _format_value(0.25) == "0.25"
+
+
+def test_non_finite_observations_do_not_break_the_payload():
+    registry = MetricsRegistry()
+    latency = registry.histogram('zio_test_seconds', 'Test latency', buckets=(0.1, 1.0))
+    lag = registry.counter('zio_test_lag', 'Test lag', ['source'])
+    latency.observe(0.05)
+    latency.observe(math.inf)
+    lag.inc(math.nan, source='sampler')
+    lag.inc(math.inf, source='other')
+
+    text = registry.render().decode('utf-8')
+    assert 'zio_test_seconds_bucket{le="+Inf"} 2\n' in text
+    assert 'zio_test_seconds_sum +Inf\n' in text
+    assert 'zio_test_lag_total{source="sampler"} NaN\n' in text
+    assert 'zio_test_lag_total{source="other"} +Inf\n' in text
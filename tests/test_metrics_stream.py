@@ -0,0 +1,70 @@
+"""
+Tests for the Server-Sent Events metrics stream
+"""
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.metrics_stream import MetricsStreamServer
+
+
+def _server(**kwargs):
+    server = MetricsStreamServer(port=0, interval=0.05, snapshot_source=lambda: {'cpu_percent': time.time() % 100},
+                                 **kwargs)
+    server.start()
+    return server
+
+
+def _connect(server, path='/events'):
+    client = socket.create_connection((server.host, server.port), timeout=5)
+    client.sendall(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    return client
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_stop_with_connected_subscriber_ends_server_thread():
+    server = _server()
+    client = _connect(server)
+    try:
+        assert _wait_for(lambda: server.subscriber_count == 1)
+        started = time.monotonic()
+        server.stop()
+        assert not server.thread.is_alive()
+        assert time.monotonic() - started < 2
+        # The client sees its connection closed rather than hanging
+        client.settimeout(2)
+        while client.recv(65536):
+            pass
+    finally:
+        client.close()
+
+
+def test_no_cors_header_by_default():
+    server = _server()
+    client = _connect(server, '/snapshot')
+    try:
+        response = client.recv(65536).decode('latin-1')
+        assert response.startswith("HTTP/1.1 200 OK")
+        assert "Access-Control-Allow-Origin" not in response
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_configured_origin_is_allowed():
+    server = _server(allow_origin="http://localhost:3000")
+    client = _connect(server, '/snapshot')
+    try:
+        assert "Access-Control-Allow-Origin: http://localhost:3000\r\n" in client.recv(65536).decode('latin-1')
+    finally:
+        client.close()
+        server.stop()
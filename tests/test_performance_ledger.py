@@ -0,0 +1,104 @@
+"""
+Tests for the performance ledger location
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.performance_ledger import PerformanceLedger, default_ledger_path
+
+
+def test_default_path_is_in_the_user_data_directory(monkeypatch, tmp_path):
+    monkeypatch.delenv('ZIO_LEDGER', raising=False)
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path / 'data'))
+    monkeypatch.chdir(tmp_path)
+    if sys.platform not in ('win32', 'darwin'):
+        assert default_ledger_path() == str(tmp_path / 'data' / 'zio-booster' / 'performance_ledger.jsonl')
+
+    ledger = PerformanceLedger()
+    ledger.append({'cpu_usage': 50.0})
+    assert os.path.isfile(ledger.path)
+    assert os.path.dirname(os.path.abspath(ledger.path)) != str(tmp_path)
+    assert not (tmp_path / 'performance_ledger.jsonl').exists()
+    ledger.close()
+
+
+def test_zio_ledger_overrides_the_default(monkeypatch, tmp_path):
+    path = tmp_path / 'ledgers' / 'custom.jsonl'
+    monkeypatch.setenv('ZIO_LEDGER', str(path))
+    ledger = PerformanceLedger()
+    ledger.append({'cpu_usage': 50.0})
+    assert ledger.path == str(path)
+    assert ledger.verify(full=True)
+    ledger.close()
+
+
+def _ledger(tmp_path, **kwargs):
+    return PerformanceLedger(str(tmp_path / 'ledger.jsonl'), **kwargs)
+
+
+def _filled(tmp_path, count=50, **kwargs):
+    ledger = _ledger(tmp_path, **kwargs)
+    for i in range(count):
+        ledger.append({'cycle': i}, timestamp=float(i))
+    ledger.close()
+    return ledger.path
+
+
+def test_chain_verifies_and_survives_reopening(tmp_path):
+    path = _filled(tmp_path, checkpoint_interval=8)
+    ledger = _ledger(tmp_path, checkpoint_interval=8)
+    assert len(ledger) == 50
+    assert ledger.verify() and ledger.verify(full=True)
+    ledger.append({'cycle': 50})
+    assert ledger.verify()
+    assert [entry['data'] for entry in ledger.read_entries(48, limit=5)] == [{'cycle': 48}, {'cycle': 49}, {'cycle': 50}]
+    ledger.close()
+    assert len(_ledger(tmp_path)) == 51
+
+
+def test_reopening_resumes_from_saved_state(tmp_path, monkeypatch):
+    _filled(tmp_path, count=200, checkpoint_interval=16)
+    hashed = []
+    original = PerformanceLedger._hash
+    monkeypatch.setattr(PerformanceLedger, '_hash', staticmethod(lambda *args: hashed.append(1) or original(*args)))
+    ledger = _ledger(tmp_path, checkpoint_interval=16)
+    assert len(ledger) == 200
+    assert hashed == []
+    assert len(ledger.checkpoints) == 13
+    assert ledger.verify(full=True)
+    ledger.close()
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    path = _filled(tmp_path, count=10)
+    with open(path, 'ab') as f:
+        f.write(b'0123456789abcdef {"partial')
+    ledger = _ledger(tmp_path)
+    assert len(ledger) == 10
+    assert ledger.verify(full=True)
+    ledger.append({'cycle': 10})
+    assert ledger.verify(full=True)
+    ledger.close()
+    with open(path, 'rb') as f:
+        assert f.read().count(b'\n') == 11
+
+
+def test_tampering_is_detected(tmp_path):
+    path = _filled(tmp_path, count=20)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data.replace(b'{"cycle":3}', b'{"cycle":9}'))
+    # Reopened with the saved state, the edited entry is found by a full verification
+    ledger = _ledger(tmp_path)
+    assert not ledger.verify(full=True)
+    ledger.close()
+
+    # Without the state, reopening rehashes everything and finds it straight away
+    os.unlink(path + '.state')
+    ledger = _ledger(tmp_path)
+    assert ledger.tampered
+    assert not ledger.verify()
+    ledger.close()
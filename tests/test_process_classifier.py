@@ -0,0 +1,121 @@
+"""
+Tests for the process classification rules
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.process_classifier import (EXPENDABLE, PROTECTED, ProcessClassifier, ProcessRule,
+                                      get_process_classifier)
+from utils.optimization_policy import is_system_critical_process, is_unnecessary_process
+
+
+@pytest.fixture
+def sleeper():
+    child = subprocess.Popen(['sleep', '30'])
+    yield child
+    child.kill()
+    child.wait()
+
+
+@pytest.mark.parametrize('name', ['systemd', 'systemd-journald', 'kworker/0:1', 'svchost.exe', 'SVCHOST.EXE',
+                                  'csrss.exe', 'Xorg', 'kthreadd'])
+def test_default_rules_protect_system_processes(name):
+    assert is_system_critical_process(name)
+    assert not is_unnecessary_process(name)
+
+
+@pytest.mark.parametrize('name', ['chrome', 'chrome.exe', 'firefox', 'Spotify.exe', 'steamwebhelper',
+                                  'Code Helper (Renderer)', 'msedge.exe'])
+def test_default_rules_mark_background_applications_expendable(name):
+    assert is_unnecessary_process(name)
+    assert not is_system_critical_process(name)
+
+
+@pytest.mark.parametrize('name', ['google-earth', 'browser-game.exe', 'chromedriver-tests', 'initramfs-tool',
+                                  'game.exe', ''])
+def test_default_rules_do_not_match_broad_substrings(name):
+    assert get_process_classifier().classify_name(name) is None
+
+
+def test_rules_match_name_exe_uid_and_parent(sleeper):
+    parent_name = os.path.basename(sys.executable)
+    by_name = ProcessClassifier([ProcessRule(EXPENDABLE, 'name', 'sleep')])
+    by_exe = ProcessClassifier([ProcessRule(EXPENDABLE, 'exe', '.*/sleep')])
+    by_uid = ProcessClassifier([ProcessRule(PROTECTED, 'uid', str(os.getuid()))])
+    by_parent = ProcessClassifier([ProcessRule(PROTECTED, 'parent', r'python.*|' + parent_name)])
+    assert by_name.category(sleeper.pid) == EXPENDABLE
+    assert by_exe.category(sleeper.pid) == EXPENDABLE
+    assert by_uid.category(sleeper.pid) == PROTECTED
+    assert by_parent.category(sleeper.pid) == PROTECTED
+    assert ProcessClassifier([]).category(sleeper.pid) is None
+
+
+def test_cgroup_rule_reads_proc_root(sleeper, tmp_path):
+    (tmp_path / str(sleeper.pid)).mkdir()
+    (tmp_path / str(sleeper.pid) / 'cgroup').write_text("0::/system.slice/cron.service\n")
+    classifier = ProcessClassifier([ProcessRule(PROTECTED, 'cgroup', r'/system\.slice/.*')], proc_root=str(tmp_path))
+    assert classifier.is_protected(sleeper.pid)
+
+
+def test_protected_wins_over_expendable(sleeper):
+    classifier = ProcessClassifier([ProcessRule(EXPENDABLE, 'name', 'sleep'),
+                                    ProcessRule(PROTECTED, 'exe', '.*/sleep')])
+    assert classifier.is_protected(sleeper.pid)
+
+
+def test_profile_rules_override_defaults(sleeper):
+    classifier = ProcessClassifier([ProcessRule(PROTECTED, 'name', 'sleep')])
+    classifier.set_profile_rules([{'category': EXPENDABLE, 'field': 'name', 'pattern': 'sle+p'}])
+    assert classifier.is_expendable(sleeper.pid)
+    classifier.set_profile_rules()
+    assert classifier.is_protected(sleeper.pid)
+
+
+def test_booster_itself_is_always_protected():
+    classifier = ProcessClassifier([ProcessRule(EXPENDABLE, 'name', '.*')])
+    assert classifier.is_protected(os.getpid())
+
+
+def test_results_are_cached_per_process(sleeper):
+    classifier = ProcessClassifier([ProcessRule(EXPENDABLE, 'name', 'sleep')])
+    rule = classifier.classify(sleeper.pid)
+    assert len(classifier.cache) == 1
+    assert classifier.classify(sleeper.pid) is rule
+    assert len(classifier.cache) == 1
+
+
+def test_invalid_rules_are_ignored(sleeper):
+    classifier = ProcessClassifier([ProcessRule(EXPENDABLE, 'name', '(unclosed'),
+                                    ProcessRule(EXPENDABLE, 'color', 'red'),
+                                    ProcessRule(EXPENDABLE, 'name', '(s)(l)eep')])
+    assert [rule.pattern for rule in classifier.default_rules.rules] == ['(s)(l)eep']
+    assert classifier.is_expendable(sleeper.pid)
+
+
+def test_rules_that_cannot_be_combined_are_matched_alone(sleeper):
+    classifier = ProcessClassifier([])
+    classifier.set_profile_rules([
+        {'category': PROTECTED, 'field': 'name', 'pattern': '(?i)discord'},
+        {'category': EXPENDABLE, 'field': 'name', 'pattern': '(?P<app>chrome)'},
+        {'category': EXPENDABLE, 'field': 'name', 'pattern': '(?P<app>sle+p)'},
+    ])
+    assert len(classifier.profile_rules.rules) == 3
+    assert classifier.classify_name('Discord').category == PROTECTED
+    assert classifier.classify_name('chrome').pattern == '(?P<app>chrome)'
+    assert classifier.is_expendable(sleeper.pid)
+
+
+def test_rule_groups_identify_the_matching_rule(sleeper):
+    first, second = ProcessRule(EXPENDABLE, 'name', '(a)(b)(c)'), ProcessRule(EXPENDABLE, 'name', 'sleep')
+    assert ProcessClassifier([first, second]).classify(sleeper.pid) is second
+
+
+def test_exited_process_is_unclassified():
+    child = subprocess.Popen(['true'])
+    child.wait()
+    assert ProcessClassifier([ProcessRule(PROTECTED, 'name', '.*')]).classify(child.pid) is None
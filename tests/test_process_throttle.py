@@ -0,0 +1,117 @@
+"""
+Tests for throttling processes in a cgroup instead of terminating them
+"""
+import errno
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import cgroups as cgroups_module
+from utils.cgroups import CgroupManager
+from utils.process_throttle import THROTTLE_GROUP, ProcessThrottle
+
+
+@pytest.fixture
+def cgroup_root(tmp_path):
+    # A stand-in hierarchy: plain files, so no privileges are needed
+    (tmp_path / 'cgroup.controllers').write_text("")
+    return str(tmp_path)
+
+
+@pytest.fixture
+def sleeper():
+    child = subprocess.Popen(['sleep', '30'])
+    yield child
+    child.kill()
+    child.wait()
+
+
+def test_throttle_and_release(cgroup_root, sleeper):
+    throttle = ProcessThrottle(CgroupManager(root=cgroup_root), sys_root=cgroup_root)
+    assert throttle.available()
+    assert throttle.throttle([sleeper.pid]) == [sleeper.pid]
+    assert throttle.cgroups.read(THROTTLE_GROUP, 'cpu.max') == "25000 100000"
+    assert throttle.release() == 1
+    assert not throttle.cgroups.exists(THROTTLE_GROUP)
+
+
+def test_throttling_after_loosen_keeps_limits_loose(cgroup_root, sleeper):
+    throttle = ProcessThrottle(CgroupManager(root=cgroup_root), sys_root=cgroup_root)
+    throttle.throttle([os.getpid()])
+    throttle.loosen()
+    assert throttle.throttle([sleeper.pid]) == [sleeper.pid]
+    assert throttle.cgroups.read(THROTTLE_GROUP, 'cpu.max') == "max 100000"
+    throttle.tighten()
+    assert throttle.cgroups.read(THROTTLE_GROUP, 'cpu.max') == "25000 100000"
+    throttle.release()
+
+
+def test_unavailable_without_cgroup_v2(tmp_path):
+    assert not ProcessThrottle(CgroupManager(root=str(tmp_path))).available()
+
+
+def test_unavailable_without_write_access(cgroup_root, monkeypatch):
+    # Non-root users on cgroup v2 see cgroup.controllers but cannot create groups
+    monkeypatch.setattr(cgroups_module.os, 'access', lambda path, mode: False)
+    throttle = ProcessThrottle(CgroupManager(root=cgroup_root))
+    assert not throttle.available()
+    assert throttle.throttle([os.getpid()]) == []
+
+
+def test_permission_denied_on_create_disables_throttling(cgroup_root, sleeper, monkeypatch):
+    manager = CgroupManager(root=cgroup_root)
+
+    def create(name):
+        raise PermissionError(errno.EACCES, "Permission denied", manager.path(name))
+
+    monkeypatch.setattr(manager, 'create', create)
+    throttle = ProcessThrottle(manager, sys_root=cgroup_root)
+    assert throttle.available()
+    assert throttle.throttle([sleeper.pid]) == []
+    assert not throttle.available()
+    assert throttle.pids == set()
+
+
+def test_optimizer_terminates_when_throttling_fails(monkeypatch):
+    pytest.importorskip('sklearn')
+    from utils.optimizer import SystemOptimizer
+    from utils.temperature_monitor import ProcessRecord
+
+    optimizer = SystemOptimizer.__new__(SystemOptimizer)
+    optimizer.throttle_processes = True
+    optimizer.throttle = ProcessThrottle(CgroupManager(root="/nonexistent"))
+    monkeypatch.setattr(optimizer.throttle, 'available', lambda: True)
+    monkeypatch.setattr(optimizer.throttle, 'throttle', lambda pids: [])
+    monkeypatch.setattr(optimizer, '_protected_pids', lambda: set())
+    monkeypatch.setattr(optimizer, '_is_system_critical_process', lambda proc: False)
+    terminated = []
+
+    class Monitor:
+        def get_highest_temperature_processes(self, limit):
+            return [ProcessRecord(4242, 'hot', 99.0, 1.0, 0, 90.0)]
+
+        def terminate_high_temperature_process(self, pid):
+            terminated.append(pid)
+            return True
+
+    optimizer.temp_monitor = Monitor()
+    assert optimizer.terminate_high_temperature_processes(threshold=70.0, count=1) == ([], [4242])
+    assert terminated == [4242]
+
+
+def test_optimizer_counts_processes_by_how_they_were_stopped():
+    pytest.importorskip('sklearn')
+    from utils.optimizer import PROCESSES_TERMINATED, PROCESSES_THROTTLED, SystemOptimizer
+
+    optimizer = SystemOptimizer.__new__(SystemOptimizer)
+    throttled = PROCESSES_THROTTLED.value(reason='test')
+    terminated = PROCESSES_TERMINATED.value(reason='test')
+    assert optimizer._count_stopped([], [4242], 'test') == 'terminated'
+    assert optimizer._count_stopped([4243, 4244], [], 'test') == 'throttled'
+    assert optimizer._count_stopped([4245], [4246], 'test') == 'throttled or terminated'
+    assert PROCESSES_THROTTLED.value(reason='test') == throttled + 3
+    assert PROCESSES_TERMINATED.value(reason='test') == terminated + 2
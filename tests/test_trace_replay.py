@@ -0,0 +1,32 @@
+"""
+Tests for reading recorded traces
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.trace_replay import read_trace, synthetic_trace
+
+
+def _events_as_tuples(events):
+    return [(kind, timestamp, [row.to_dict() for row in data] if kind == 'processes' else data)
+            for kind, timestamp, data in events]
+
+
+def test_truncated_trace_stops_at_the_last_complete_record(tmp_path):
+    path = str(tmp_path / "session.trace")
+    synthetic_trace(path, hours=0.05)
+    with open(path, 'rb') as f:
+        data = f.read()
+    complete = _events_as_tuples(read_trace(path))
+    assert any(kind == 'processes' for kind, _, _ in complete)
+
+    # Cut anywhere in the last few kilobytes, including inside S, P and N records
+    truncated = str(tmp_path / "truncated.trace")
+    for cut in range(1, 4096, 13):
+        with open(truncated, 'wb') as f:
+            f.write(data[:-cut])
+        events = _events_as_tuples(read_trace(truncated))
+        assert events == complete[:len(events)]
+        assert len(events) < len(complete)
@@ -0,0 +1,66 @@
+"""
+Tests for the span ring buffers
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import tracing
+
+
+@pytest.fixture(autouse=True)
+def fresh_tracing():
+    tracing.clear()
+    tracing.enable(16)
+    yield
+    tracing.disable()
+    tracing.clear()
+
+
+def _record_on_thread(name):
+    thread = threading.Thread(target=lambda: tracing.span(name).__enter__().__exit__(None, None, None))
+    thread.start()
+    thread.join()
+
+
+def test_export_releases_buffers_of_finished_threads():
+    for index in range(5):
+        _record_on_thread(f"worker.{index}")
+    assert len(tracing._buffers) == 5
+    names = {event['name'] for event in tracing.collect_events() if event['ph'] == 'X'}
+    assert names == {f"worker.{index}" for index in range(5)}
+    assert tracing._buffers == []
+
+
+def test_export_keeps_buffers_of_live_threads():
+    with tracing.span("main"):
+        pass
+    tracing.collect_events()
+    tracing.collect_events()
+    assert len(tracing._buffers) == 1
+
+
+def test_buffer_count_is_capped(monkeypatch):
+    monkeypatch.setattr(tracing, '_max_buffers', 3)
+    for index in range(10):
+        _record_on_thread(f"worker.{index}")
+    assert len(tracing._buffers) == 3
+    names = [event['name'] for event in tracing.collect_events() if event['ph'] == 'X']
+    assert names == ["worker.7", "worker.8", "worker.9"]
+
+
+def test_enable_starts_buffers_of_the_new_capacity():
+    with tracing.span("before"):
+        pass
+    tracing.enable(4)
+    for _ in range(6):
+        with tracing.span("after"):
+            pass
+    assert [len(buffer.slots) for buffer in tracing._buffers] == [16, 4]
+    names = [event['name'] for event in tracing.collect_events() if event['ph'] == 'X']
+    assert names == ["before"] + ["after"] * 4
+    assert len(tracing._buffers) == 1
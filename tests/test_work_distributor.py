@@ -0,0 +1,41 @@
+"""
+Tests for the local work distributor
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.work_distributor import LocalWorkDistributor, fit_feature_statistics, merge_feature_statistics
+
+ROWS = [[float(i), float(i % 7)] for i in range(400)]
+
+
+def test_small_jobs_run_in_the_calling_process():
+    distributor = LocalWorkDistributor(local_workers=1, serial_below=1000)
+    outcome = distributor.run(fit_feature_statistics, ROWS, merge=merge_feature_statistics)
+    assert not outcome['distributed']
+    assert outcome['complete']
+    assert outcome['result']['count'] == len(ROWS)
+    assert distributor.workers == []
+    assert distributor.stats['serial_tasks'] == 1
+
+
+def test_send_to_dead_worker_requeues_its_partition():
+    distributor = LocalWorkDistributor(local_workers=1, serial_below=0)
+    distributor.start()
+    try:
+        worker = distributor.workers[0]
+        first_pid = worker.process.pid
+        worker.process.kill()
+        worker.process.join(5)
+
+        outcome = distributor.run(fit_feature_statistics, ROWS, merge=merge_feature_statistics, partitions=4)
+        assert outcome['distributed']
+        assert outcome['complete']
+        assert outcome['errors'] == []
+        assert outcome['result'] == merge_feature_statistics([fit_feature_statistics(ROWS)])
+        assert worker.restarts == 1
+        assert worker.process.pid != first_pid
+    finally:
+        distributor.shutdown()
@@ -0,0 +1,215 @@
+"""
+Incremental process table updates for the Zio-Booster Treeview
+"""
+
+from typing import Dict, List, Sequence
+
+from utils.tracing import traced
+
+
+def _longest_increasing_subsequence(values: Sequence[int]) -> List[int]:
+    """Return the positions in values that form a longest increasing subsequence"""
+    tails = []  # index into values of the smallest tail for each length
+    previous = [-1] * len(values)
+    for i, value in enumerate(values):
+        low, high = 0, len(tails)
+        while low < high:
+            mid = (low + high) // 2
+            if values[tails[mid]] < value:
+                low = mid + 1
+            else:
+                high = mid
+        if low > 0:
+            previous[i] = tails[low - 1]
+        if low == len(tails):
+            tails.append(i)
+        else:
+            tails[low] = i
+
+    positions = []
+    i = tails[-1] if tails else -1
+    while i != -1:
+        positions.append(i)
+        i = previous[i]
+    positions.reverse()
+    return positions
+
+
+class ProcessTreeUpdater:
+    """
+    Applies process lists to a ttk.Treeview as a keyed diff.
+
+    Rows are keyed by PID (used as the Treeview item id), so the selection
+    survives refreshes. Each refresh deletes vanished rows in one call,
+    rewrites only rows whose text changed, inserts new rows at their rank
+    and moves the fewest rows needed to restore the ranking: rows that
+    form the longest run already in order stay where they are.
+    """
+
+    def __init__(self, tree, key_column: int = 1):
+        self.tree = tree
+        self.key_column = key_column
+        self.rows: Dict[str, tuple] = {}
+        self.order: List[str] = []
+        self.last_operations = 0
+
+    @traced(category="ui")
+    def update(self, rows: Sequence[Sequence]) -> int:
+        """Show rows in the given order; returns the number of Tk calls made"""
+        tree = self.tree
+        operations = 0
+
+        target = []
+        values_by_key = {}
+        for row in rows:
+            key = str(row[self.key_column])
+            if key in values_by_key:
+                continue
+            target.append(key)
+            values_by_key[key] = tuple(row)
+
+        # Remove rows that dropped out, in a single call
+        removed = [key for key in self.order if key not in values_by_key]
+        if removed:
+            tree.delete(*removed)
+            operations += 1
+        kept = [key for key in self.order if key in values_by_key]
+
+        # Rows already in relative order stay put; the rest are detached and re-placed
+        rank = {key: i for i, key in enumerate(target)}
+        stable = {kept[i] for i in _longest_increasing_subsequence([rank[key] for key in kept])}
+        unstable = [key for key in kept if key not in stable]
+        if unstable:
+            tree.detach(*unstable)
+            operations += 1
+
+        for index, key in enumerate(target):
+            values = values_by_key[key]
+            if key not in self.rows:
+                tree.insert("", index, iid=key, values=values)
+                operations += 1
+                continue
+            if key not in stable:
+                # Everything ranked above this row is already in place
+                tree.move(key, "", index)
+                operations += 1
+            if self.rows[key] != values:
+                tree.item(key, values=values)
+                operations += 1
+
+        for key in removed:
+            del self.rows[key]
+        self.rows.update(values_by_key)
+        self.order = target
+        self.last_operations = operations
+        return operations
+
+    def clear(self):
+        """Remove every row"""
+        if self.order:
+            self.tree.delete(*self.order)
+        self.rows = {}
+        self.order = []
+
+
+def replace_all_rows(tree, rows: Sequence[Sequence]) -> int:
+    """The original refresh: delete every row and insert the new ones"""
+    operations = 1
+    for item in tree.get_children():
+        tree.delete(item)
+        operations += 1
+    for row in rows:
+        tree.insert("", "end", values=tuple(row))
+        operations += 1
+    return operations
+
+
+class CountingTree:
+    """Minimal stand-in for a ttk.Treeview that records the calls made to it"""
+
+    def __init__(self):
+        self.children: List[str] = []
+        self.detached = set()
+        self.values: Dict[str, tuple] = {}
+        self.calls = 0
+        self._next_id = 0
+
+    def get_children(self, item=""):
+        self.calls += 1
+        return tuple(self.children)
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.calls += 1
+        if iid is None:
+            self._next_id += 1
+            iid = f"I{self._next_id:03X}"
+        position = len(self.children) if index == "end" else index
+        self.children.insert(position, iid)
+        self.values[iid] = tuple(values)
+        return iid
+
+    def delete(self, *items):
+        self.calls += 1
+        for item in items:
+            if item in self.children:
+                self.children.remove(item)
+            self.detached.discard(item)
+            self.values.pop(item, None)
+
+    def detach(self, *items):
+        self.calls += 1
+        for item in items:
+            self.children.remove(item)
+            self.detached.add(item)
+
+    def move(self, item, parent, index):
+        self.calls += 1
+        if item in self.children:
+            self.children.remove(item)
+        self.detached.discard(item)
+        self.children.insert(index, item)
+
+    def item(self, item, values=None):
+        self.calls += 1
+        if values is not None:
+            self.values[item] = tuple(values)
+        return {'values': self.values[item]}
+
+
+def benchmark_refresh(ticks: int = 200, process_count: int = 300, visible: int = 20,
+                      churn: float = 0.3, seed: int = 7) -> Dict[str, float]:
+    """Count Tk calls per refresh for the full rebuild and the keyed diff"""
+    import random
+    rng = random.Random(seed)
+    processes = {pid: [f"proc{pid}", rng.uniform(0, 50), rng.uniform(0, 10)] for pid in range(1000, 1000 + process_count)}
+
+    def sample():
+        # A share of the processes changes CPU usage each tick, which reshuffles the ranking
+        for proc in processes.values():
+            if rng.random() < churn:
+                proc[1] = max(0.0, proc[1] + rng.gauss(0, 2))
+        ranked = sorted(processes.items(), key=lambda item: item[1][1], reverse=True)[:visible]
+        return [(name, pid, f"{cpu:.1f}", f"{mem:.1f}", f"{cpu * 0.7:.1f}") for pid, (name, cpu, mem) in ranked]
+
+    full_tree, diff_tree = CountingTree(), CountingTree()
+    updater = ProcessTreeUpdater(diff_tree)
+    for _ in range(ticks):
+        rows = sample()
+        replace_all_rows(full_tree, rows)
+        updater.update(rows)
+        assert diff_tree.children == [str(row[1]) for row in rows]
+
+    return {
+        'ticks': ticks,
+        'full_rebuild_calls_per_refresh': full_tree.calls / ticks,
+        'keyed_diff_calls_per_refresh': diff_tree.calls / ticks
+    }
+
+
+# Example usage
+if __name__ == "__main__":
+    for churn in (0.1, 0.3, 1.0):
+        result = benchmark_refresh(churn=churn)
+        print(f"{churn:.0%} of processes changing per tick: "
+              f"full rebuild {result['full_rebuild_calls_per_refresh']:.1f} Tk calls, "
+              f"keyed diff {result['keyed_diff_calls_per_refresh']:.1f} Tk calls per refresh")
@@ -0,0 +1,242 @@
+"""
+Frame-budgeted rendering for the Zio-Booster UI
+Coalesces widget updates and applies them at most once per frame
+"""
+
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from utils.tracing import traced
+
+# Marks an option the widget has not received through the renderer yet
+_MISSING = object()
+
+
+class FrameRenderer:
+    """
+    Collects pending widget changes and applies them once per frame.
+
+    set() records option values per widget; repeated changes before the next
+    frame collapse into one configure call, and values equal to what the
+    widget already shows are dropped. schedule() does the same for keyed
+    callbacks such as a table refresh, where only the latest one runs.
+
+    Frames run at most max_fps times a second and stop once frame_budget_ms
+    is spent, carrying the rest over to the next frame. While the window is
+    minimized or withdrawn nothing is drawn; pending changes wait until the
+    window is mapped again.
+    """
+
+    def __init__(self, root, max_fps: float = 20.0, frame_budget_ms: float = 8.0):
+        self.root = root
+        self.min_frame_interval = 1.0 / max_fps
+        self.frame_budget = frame_budget_ms / 1000.0
+
+        # Pending options per widget and the values each widget last received
+        self.pending: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+        self.pending_callbacks: Dict[Hashable, Callable[[], Any]] = {}
+        self.applied: Dict[int, Dict[str, Any]] = {}
+
+        self.frame_scheduled = False
+        self.last_frame = 0.0
+        self.stats = {
+            'frames': 0,
+            'configure_calls': 0,
+            'callbacks_run': 0,
+            'coalesced': 0,
+            'unchanged_skipped': 0,
+            'over_budget_frames': 0,
+            'hidden_skips': 0
+        }
+
+        # Resume drawing when the window comes back
+        try:
+            self.root.bind("<Map>", self._on_map, add="+")
+        except Exception:
+            pass
+
+    def set(self, widget, **options):
+        """Queue option changes for a widget, e.g. set(label, text="CPU: 5%")"""
+        key = id(widget)
+        applied = self.applied.get(key, {})
+        entry = self.pending.get(key)
+
+        for option, value in options.items():
+            if entry and option in entry[1]:
+                self.stats['coalesced'] += 1
+                if applied.get(option, _MISSING) == value:
+                    # Changed back to what is already on screen
+                    del entry[1][option]
+                    continue
+            elif applied.get(option, _MISSING) == value:
+                self.stats['unchanged_skipped'] += 1
+                continue
+
+            if entry is None:
+                entry = self.pending[key] = (widget, {})
+            entry[1][option] = value
+
+        if entry is not None:
+            if entry[1]:
+                self._request_frame()
+            else:
+                del self.pending[key]
+
+    def schedule(self, key: Hashable, callback: Callable[[], Any]):
+        """Queue a callback for the next frame; a later callback with the same key replaces it"""
+        if key in self.pending_callbacks:
+            self.stats['coalesced'] += 1
+        self.pending_callbacks[key] = callback
+        self._request_frame()
+
+    def forget(self, widget):
+        """Drop pending and cached state for a destroyed widget"""
+        key = id(widget)
+        self.pending.pop(key, None)
+        self.applied.pop(key, None)
+
+    def is_visible(self) -> bool:
+        """Whether the window is currently shown"""
+        try:
+            return self.root.state() not in ("iconic", "withdrawn")
+        except Exception:
+            return False
+
+    @traced(category="ui")
+    def render_frame(self) -> int:
+        """Apply pending changes within the frame budget; returns the number of updates made"""
+        self.frame_scheduled = False
+        if not self.pending and not self.pending_callbacks:
+            return 0
+        if not self.is_visible():
+            # <Map> requests a frame once the window is restored
+            self.stats['hidden_skips'] += 1
+            return 0
+
+        start = time.perf_counter()
+        self.last_frame = time.time()
+        self.stats['frames'] += 1
+        updates = 0
+
+        for key in list(self.pending):
+            if updates and time.perf_counter() - start >= self.frame_budget:
+                break
+            widget, options = self.pending.pop(key)
+            try:
+                widget.configure(**options)
+                self.applied.setdefault(key, {}).update(options)
+                self.stats['configure_calls'] += 1
+            except Exception as e:
+                # Widget was destroyed
+                print(f"Error applying widget update: {e}")
+                self.applied.pop(key, None)
+            updates += 1
+
+        for key in list(self.pending_callbacks):
+            if updates and time.perf_counter() - start >= self.frame_budget:
+                break
+            callback = self.pending_callbacks.pop(key)
+            try:
+                callback()
+                self.stats['callbacks_run'] += 1
+            except Exception as e:
+                print(f"Error running render callback {key}: {e}")
+            updates += 1
+
+        if self.pending or self.pending_callbacks:
+            # Out of budget; finish on the next frame
+            self.stats['over_budget_frames'] += 1
+            self._request_frame()
+        return updates
+
+    def _request_frame(self):
+        """Arrange for render_frame to run, no sooner than the frame rate cap allows"""
+        if self.frame_scheduled:
+            return
+        self.frame_scheduled = True
+        delay = max(0.0, self.last_frame + self.min_frame_interval - time.time())
+        self.root.after(int(delay * 1000), self.render_frame)
+
+    def _on_map(self, event):
+        """Draw any changes that piled up while the window was hidden"""
+        if event.widget is self.root and (self.pending or self.pending_callbacks):
+            self._request_frame()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Counters describing how much work was coalesced or skipped"""
+        stats = dict(self.stats)
+        stats['pending'] = len(self.pending) + len(self.pending_callbacks)
+        return stats
+
+
+class CountingWidget:
+    """Minimal stand-in for a label that records configure calls"""
+
+    def __init__(self):
+        self.options: Dict[str, Any] = {}
+        self.calls = 0
+
+    def configure(self, **options):
+        self.calls += 1
+        self.options.update(options)
+
+
+class ManualRoot:
+    """Minimal stand-in for a Tk root whose frames are run by hand"""
+
+    def __init__(self):
+        self.window_state = "normal"
+        self.callbacks = []
+
+    def after(self, delay, callback):
+        self.callbacks.append(callback)
+
+    def bind(self, sequence, callback, add=None):
+        pass
+
+    def state(self):
+        return self.window_state
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def benchmark_coalescing(ticks: int = 200, updates_per_tick: int = 12, seed: int = 3) -> Dict[str, float]:
+    """Count configure calls made directly versus through the renderer"""
+    import random
+    rng = random.Random(seed)
+    names = ['cpu', 'memory', 'temp', 'optimizations', 'gaming_mode', 'status']
+    direct = {name: CountingWidget() for name in names}
+    rendered = {name: CountingWidget() for name in names}
+    root = ManualRoot()
+    renderer = FrameRenderer(root)
+
+    values = {name: 0 for name in names}
+    for _ in range(ticks):
+        for _ in range(updates_per_tick):
+            name = rng.choice(names)
+            # Readings mostly repeat between ticks, as idle labels do
+            if rng.random() < 0.3:
+                values[name] += 1
+            text = f"{name}: {values[name]}"
+            direct[name].configure(text=text)
+            renderer.set(rendered[name], text=text)
+        root.run_pending()
+
+    for name in names:
+        assert rendered[name].options == direct[name].options
+
+    return {
+        'ticks': ticks,
+        'direct_calls_per_tick': sum(w.calls for w in direct.values()) / ticks,
+        'rendered_calls_per_tick': sum(w.calls for w in rendered.values()) / ticks
+    }
+
+
+# Example usage
+if __name__ == "__main__":
+    result = benchmark_coalescing()
+    print(f"Direct configure: {result['direct_calls_per_tick']:.1f} calls per tick, "
+          f"frame renderer: {result['rendered_calls_per_tick']:.1f} calls per tick")
@@ -0,0 +1,186 @@
+"""
+Adaptive scheduling for Zio-Booster background loops
+Runs periodic jobs on one shared thread, adapting their intervals to system pressure
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+def compute_pressure(cpu_percent: Optional[float] = None, memory_percent: Optional[float] = None,
+                     temperature: Optional[float] = None, anomaly_score: Optional[float] = None) -> float:
+    """
+    Combine load signals into a single pressure value between 0 (idle) and 1 (busy)
+    """
+    levels = [0.0]
+    if cpu_percent is not None:
+        levels.append(cpu_percent / 100.0)
+    if memory_percent is not None:
+        # Memory below half full is not a concern
+        levels.append((memory_percent - 50.0) / 50.0)
+    if temperature is not None:
+        levels.append((temperature - 50.0) / 40.0)
+    if anomaly_score is not None:
+        levels.append(anomaly_score)
+    return min(1.0, max(0.0, max(levels)))
+
+
+class ScheduledJob:
+    """A periodic job whose interval follows the pressure it reports"""
+
+    def __init__(self, name: str, callback: Callable[[], Optional[float]], base_interval: float,
+                 min_interval: Optional[float] = None, max_interval: Optional[float] = None,
+                 busy_threshold: float = 0.7, idle_threshold: float = 0.25):
+        self.name = name
+        self.callback = callback
+        self.base_interval = base_interval
+        self.min_interval = min_interval if min_interval is not None else base_interval / 4
+        self.max_interval = max_interval if max_interval is not None else base_interval * 16
+        self.busy_threshold = busy_threshold
+        self.idle_threshold = idle_threshold
+
+        self.interval = base_interval
+        self.next_run = time.time() + base_interval
+        self.runs = 0
+        self.last_pressure = None
+
+    def adapt(self, pressure: Optional[float]):
+        """
+        Halve the interval under pressure, double it while idle, otherwise
+        return to the base interval
+        """
+        if pressure is None:
+            return
+        self.last_pressure = pressure
+        if pressure >= self.busy_threshold:
+            self.interval = max(self.min_interval, self.interval / 2)
+        elif pressure <= self.idle_threshold:
+            self.interval = min(self.max_interval, self.interval * 2)
+        else:
+            self.interval = self.base_interval
+
+    def describe(self) -> Dict:
+        """Current state of the job"""
+        return {
+            'name': self.name,
+            'interval': self.interval,
+            'next_run_in': max(0.0, self.next_run - time.time()),
+            'runs': self.runs,
+            'last_pressure': self.last_pressure
+        }
+
+
+class AdaptiveScheduler:
+    """
+    Runs every registered job from a single thread.
+
+    When the thread wakes for the earliest due job it also runs any other job
+    due within coalesce_window (a fraction of that job's interval), so loops
+    with nearby deadlines share one wake-up instead of each waking on its own.
+    """
+
+    def __init__(self, coalesce_window: float = 0.25, error_retry: float = 5.0):
+        self.coalesce_window = coalesce_window
+        self.error_retry = error_retry
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.condition = threading.Condition()
+        self.thread = None
+        self.is_running = False
+        self.wakeups = 0
+
+    def add_job(self, name: str, callback: Callable[[], Optional[float]], base_interval: float,
+                min_interval: Optional[float] = None, max_interval: Optional[float] = None,
+                run_now: bool = True) -> ScheduledJob:
+        """
+        Register a job. The callback returns a pressure value in [0, 1], or None
+        to keep its current interval.
+        """
+        job = ScheduledJob(name, callback, base_interval, min_interval, max_interval)
+        if run_now:
+            job.next_run = time.time()
+        with self.condition:
+            self.jobs[name] = job
+            self.condition.notify()
+        self.start()
+        return job
+
+    def remove_job(self, name: str):
+        """Unregister a job"""
+        with self.condition:
+            self.jobs.pop(name, None)
+            self.condition.notify()
+
+    def wake(self, name: str):
+        """Run a job as soon as possible at its shortest interval, e.g. after an event"""
+        with self.condition:
+            job = self.jobs.get(name)
+            if job:
+                job.interval = job.min_interval
+                job.next_run = time.time()
+                self.condition.notify()
+
+    def start(self):
+        """Start the scheduler thread"""
+        with self.condition:
+            if self.is_running:
+                return
+            self.is_running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread"""
+        with self.condition:
+            self.is_running = False
+            self.condition.notify()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def _due_jobs(self, now: float) -> List[ScheduledJob]:
+        """Jobs that are due, or due soon enough to share this wake-up"""
+        return [job for job in self.jobs.values()
+                if job.next_run <= now + job.interval * self.coalesce_window]
+
+    def _run(self):
+        """Scheduler thread body"""
+        while True:
+            with self.condition:
+                while self.is_running:
+                    now = time.time()
+                    if self.jobs:
+                        earliest = min(job.next_run for job in self.jobs.values())
+                        if earliest <= now:
+                            break
+                        self.condition.wait(earliest - now)
+                    else:
+                        # Nothing registered; sleep until a job is added
+                        self.condition.wait()
+                if not self.is_running:
+                    return
+                due = self._due_jobs(time.time())
+                self.wakeups += 1
+
+            for job in due:
+                try:
+                    pressure = job.callback()
+                    job.adapt(pressure)
+                    job.next_run = time.time() + job.interval
+                except Exception as e:
+                    print(f"Error in scheduled job {job.name}: {e}")
+                    job.next_run = time.time() + self.error_retry
+                job.runs += 1
+
+    def get_stats(self) -> Dict:
+        """Wake-up count and the state of every job"""
+        with self.condition:
+            jobs = [job.describe() for job in self.jobs.values()]
+        return {'wakeups': self.wakeups, 'jobs': jobs}
+
+
+# Global instance shared by the optimization loops
+shared_scheduler_instance = AdaptiveScheduler()
+
+
+def get_shared_scheduler():
+    """Get the global adaptive scheduler instance."""
+    return shared_scheduler_instance
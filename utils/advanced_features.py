@@ -5,14 +5,19 @@ Implements cutting-edge technologies and advanced optimization techniques
 import time
 import psutil
 import numpy as np
-import threading
 import random
-import json
-import hashlib
+from collections import deque
+from functools import partial
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import logging
 
+from .performance_ledger import PerformanceLedger
+from .work_distributor import LocalWorkDistributor
+from .bounded_history import BoundedHistory, NumericHistory, memory_report
+from .adaptive_scheduler import compute_pressure, get_shared_scheduler
+from .temperature_monitor import TemperatureMonitor
+
 # Optional imports for advanced features (will be handled gracefully if not available)
 try:
     import tensorflow as tf
@@ -31,52 +36,215 @@ except ImportError:
     QISKIT_AVAILABLE = False
     print("Qiskit not available - Quantum features will be simulated")
 
+class SystemConfigurationModel:
+    """
+    Cost model of the system built from a single cached snapshot.
+
+    A configuration vector holds, for each of the top background processes,
+    a nice level and an affinity mask (stored as the number of cores the
+    process may use, counted from the highest core down), followed by one
+    cache-drop decision. Candidate batches are scored with numpy so no
+    system calls happen while the annealer searches.
+    """
+    # CFS weight of nice 0; each nice step scales the weight by ~1.25
+    NICE_0_WEIGHT = 1024.0
+
+    def __init__(self, cpu_count: int, process_cpu: np.ndarray, memory_percent: float,
+                 cached_fraction: float = 0.0, reserved_cores: Optional[int] = None,
+                 pids: Optional[List[int]] = None):
+        self.cpu_count = max(1, int(cpu_count))
+        # CPU demand of each background process, in cores
+        self.process_cpu = np.asarray(process_cpu, dtype=np.float64)
+        self.memory_percent = float(memory_percent)
+        self.cached_fraction = float(cached_fraction)
+        # Low cores kept free for the game
+        self.reserved_cores = reserved_cores if reserved_cores is not None else max(1, self.cpu_count // 2)
+        self.pids = list(pids) if pids is not None else []
+        self.process_count = len(self.process_cpu)
+        self.dimension = 2 * self.process_count + 1
+        
+        # Per-coordinate bounds: nice levels, core counts, cache drop flag
+        self.lower = np.concatenate([
+            np.zeros(self.process_count),
+            np.ones(self.process_count),
+            [0]
+        ]).astype(np.int64)
+        self.upper = np.concatenate([
+            np.full(self.process_count, 19),
+            np.full(self.process_count, self.cpu_count),
+            [1]
+        ]).astype(np.int64)
+    
+    @classmethod
+    def from_system(cls, max_processes: int = 8, sample_interval: float = 0.2) -> 'SystemConfigurationModel':
+        """
+        Build the model from one snapshot of the live system
+        """
+        cpu_count = psutil.cpu_count() or 1
+        memory = psutil.virtual_memory()
+        cached = getattr(memory, 'cached', 0) or 0
+        
+        # A process's first cpu_percent() call always reports 0.0, so prime
+        # every counter and read the same Process objects after an interval
+        processes = []
+        for proc in psutil.process_iter():
+            try:
+                proc.cpu_percent(None)
+                processes.append(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        time.sleep(sample_interval)
+        
+        candidates = []
+        for proc in processes:
+            try:
+                cpu = proc.cpu_percent(None)
+                if cpu > 0:
+                    candidates.append((cpu, proc.pid))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        candidates.sort(reverse=True)
+        candidates = candidates[:max_processes]
+        
+        return cls(
+            cpu_count=cpu_count,
+            process_cpu=[cpu / 100.0 for cpu, _ in candidates],
+            memory_percent=memory.percent,
+            cached_fraction=cached / memory.total if memory.total else 0.0,
+            pids=[pid for _, pid in candidates]
+        )
+    
+    def default_configuration(self) -> np.ndarray:
+        """
+        The untouched system: nice 0, every core allowed, no cache drop
+        """
+        config = np.empty(self.dimension, dtype=np.int64)
+        config[:self.process_count] = 0
+        config[self.process_count:2 * self.process_count] = self.cpu_count
+        config[-1] = 0
+        return config
+    
+    def evaluate(self, configs: np.ndarray) -> np.ndarray:
+        """
+        Score a batch of configurations of shape (batch, dimension); lower is better
+        """
+        configs = np.atleast_2d(configs)
+        n = self.process_count
+        nice = configs[:, :n].astype(np.float64)
+        cores = configs[:, n:2 * n].astype(np.float64)
+        drop_cache = configs[:, -1].astype(np.float64)
+        
+        # Demand each process can still place once limited to its cores
+        demand = np.minimum(self.process_cpu, cores)
+        # Masks are packed from the top core down, so only the part of the
+        # mask that spills past the free cores lands on the game's cores
+        free_cores = self.cpu_count - self.reserved_cores
+        overlap = np.clip(cores - free_cores, 0, None) / cores
+        weight = np.power(1.25, -nice)
+        interference = (demand * overlap * weight).sum(axis=1)
+        
+        # Work the background processes lose through affinity and nice
+        throttled = (self.process_cpu - demand).sum(axis=1)
+        deprioritized = (demand * (1.0 - weight)).sum(axis=1) * 0.1
+        
+        # Dropping caches only pays off under memory pressure, and refilling
+        # the page cache afterwards costs I/O proportional to what was dropped
+        pressure = max(0.0, self.memory_percent - 85.0) / 15.0
+        memory_term = pressure * (1.0 - drop_cache * self.cached_fraction) + drop_cache * self.cached_fraction * 0.5
+        
+        return interference + 0.5 * throttled + deprioritized + memory_term
+    
+    def describe(self, config: np.ndarray) -> Dict[str, Any]:
+        """
+        Translate a configuration vector into concrete settings
+        """
+        n = self.process_count
+        settings = []
+        for i in range(n):
+            cores = int(config[n + i])
+            mask = ((1 << cores) - 1) << (self.cpu_count - cores)
+            settings.append({
+                'pid': self.pids[i] if i < len(self.pids) else None,
+                'nice': int(config[i]),
+                'affinity_mask': mask
+            })
+        return {'processes': settings, 'drop_caches': bool(config[-1])}
+
+
 class QuantumInspiredOptimizer:
     """
     Quantum-inspired optimization using simulated quantum principles
     """
-    def __init__(self):
-        self.superposition_states = []
-        self.optimization_history = []
+    def __init__(self, history_size: int = 500):
+        self.superposition_states = BoundedHistory(capacity=history_size, name='superposition_states')
+        self.optimization_history = BoundedHistory(capacity=history_size, name='optimization_history')
+        self.rng = np.random.default_rng()
         
-    def quantum_annealing_simulation(self, objective_function, bounds, iterations=100):
+    def quantum_annealing_simulation(self, model: SystemConfigurationModel, iterations: int = 100,
+                                     batch_size: int = 32, initial_temperature: float = 1.0,
+                                     final_temperature: float = 0.01):
         """
         Simulate quantum annealing to find optimal system configuration
+
+        Runs batch_size annealing chains side by side. Every iteration each
+        chain perturbs one coordinate and the whole batch is scored in a
+        single model.evaluate call.
         """
-        # This is a classical simulation of quantum annealing principles
-        # Convert bounds to numpy array if they're not already
-        if not isinstance(bounds, (list, tuple, np.ndarray)):
-            bounds = [0.0, 1.0]
+        if model.process_count == 0:
+            config = model.default_configuration()
+            return config, float(model.evaluate(config)[0])
         
-        # Ensure bounds is an array-like object with 2 elements [lower, upper]
-        if len(bounds) != 2:
-            bounds = [0.0, 1.0]
+        lower, upper = model.lower, model.upper
+        span = upper - lower
+        current = np.tile(model.default_configuration(), (batch_size, 1))
+        # Spread all but the first chain over the search space
+        current[1:] = self.rng.integers(lower, upper + 1, size=(batch_size - 1, model.dimension))
+        current_scores = model.evaluate(current)
         
-        # Generate initial solution as a numpy array
-        current_solution = np.random.uniform(bounds[0], bounds[1], size=1)[0]  # Single value
-        best_solution = current_solution
-        best_score = float('inf')
+        best_index = int(np.argmin(current_scores))
+        best_solution = current[best_index].copy()
+        best_score = float(current_scores[best_index])
+        
+        rows = np.arange(batch_size)
+        cooling = (final_temperature / initial_temperature) ** (1.0 / max(1, iterations))
+        temperature = initial_temperature
         
         for i in range(iterations):
-            # Quantum tunneling simulation - occasionally accept worse solutions
-            neighbor = current_solution + np.random.normal(0, 0.1)
-            neighbor = np.clip(neighbor, bounds[0], bounds[1])  # Keep within bounds
+            # Perturb one coordinate per chain by a step scaled to its range
+            coords = self.rng.integers(0, model.dimension, size=batch_size)
+            steps = np.maximum(1, np.rint(np.abs(self.rng.normal(0, 0.25, size=batch_size)) * span[coords]))
+            signs = self.rng.choice((-1, 1), size=batch_size)
+            neighbors = current.copy()
+            neighbors[rows, coords] = np.clip(current[rows, coords] + signs * steps, lower[coords], upper[coords])
+            
+            scores = model.evaluate(neighbors)
             
-            score = objective_function(neighbor)
+            # Metropolis acceptance; worse moves tunnel through while the system is hot
+            delta = scores - current_scores
+            accept = (delta <= 0) | (self.rng.random(batch_size) < np.exp(-np.maximum(delta, 0) / temperature))
+            current[accept] = neighbors[accept]
+            current_scores[accept] = scores[accept]
             
-            # Accept if better or with quantum tunneling probability
-            if score < best_score or random.random() < 0.1:  # Simulated quantum tunneling
-                current_solution = neighbor
-                if score < best_score:
-                    best_solution = neighbor
-                    best_score = score
+            index = int(np.argmin(current_scores))
+            if current_scores[index] < best_score:
+                best_score = float(current_scores[index])
+                best_solution = current[index].copy()
             
             # Store the state for tracking
             self.superposition_states.append({
-                'solution': current_solution,
-                'score': score,
-                'iteration': i
+                'iteration': i,
+                'temperature': temperature,
+                'best_score': best_score,
+                'accepted': int(accept.sum())
             })
+            temperature *= cooling
+        
+        self.optimization_history.append({
+            'timestamp': datetime.now().isoformat(),
+            'best_score': best_score,
+            'iterations': iterations,
+            'batch_size': batch_size
+        })
         
         return best_solution, best_score
     
@@ -204,128 +372,33 @@ class NeuralPerformancePredictor:
             return False
 
 
-class BlockchainPerformanceLogger:
+class BlockchainPerformanceLogger(PerformanceLedger):
     """
-    Blockchain-based performance verification system
+    Blockchain-style performance verification backed by an append-only hash-chained ledger
     """
-    def __init__(self):
-        self.chain = []
-        self.pending_logs = []
-        self.create_genesis_block()
-    
-    def create_genesis_block(self):
-        """
-        Create the first block in the blockchain
-        """
-        # Use a simple string for the genesis data to avoid serialization issues
-        genesis_block = self.create_block(
-            index=0,
-            timestamp=datetime.now(),
-            data="Genesis Performance Block - Zio-Booster FPS Booster",
-            previous_hash="0"
-        )
-        self.chain.append(genesis_block)
-    
-    def create_block(self, index: int, timestamp: datetime, data: Any, previous_hash: str) -> Dict:
-        """
-        Create a new block in the blockchain
-        """
-        block = {
-            'index': index,
-            'timestamp': timestamp.isoformat(),
-            'data': data,
-            'previous_hash': previous_hash,
-            'hash': self._calculate_hash(index, timestamp, data, previous_hash),
-            'nonce': 0
-        }
-        
-        # Simple proof of work to add some blockchain characteristics
-        block = self._proof_of_work(block)
-        return block
-    
-    def _calculate_hash(self, index: int, timestamp: datetime, data: Any, previous_hash: str) -> str:
-        """
-        Calculate hash for a block
-        """
-        # Convert datetime to string and handle data serialization carefully
-        timestamp_str = timestamp.isoformat()
-        # Convert data to string representation to avoid serialization issues
-        if isinstance(data, (dict, list)):
-            try:
-                data_str = json.dumps(data, default=str)
-            except:
-                data_str = str(data)  # Fallback to string conversion
-        else:
-            data_str = str(data)
-        
-        block_string = f"{index}{timestamp_str}{data_str}{previous_hash}"
-        return hashlib.sha256(block_string.encode()).hexdigest()
-    
-    def _proof_of_work(self, block: Dict, difficulty: int = 1) -> Dict:
-        """
-        Simple proof of work algorithm to simulate blockchain mining
-        """
-        while True:
-            hash_result = self._calculate_hash(
-                block['index'],
-                datetime.fromisoformat(block['timestamp']),
-                block['data'],
-                block['previous_hash']
-            )
-            
-            if hash_result[:difficulty] == '0' * difficulty:
-                block['hash'] = hash_result
-                return block
-            
-            block['nonce'] += 1
-            # Add a break condition to avoid infinite loops
-            if block['nonce'] > 1000000:  # Prevent excessive computation
-                block['hash'] = hash_result
-                return block
+    GENESIS_DATA = "Genesis Performance Block - Zio-Booster FPS Booster"
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(path)
+        if self.entry_count == 0:
+            self.append(self.GENESIS_DATA)
     
     def add_performance_log(self, performance_data: Dict) -> bool:
         """
-        Add a performance log to the blockchain
+        Add a performance log to the ledger
         """
         try:
-            previous_block = self.chain[-1]
-            new_block = self.create_block(
-                index=previous_block['index'] + 1,
-                timestamp=datetime.now(),
-                data=performance_data,
-                previous_hash=previous_block['hash']
-            )
-            
-            self.chain.append(new_block)
+            self.append(performance_data)
             return True
         except Exception as e:
-            print(f"Error adding performance log to blockchain: {e}")
+            print(f"Error adding performance log to ledger: {e}")
             return False
     
-    def verify_chain(self) -> bool:
+    def verify_chain(self, full: bool = False) -> bool:
         """
-        Verify the integrity of the blockchain
+        Verify the integrity of the ledger incrementally
         """
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i-1]
-            
-            # Check if hashes match
-            if current_block['previous_hash'] != previous_block['hash']:
-                return False
-            
-            # Check if the hash is valid (satisfies proof of work)
-            calculated_hash = self._calculate_hash(
-                current_block['index'],
-                datetime.fromisoformat(current_block['timestamp']),
-                current_block['data'],
-                current_block['previous_hash']
-            )
-            
-            if calculated_hash != current_block['hash']:
-                return False
-        
-        return True
+        return self.verify(full=full)
 
 
 class BiometricEnhancedOptimizer:
@@ -333,7 +406,8 @@ class BiometricEnhancedOptimizer:
     Biometric-enhanced optimization system
     """
     def __init__(self):
-        self.biometric_data = {}
+        # stress, focus and fatigue levels; one row per update, kept for an hour
+        self.biometric_data = NumericHistory(width=3, capacity=360, ttl=3600, name='biometric_data')
         self.user_state = {
             'stress_level': 0.5,  # 0-1 scale
             'focus_level': 0.5,   # 0-1 scale
@@ -350,7 +424,11 @@ class BiometricEnhancedOptimizer:
         self.user_state['fatigue_level'] = random.uniform(0.1, 0.7)
         
         # Update biometric data with timestamp
-        self.biometric_data[datetime.now().isoformat()] = self.user_state.copy()
+        self.biometric_data.append((
+            self.user_state['stress_level'],
+            self.user_state['focus_level'],
+            self.user_state['fatigue_level']
+        ))
     
     def adjust_optimization_for_user_state(self, base_optimization_params: Dict) -> Dict:
         """
@@ -380,64 +458,101 @@ class BiometricEnhancedOptimizer:
         return adjusted_params
 
 
+def _anneal_seeds(seeds: List[int], model: SystemConfigurationModel, iterations: int):
+    """
+    Run one annealing batch per seed and return the best (solution, score); runs in worker processes
+    """
+    best = None
+    for seed in seeds:
+        optimizer = QuantumInspiredOptimizer(history_size=1)
+        optimizer.rng = np.random.default_rng(seed)
+        solution, score = optimizer.quantum_annealing_simulation(model, iterations=iterations)
+        if best is None or score < best[1]:
+            best = (solution, score)
+    return best
+
+
+def _best_annealing_result(results: List):
+    """
+    Merge annealing results from several workers
+    """
+    results = [result for result in results if result is not None]
+    return min(results, key=lambda result: result[1]) if results else None
+
+
 class EdgeComputingOptimizer:
     """
-    Edge computing integration for distributed optimization
+    Distributes optimization work across local worker processes
     """
-    def __init__(self):
+    def __init__(self, local_workers: Optional[int] = None, socket_workers: int = 0):
+        self.distributor = LocalWorkDistributor(local_workers=local_workers, socket_workers=socket_workers)
         self.edge_nodes = []
-        self.distributed_tasks = []
-        self.network_topology = {}
+        self.distributed_tasks = deque(maxlen=100)
     
     def discover_edge_nodes(self) -> List[Dict]:
         """
-        Discover available edge computing nodes (simulated)
+        Start the worker processes if needed and list the ones available
         """
-        # Simulate discovery of edge nodes
-        nodes = [
-            {'id': 'node_001', 'type': 'smartphone', 'cpu': 2.0, 'memory': 4.0, 'status': 'available'},
-            {'id': 'node_002', 'type': 'tablet', 'cpu': 1.5, 'memory': 3.0, 'status': 'available'},
-            {'id': 'node_003', 'type': 'smart_tv', 'cpu': 1.0, 'memory': 2.0, 'status': 'busy'},
-            {'id': 'node_004', 'type': 'smart_display', 'cpu': 0.8, 'memory': 1.5, 'status': 'available'}
-        ]
-        
-        self.edge_nodes = [node for node in nodes if node['status'] == 'available']
+        self.distributor.start()
+        self.edge_nodes = [node for node in self.distributor.nodes() if node['status'] == 'available']
         return self.edge_nodes
     
-    def distribute_optimization_task(self, task: Dict) -> List[Dict]:
-        """
-        Distribute an optimization task across available edge nodes
+    def distribute_optimization_task(self, task: Dict) -> Dict:
         """
-        if not self.edge_nodes:
-            return [{'local': task}]  # Fallback to local processing
-        
-        # Distribute task among available nodes
-        results = []
-        for i, node in enumerate(self.edge_nodes):
-            # Create a portion of the task for each node
-            subtask = task.copy()
-            subtask['node_id'] = node['id']
-            subtask['portion'] = f"{i+1}/{len(self.edge_nodes)}"
-            subtask['estimated_completion'] = time.time() + random.uniform(0.1, 0.5)
-            
-            results.append(subtask)
+        Partition a task over the workers and merge the results
+
+        The task carries a picklable 'function' applied to each partition of
+        'items', an optional 'merge', an absolute 'deadline' and the
+        'min_fraction' of partitions that must finish. Tasks with fewer items
+        than 'serial_below' (the distributor's limit by default) run in this
+        process, so tasks with few but expensive items should set it to 0.
+        """
+        outcome = self.distributor.run(
+            task['function'],
+            task['items'],
+            merge=task.get('merge'),
+            partitions=task.get('partitions'),
+            deadline=task.get('deadline'),
+            min_fraction=task.get('min_fraction', 1.0),
+            serial_below=task.get('serial_below')
+        )
         
-        return results
+        self.distributed_tasks.append({
+            'type': task.get('type', 'generic'),
+            'timestamp': time.time(),
+            'partitions': outcome['partitions'],
+            'completed': outcome['completed'],
+            'cancelled': outcome['cancelled'],
+            'distributed': outcome['distributed'],
+            'duration': outcome['duration']
+        })
+        return outcome
+    
+    def shutdown(self):
+        """
+        Stop the worker processes
+        """
+        self.distributor.shutdown()
+        self.edge_nodes = []
 
 
 class AdvancedFeaturesManager:
     """
     Main manager class to coordinate all advanced features
     """
-    def __init__(self):
+    def __init__(self, ledger_path: Optional[str] = None):
         self.quantum_optimizer = QuantumInspiredOptimizer()
         self.neural_predictor = NeuralPerformancePredictor()
-        self.blockchain_logger = BlockchainPerformanceLogger()
+        # Defaults to ZIO_LEDGER or the per-user data directory, never the working directory
+        self.blockchain_logger = BlockchainPerformanceLogger(ledger_path)
         self.biometric_optimizer = BiometricEnhancedOptimizer()
         self.edge_optimizer = EdgeComputingOptimizer()
         
         self.is_running = False
-        self.optimization_thread = None
+        self.scheduler = get_shared_scheduler()
+        self.temp_monitor = TemperatureMonitor()
+        self.last_quantum_configuration = None
+        self.last_configuration_model = None
         
         # Performance metrics
         self.metrics = {
@@ -456,8 +571,13 @@ class AdvancedFeaturesManager:
             return
         
         self.is_running = True
-        self.optimization_thread = threading.Thread(target=self._advanced_optimization_loop, daemon=True)
-        self.optimization_thread.start()
+        self.scheduler.add_job(
+            'advanced_features',
+            self._advanced_optimization_tick,
+            base_interval=10,  # 10 seconds between cycles at moderate load
+            min_interval=2,
+            max_interval=300
+        )
         print("Advanced optimization system started")
     
     def stop_advanced_optimization(self):
@@ -465,58 +585,53 @@ class AdvancedFeaturesManager:
         Stop the advanced optimization system
         """
         self.is_running = False
-        if self.optimization_thread:
-            self.optimization_thread.join(timeout=2)
+        self.scheduler.remove_job('advanced_features')
+        self.blockchain_logger.flush()
+        self.edge_optimizer.shutdown()
         print("Advanced optimization system stopped")
     
-    def _advanced_optimization_loop(self):
+    def _advanced_optimization_tick(self):
         """
-        Main loop for advanced optimization features
+        Run one cycle of the advanced features and report the system pressure
         """
-        while self.is_running:
-            try:
-                # Run all advanced optimization features
-                self._run_quantum_inspired_optimization()
-                self._run_neural_prediction()
-                self._update_biometric_optimization()
-                self._run_edge_computing_optimization()
-                
-                # Log performance to blockchain
-                performance_data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'cpu_usage': psutil.cpu_percent(),
-                    'memory_usage': psutil.virtual_memory().percent,
-                    'optimization_cycle': True
-                }
-                self.blockchain_logger.add_performance_log(performance_data)
-                
-                # Wait before next cycle
-                time.sleep(10)  # 10 seconds between advanced optimization cycles
-                
-            except Exception as e:
-                print(f"Error in advanced optimization loop: {e}")
-                time.sleep(5)  # Wait before retrying
+        # Run all advanced optimization features
+        self._run_quantum_inspired_optimization()
+        self._run_neural_prediction()
+        self._update_biometric_optimization()
+        self._run_edge_computing_optimization()
+        
+        # Log performance to blockchain
+        performance_data = {
+            'timestamp': datetime.now().isoformat(),
+            'cpu_usage': psutil.cpu_percent(),
+            'memory_usage': psutil.virtual_memory().percent,
+            'optimization_cycle': True
+        }
+        self.blockchain_logger.add_performance_log(performance_data)
+        
+        # The scheduler shortens the interval under load and backs off when idle
+        return compute_pressure(
+            cpu_percent=performance_data['cpu_usage'],
+            memory_percent=performance_data['memory_usage'],
+            temperature=self.temp_monitor.get_cpu_temperature()
+        )
     
     def _run_quantum_inspired_optimization(self):
         """
         Run quantum-inspired optimization
         """
-        def objective_function(x):
-            # Simulated objective function based on system metrics
-            cpu_load = psutil.cpu_percent()
-            memory_load = psutil.virtual_memory().percent
-            return cpu_load * 0.6 + memory_load * 0.4  # Combined load metric
-        
-        # Define bounds for optimization
-        bounds = [0.0, 1.0]  # Normalized bounds
+        # One snapshot of the system feeds every candidate evaluation
+        model = SystemConfigurationModel.from_system()
+        self.last_configuration_model = model
         
-        # Run quantum-inspired optimization
         best_solution, best_score = self.quantum_optimizer.quantum_annealing_simulation(
-            objective_function, bounds, iterations=50
+            model, iterations=50
         )
         
-        # Record improvement
-        self.metrics['quantum_improvement'] = max(self.metrics['quantum_improvement'], best_score)
+        # Record improvement over leaving the system untouched
+        baseline_score = float(model.evaluate(model.default_configuration())[0])
+        self.metrics['quantum_improvement'] = max(0.0, baseline_score - best_score)
+        self.last_quantum_configuration = model.describe(best_solution)
     
     def _run_neural_prediction(self):
         """
@@ -561,22 +676,37 @@ class AdvancedFeaturesManager:
         """
         Run edge computing optimization
         """
-        # Discover available edge nodes
+        # Discover available worker processes
         nodes = self.edge_optimizer.discover_edge_nodes()
         
-        if nodes:
-            # Create a distributed optimization task
+        if nodes and self.last_configuration_model is not None:
+            # Search more of the configuration space with independent annealing runs
+            model = self.last_configuration_model
             task = {
-                'type': 'system_optimization',
-                'priority': 'high',
-                'data_size': 'medium',
-                'deadline': time.time() + 30  # 30 seconds deadline
+                'type': 'annealing_restarts',
+                'function': partial(_anneal_seeds, model=model, iterations=50),
+                'items': [random.getrandbits(32) for _ in range(len(nodes) * 2)],
+                'merge': _best_annealing_result,
+                'deadline': time.time() + 5,  # Give up on stragglers after 5 seconds
+                'min_fraction': 0.75,
+                # A handful of items, each a full annealing run: worth shipping however few
+                'serial_below': 0
             }
             
-            # Distribute the task
-            results = self.edge_optimizer.distribute_optimization_task(task)
+            outcome = self.edge_optimizer.distribute_optimization_task(task)
+            if outcome['result'] is not None:
+                solution, score = outcome['result']
+                baseline_score = float(model.evaluate(model.default_configuration())[0])
+                improvement = max(0.0, baseline_score - score)
+                if improvement > self.metrics['quantum_improvement']:
+                    self.metrics['quantum_improvement'] = improvement
+                    self.last_quantum_configuration = model.describe(solution)
             
-            print(f"Distributed optimization to {len(results)} nodes/locations")
+            if outcome['distributed']:
+                print(f"Distributed optimization to {len(nodes)} workers: {outcome['completed']}/"
+                      f"{outcome['partitions']} partitions, {outcome['cancelled']} stragglers cancelled")
+            else:
+                print(f"Ran optimization in-process: {outcome['completed']}/{outcome['partitions']} partitions")
             self.metrics['edge_computing_tasks'] += 1
     
     def get_advanced_metrics(self) -> Dict:
@@ -591,7 +721,21 @@ class AdvancedFeaturesManager:
             'blockchain_integrity_verified': blockchain_integrity,
             'biometric_adaptations_count': self.metrics['biometric_adaptations'],
             'edge_computing_tasks_completed': self.metrics['edge_computing_tasks'],
-            'total_optimization_cycles': len(self.blockchain_logger.chain) - 1  # Exclude genesis block
+            'total_optimization_cycles': self.blockchain_logger.entry_count - 1  # Exclude genesis block
+        }
+    
+    def get_memory_report(self) -> Dict:
+        """
+        Report the size of every history kept by the advanced features
+        """
+        return {
+            'quantum_optimizer': memory_report(
+                superposition_states=self.quantum_optimizer.superposition_states,
+                optimization_history=self.quantum_optimizer.optimization_history
+            ),
+            'biometric_optimizer': memory_report(
+                biometric_data=self.biometric_optimizer.biometric_data
+            )
         }
     
     def run_single_advanced_optimization_cycle(self) -> Dict:
@@ -649,6 +793,6 @@ if __name__ == "__main__":
     # Verify blockchain integrity
     blockchain_valid = advanced_manager.blockchain_logger.verify_chain()
     print(f"Blockchain integrity verified: {blockchain_valid}")
-    print(f"Total blockchain entries: {len(advanced_manager.blockchain_logger.chain)}")
+    print(f"Total blockchain entries: {advanced_manager.blockchain_logger.entry_count}")
     
     print("\nAdvanced features testing completed successfully!")
\ No newline at end of file
@@ -10,16 +10,29 @@ from sklearn.preprocessing import StandardScaler
 import pickle
 import os
 from datetime import datetime
-import threading
 import json
 
+from .bounded_history import BoundedHistory, NumericHistory, memory_report
+from .adaptive_scheduler import compute_pressure, get_shared_scheduler
+from .metrics_exporter import get_metrics_registry
+from .optimization_policy import DEFAULT_THRESHOLDS, recommend
+from .process_classifier import get_process_classifier
+from .tracing import traced
+
+MODEL_UPDATE_SECONDS = get_metrics_registry().histogram(
+    'zio_ai_model_update_seconds', 'Duration of AI model training runs')
+CACHE_DROPS = get_metrics_registry().counter(
+    'zio_cache_drops', 'Attempts to drop the kernel page cache', ['result'])
+PROCESSES_TERMINATED = get_metrics_registry().counter(
+    'zio_processes_terminated', 'Processes terminated by the optimizer', ['reason'])
+
 
 class AIOptimizer:
     """
     AI-powered optimizer that learns system patterns and optimizes accordingly
     """
     
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, thresholds=None):
         self.model_path = model_path or "./ai_model.pkl"
         self.scaler_path = "./ai_scaler.pkl"
         self.data_path = "./ai_training_data.json"
@@ -30,13 +43,17 @@ class AIOptimizer:
         self.is_trained = False
         self.training_data = []
         
+        # Recommendation thresholds; see optimization_policy.DEFAULT_THRESHOLDS
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        
         # Load existing model if available
         self.load_model()
         
-        # Performance metrics
-        self.optimization_history = []
-        self.system_metrics_history = []
+        # Performance metrics, kept for at most a day
+        self.optimization_history = BoundedHistory(capacity=500, ttl=86400, name='optimization_history')
+        self.system_metrics_history = NumericHistory(width=9, capacity=1000, ttl=86400, name='system_metrics_history')
         
+    @traced(category="ai")
     def collect_system_features(self):
         """
         Collect system metrics to create feature vector for ML model
@@ -61,6 +78,7 @@ class AIOptimizer:
         
         return features
     
+    @traced(category="ai")
     def train_model(self, training_data=None):
         """
         Train the ML model with system data
@@ -72,21 +90,23 @@ class AIOptimizer:
             # Not enough data to train, return early
             return False
             
-        # Convert to numpy array
-        X = np.array(training_data)
-        
-        # Scale the features
-        X_scaled = self.scaler.fit_transform(X)
-        
-        # Train the isolation forest model
-        self.model.fit(X_scaled)
-        self.is_trained = True
-        
-        # Save the trained model
-        self.save_model()
+        with MODEL_UPDATE_SECONDS.time():
+            # Convert to numpy array
+            X = np.array(training_data)
+            
+            # Scale the features
+            X_scaled = self.scaler.fit_transform(X)
+            
+            # Train the isolation forest model
+            self.model.fit(X_scaled)
+            self.is_trained = True
+            
+            # Save the trained model
+            self.save_model()
         
         return True
     
+    @traced(category="ai")
     def predict_anomaly(self, features):
         """
         Predict if current system state is anomalous (needs optimization)
@@ -108,76 +128,9 @@ class AIOptimizer:
         """
         Get specific optimization recommendations based on current system state
         """
-        recommendations = []
-        
-        cpu_usage, memory_usage, disk_usage, net_sent, net_recv, proc_count, avail_mem, free_disk, time_of_day = features
-        
-        # CPU-based recommendations
-        if cpu_usage > 80:
-            recommendations.append({
-                'type': 'cpu',
-                'action': 'reduce_process_priority',
-                'severity': 'high',
-                'reason': f'High CPU usage detected: {cpu_usage:.1f}%'
-            })
-        elif cpu_usage > 60:
-            recommendations.append({
-                'type': 'cpu',
-                'action': 'monitor_process_usage',
-                'severity': 'medium',
-                'reason': f'Moderate CPU usage detected: {cpu_usage:.1f}%'
-            })
-        
-        # Memory-based recommendations
-        if memory_usage > 85:
-            recommendations.append({
-                'type': 'memory',
-                'action': 'clear_cache_and_swap',
-                'severity': 'high',
-                'reason': f'High memory usage detected: {memory_usage:.1f}%'
-            })
-        elif memory_usage > 70:
-            recommendations.append({
-                'type': 'memory',
-                'action': 'monitor_memory_usage',
-                'severity': 'medium',
-                'reason': f'Moderate memory usage detected: {memory_usage:.1f}%'
-            })
-        
-        # Disk-based recommendations
-        if disk_usage > 90:
-            recommendations.append({
-                'type': 'disk',
-                'action': 'clean_temp_files',
-                'severity': 'high',
-                'reason': f'Critical disk usage detected: {disk_usage:.1f}%'
-            })
-        elif disk_usage > 75:
-            recommendations.append({
-                'type': 'disk',
-                'action': 'monitor_disk_usage',
-                'severity': 'medium',
-                'reason': f'High disk usage detected: {disk_usage:.1f}%'
-            })
-        
-        # Process count recommendations
-        if proc_count > 200:
-            recommendations.append({
-                'type': 'process',
-                'action': 'identify_unnecessary_processes',
-                'severity': 'high',
-                'reason': f'High number of processes detected: {proc_count}'
-            })
-        elif proc_count > 100:
-            recommendations.append({
-                'type': 'process',
-                'action': 'monitor_process_list',
-                'severity': 'medium',
-                'reason': f'Moderate number of processes detected: {proc_count}'
-            })
-        
-        return recommendations
+        return recommend(features, self.thresholds)
     
+    @traced(category="ai")
     def optimize_system(self):
         """
         Perform AI-driven system optimization based on recommendations
@@ -223,6 +176,7 @@ class AIOptimizer:
         }
         
         self.optimization_history.append(optimization_record)
+        self.system_metrics_history.append(features)
         
         # Add to training data for future learning
         self.training_data.append(features)
@@ -230,7 +184,7 @@ class AIOptimizer:
             self.training_data = self.training_data[-500:]
         
         # Retrain model periodically
-        if len(self.optimization_history) % 10 == 0:
+        if self.optimization_history.total_appended % 10 == 0:
             self.train_model()
         
         return {
@@ -240,6 +194,7 @@ class AIOptimizer:
             'optimization_record': optimization_record
         }
     
+    @traced(category="ai")
     def _reduce_cpu_intensive_processes(self):
         """
         Reduce priority of CPU-intensive processes
@@ -281,6 +236,7 @@ class AIOptimizer:
                 'success': False
             }
     
+    @traced(category="ai")
     def _clear_memory_caches(self):
         """
         Clear system memory caches
@@ -293,9 +249,10 @@ class AIOptimizer:
                 try:
                     with open("/proc/sys/vm/drop_caches", "w") as f:
                         f.write("3\n")  # Drop pagecache, dentries and inodes
+                    CACHE_DROPS.inc(result='dropped')
                 except:
                     # If we can't write to drop_caches, just continue
-                    pass
+                    CACHE_DROPS.inc(result='failed')
             
             return {
                 'action': 'clear_cache_and_swap',
@@ -309,6 +266,7 @@ class AIOptimizer:
                 'success': False
             }
     
+    @traced(category="ai")
     def _clean_temp_files(self):
         """
         Clean temporary files
@@ -345,28 +303,25 @@ class AIOptimizer:
                 'success': False
             }
     
+    @traced(category="ai")
     def _identify_and_terminate_unnecessary_processes(self):
         """
         Identify and terminate unnecessary processes
         """
         try:
             terminated_count = 0
-            unnecessary_process_names = [
-                'dropbox', 'onedrive', 'google', 'spotify', 'vlc', 'steamwebhelper',
-                'code helper', 'teams', 'slack', 'skype', 'browser', 'chrome', 'firefox'
-            ]
             
+            classifier = get_process_classifier()
             for proc in psutil.process_iter(['pid', 'name']):
                 try:
-                    proc_name = proc.info['name'].lower()
-                    if any(name in proc_name for name in unnecessary_process_names):
-                        # Don't terminate critical system processes
-                        if not any(critical in proc_name for critical in ['system', 'kernel', 'init', 'kthreadd']):
-                            proc.terminate()
-                            terminated_count += 1
+                    # Protected processes, and those a profile protects, are never expendable
+                    if classifier.is_expendable(proc):
+                        proc.terminate()
+                        terminated_count += 1
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
             
+            PROCESSES_TERMINATED.inc(terminated_count, reason='ai_unnecessary')
             return {
                 'action': 'identify_unnecessary_processes',
                 'result': f'Terminated {terminated_count} unnecessary processes',
@@ -437,60 +392,71 @@ class AIOptimizer:
         avg_duration = total_duration / len(self.optimization_history)
         
         return {
-            'total_optimizations': len(self.optimization_history),
+            'total_optimizations': self.optimization_history.total_appended,
             'average_duration': avg_duration,
             'last_optimization': self.optimization_history[-1] if self.optimization_history else None,
             'data_points_collected': len(self.training_data)
         }
+    
+    def get_memory_report(self):
+        """
+        Report the size of the optimizer's histories
+        """
+        return memory_report(
+            optimization_history=self.optimization_history,
+            system_metrics_history=self.system_metrics_history
+        )
 
 
 class AIOptimizerManager:
     """
-    Manager class to handle AI optimization in a separate thread
+    Manager class to run AI optimization on the shared adaptive scheduler
     """
     
     def __init__(self):
         self.ai_optimizer = AIOptimizer()
         self.is_running = False
-        self.optimization_thread = None
-        self.check_interval = 30  # seconds
+        self.scheduler = get_shared_scheduler()
+        self.check_interval = 30  # seconds, adapted between min and max
+        self.min_check_interval = 5
+        self.max_check_interval = 600
     
     def start_optimization_loop(self):
         """
-        Start the AI optimization loop in a separate thread
+        Start scheduling AI optimization cycles
         """
         if self.is_running:
             return
         
         self.is_running = True
-        self.optimization_thread = threading.Thread(target=self._optimization_loop, daemon=True)
-        self.optimization_thread.start()
+        self.scheduler.add_job(
+            'ai_optimizer',
+            self._optimization_tick,
+            base_interval=self.check_interval,
+            min_interval=self.min_check_interval,
+            max_interval=self.max_check_interval
+        )
     
     def stop_optimization_loop(self):
         """
-        Stop the AI optimization loop
+        Stop scheduling AI optimization cycles
         """
         self.is_running = False
-        if self.optimization_thread:
-            self.optimization_thread.join(timeout=2)
+        self.scheduler.remove_job('ai_optimizer')
     
-    def _optimization_loop(self):
+    def _optimization_tick(self):
         """
-        Main optimization loop that runs in a separate thread
+        Run one optimization cycle and report how busy the system is
         """
-        while self.is_running:
-            try:
-                result = self.ai_optimizer.optimize_system()
-                print(f"AI Optimization completed: {result['applied_optimizations_count']} optimizations applied")
-                
-                # Wait for the specified interval
-                for _ in range(self.check_interval):
-                    if not self.is_running:
-                        break
-                    time.sleep(1)
-            except Exception as e:
-                print(f"Error in AI optimization loop: {e}")
-                time.sleep(5)  # Wait a bit before trying again
+        result = self.ai_optimizer.optimize_system()
+        print(f"AI Optimization completed: {len(result['applied_optimizations'])} optimizations applied")
+        
+        cpu_usage, memory_usage = result['optimization_record']['features'][:2]
+        return compute_pressure(
+            cpu_percent=cpu_usage,
+            memory_percent=memory_usage,
+            anomaly_score=1.0 if result['anomaly_detected'] else 0.0
+        )
     
     def run_single_optimization(self):
         """
@@ -503,6 +469,12 @@ class AIOptimizerManager:
         Get performance metrics from the AI optimizer
         """
         return self.ai_optimizer.get_performance_metrics()
+    
+    def get_memory_report(self):
+        """
+        Get the memory report of the AI optimizer
+        """
+        return self.ai_optimizer.get_memory_report()
 
 
 # Example usage and testing
@@ -0,0 +1,436 @@
+"""
+Headless service mode for Zio-Booster FPS Booster
+Runs the optimizer, metrics sampler and AI loop without a display and serves a local control socket
+"""
+import json
+import os
+import signal
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .metrics_sampler import MetricsSampler, read_system_metrics
+from .adaptive_scheduler import compute_pressure, get_shared_scheduler
+from .metrics_stream import MetricsStreamServer
+from .metrics_exporter import MetricsExporter
+from . import tracing
+
+
+def default_socket_path() -> str:
+    """Per-user socket location, preferring XDG_RUNTIME_DIR"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, 'getuid') else os.getpid()
+    name = 'zio-booster.sock' if os.environ.get('XDG_RUNTIME_DIR') else f'zio-booster-{user}.sock'
+    return os.path.join(runtime_dir, name)
+
+
+def encode_message(message: Dict) -> bytes:
+    """Serialize one protocol message as a JSON line"""
+    return (json.dumps(message, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    """
+    Serves one client connection.
+
+    Requests are JSON lines of the form {"id": 1, "cmd": "status", "args": {}};
+    each gets one {"id": 1, "ok": true, "result": ...} or {"id": 1, "ok": false,
+    "error": "..."} line back. The "subscribe" command switches the connection
+    to a stream of {"event": "metrics", ...} lines until the client disconnects.
+    """
+
+    def handle(self):
+        service = self.server.service
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                request_id = request.get('id')
+                command = request['cmd']
+            except (ValueError, KeyError, AttributeError):
+                self.wfile.write(encode_message({'id': None, 'ok': False, 'error': 'malformed request'}))
+                continue
+
+            if command == 'subscribe':
+                self.wfile.write(encode_message({'id': request_id, 'ok': True, 'result': 'subscribed'}))
+                args = request.get('args') or {}
+                self._stream(service, float(args.get('interval', service.sampler.interval)))
+                return
+
+            try:
+                result = service.handle_command(command, request.get('args') or {})
+                response = {'id': request_id, 'ok': True, 'result': result}
+            except Exception as e:
+                response = {'id': request_id, 'ok': False, 'error': str(e)}
+            try:
+                self.wfile.write(encode_message(response))
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+    def _stream(self, service, interval: float):
+        """Push the latest metrics to a subscriber until it goes away"""
+        while service.is_serving:
+            try:
+                self.wfile.write(encode_message({'event': 'metrics', 'data': service.get_metrics()}))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                return
+            service.wait_for_sample(interval)
+
+
+class _ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class BoosterService:
+    """
+    Headless Zio-Booster: SystemOptimizer, the metrics sampler and the AI loop
+    in one process, controlled over a Unix domain socket.
+
+    The sampler thread keeps the latest metrics and process list; boosting
+    runs optimization cycles as a job on the shared adaptive scheduler.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, cycle_interval: float = 5.0,
+                 enable_ai: bool = True, optimizer_factory: Optional[Callable[[], Any]] = None,
+                 stream_port: Optional[int] = None, metrics_port: Optional[int] = None,
+                 stream_origin: Optional[str] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.cycle_interval = cycle_interval
+        self.enable_ai = enable_ai
+
+        if optimizer_factory is None:
+            from .optimizer import SystemOptimizer
+            optimizer_factory = SystemOptimizer
+        self.optimizer = optimizer_factory()
+
+        self.sampler = MetricsSampler(interval=2.0, process_reader=self.read_processes, process_interval=5.0)
+        self.scheduler = get_shared_scheduler()
+        # Optional SSE endpoint for browser dashboards; readable cross-origin only from stream_origin
+        self.stream = MetricsStreamServer(port=stream_port, allow_origin=stream_origin) if stream_port else None
+        # Optional Prometheus /metrics endpoint
+        self.exporter = MetricsExporter(port=metrics_port) if metrics_port else None
+        self.server = None
+        self.is_serving = False
+        self.is_boosting = False
+        self.started_at = None
+
+        self.lock = threading.Lock()
+        self.sample_ready = threading.Condition()
+        self.latest_metrics: Dict[str, Any] = {}
+        self.latest_processes: List[Dict] = []
+        self.last_cycle: Optional[Dict] = None
+        self.commands = {
+            'ping': lambda args: 'pong',
+            'status': lambda args: self.get_status(),
+            'metrics': lambda args: self.get_metrics(),
+            'processes': lambda args: self.get_processes(int(args.get('limit', 20))),
+            'start_boosting': lambda args: self.start_boosting(),
+            'stop_boosting': lambda args: self.stop_boosting(),
+            'optimize': lambda args: self.run_cycle(),
+            'enable_gaming_mode': lambda args: self.optimizer.enable_gaming_mode(),
+            'disable_gaming_mode': lambda args: self.optimizer.disable_gaming_mode(),
+            'apply_profile': lambda args: self.optimizer.apply_profile(args['name']),
+            'clear_profile': lambda args: self.optimizer.clear_profile() or True,
+            'release_throttled': lambda args: self.optimizer.release_throttled_processes(),
+            'memory_report': lambda args: self.optimizer.get_memory_report(),
+            'trace_start': lambda args: tracing.enable(int(args.get('capacity', 65536))) or tracing.is_enabled(),
+            'trace_stop': lambda args: tracing.disable() or tracing.is_enabled(),
+            'trace_dump': lambda args: tracing.dump_chrome_trace(args.get('path', 'zio_trace.json')),
+            'shutdown': lambda args: self.request_shutdown(),
+        }
+
+    def read_processes(self) -> List[Dict]:
+        """Top processes by temperature score; runs on the sampler thread"""
+        processes = self.optimizer.temp_monitor.get_process_temperatures()[:20]
+        return [
+            {
+                'name': proc.name,
+                'pid': proc.pid,
+                'cpu_percent': proc.cpu_percent,
+                'memory_percent': proc.memory_percent,
+                'temperature_score': proc.temperature_score
+            }
+            for proc in processes
+        ]
+
+    def _collect(self):
+        """Move sampler results into the latest-value slots"""
+        while self.is_serving:
+            latest = self.sampler.drain()
+            if latest:
+                with self.lock:
+                    if 'system' in latest:
+                        self.latest_metrics = dict(latest['system'], timestamp=time.time())
+                    if 'processes' in latest:
+                        self.latest_processes = latest['processes']
+                with self.sample_ready:
+                    self.sample_ready.notify_all()
+            time.sleep(0.25)
+
+    def wait_for_sample(self, timeout: float):
+        """Block until the next sample arrives or the timeout passes"""
+        with self.sample_ready:
+            self.sample_ready.wait(timeout)
+
+    def start(self):
+        """Start the sampler, the AI loop and the control socket"""
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError("Unix domain sockets are not available on this platform")
+
+        # A socket file left by a crashed service would block the bind
+        if os.path.exists(self.socket_path):
+            if ServiceClient.is_running(self.socket_path):
+                raise RuntimeError(f"A Zio-Booster service is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)
+
+        old_umask = os.umask(0o177)
+        try:
+            self.server = _ControlServer(self.socket_path, _ControlHandler)
+        finally:
+            os.umask(old_umask)
+        self.server.service = self
+
+        self.is_serving = True
+        self.started_at = time.time()
+        self.sampler.start()
+        threading.Thread(target=self._collect, daemon=True).start()
+        if self.enable_ai:
+            self.optimizer.start_ai_optimization()
+        self.optimizer.start_game_detection()
+        if self.stream:
+            self.stream.start()
+        if self.exporter:
+            self.exporter.start()
+        print(f"Zio-Booster service listening on {self.socket_path}")
+
+    def serve_forever(self):
+        """Serve control requests until shutdown is requested"""
+        try:
+            self.server.serve_forever(poll_interval=0.5)
+        finally:
+            self.stop()
+
+    def request_shutdown(self) -> str:
+        """Stop serving from another thread (or a client command)"""
+        self.is_serving = False
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return 'shutting down'
+
+    def stop(self):
+        """Stop every loop and remove the socket"""
+        self.is_serving = False
+        self.stop_boosting()
+        if self.enable_ai:
+            self.optimizer.stop_ai_optimization()
+        self.optimizer.stop_game_detection()
+        # Leave affinity, priorities and cgroups as they were before the service
+        self.optimizer.clear_profile()
+        self.optimizer.release_throttled_processes()
+        self.sampler.stop()
+        if self.stream:
+            self.stream.stop()
+        if self.exporter:
+            self.exporter.stop()
+        if self.server:
+            self.server.server_close()
+            self.server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def handle_command(self, command: str, args: Dict) -> Any:
+        """Run one protocol command and return its JSON-serializable result"""
+        handler = self.commands.get(command)
+        if handler is None:
+            raise ValueError(f"unknown command: {command}")
+        return handler(args)
+
+    def start_boosting(self) -> bool:
+        """Run optimization cycles on the shared scheduler"""
+        if not self.is_boosting:
+            self.is_boosting = True
+            self.sampler.sample_processes = True
+            self.scheduler.add_job(
+                'service_boost',
+                self._boost_tick,
+                base_interval=self.cycle_interval,
+                min_interval=self.cycle_interval,
+                max_interval=self.cycle_interval * 12
+            )
+        return self.is_boosting
+
+    def stop_boosting(self) -> bool:
+        """Stop running optimization cycles"""
+        if self.is_boosting:
+            self.is_boosting = False
+            self.sampler.sample_processes = False
+            self.scheduler.remove_job('service_boost')
+        return self.is_boosting
+
+    def _boost_tick(self) -> float:
+        """One scheduled optimization cycle"""
+        self.run_cycle()
+        metrics = self.get_metrics()
+        return compute_pressure(
+            cpu_percent=metrics.get('cpu_percent'),
+            memory_percent=metrics.get('memory_percent'),
+            temperature=metrics.get('cpu_temp')
+        )
+
+    def run_cycle(self) -> Dict:
+        """Run one optimization cycle now"""
+        result = self.optimizer.run_optimization_cycle()
+        with self.lock:
+            self.last_cycle = dict(result, timestamp=time.time())
+        self.sampler.request_processes()
+        return result
+
+    def get_metrics(self) -> Dict:
+        """Latest system metrics"""
+        with self.lock:
+            if self.latest_metrics:
+                return dict(self.latest_metrics)
+        # Nothing sampled yet
+        return dict(read_system_metrics(), timestamp=time.time())
+
+    def get_processes(self, limit: int = 20) -> List[Dict]:
+        """Latest process list"""
+        with self.lock:
+            return self.latest_processes[:limit]
+
+    def get_status(self) -> Dict:
+        """Service state, sampler health and the last optimization cycle"""
+        with self.lock:
+            last_cycle = self.last_cycle
+        return {
+            'pid': os.getpid(),
+            'uptime': time.time() - self.started_at if self.started_at else 0.0,
+            'boosting': self.is_boosting,
+            'ai_enabled': self.enable_ai,
+            'gaming_mode': getattr(self.optimizer.gaming_mode, 'active', None),
+            'active_profile': getattr(self.optimizer.active_profile, 'name', None),
+            'optimization_count': self.optimizer.optimization_count,
+            'last_cycle': last_cycle,
+            'sampler': {
+                'samples_taken': self.sampler.samples_taken,
+                'samples_dropped': self.sampler.samples_dropped,
+                'max_lag': self.sampler.max_lag
+            },
+            'scheduler': self.scheduler.get_stats()
+        }
+
+
+class ServiceClient:
+    """JSON-lines client for a running BoosterService"""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 30.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self.sock = None
+        self.reader = None
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self._connect()
+
+    def _connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+        self.reader = self.sock.makefile('rb')
+
+    @classmethod
+    def is_running(cls, socket_path: Optional[str] = None) -> bool:
+        """Whether a service answers on the socket"""
+        client = cls.connect_if_running(socket_path)
+        if client is None:
+            return False
+        client.close()
+        return True
+
+    @classmethod
+    def connect_if_running(cls, socket_path: Optional[str] = None) -> Optional['ServiceClient']:
+        """Connect to a running service, or return None"""
+        if not hasattr(socket, 'AF_UNIX'):
+            return None
+        try:
+            client = cls(socket_path, timeout=2.0)
+            client.call('ping')
+            client.timeout = 30.0
+            client.sock.settimeout(client.timeout)
+            return client
+        except (OSError, RuntimeError, ValueError):
+            return None
+
+    def call(self, command: str, **args) -> Any:
+        """Send a command and return its result; thread-safe"""
+        with self.lock:
+            if self.sock is None:
+                self._connect()
+            self.next_id += 1
+            request_id = self.next_id
+            try:
+                self.sock.sendall(encode_message({'id': request_id, 'cmd': command, 'args': args}))
+                while True:
+                    line = self.reader.readline()
+                    if not line:
+                        raise ConnectionError("Zio-Booster service closed the connection")
+                    response = json.loads(line)
+                    # Anything else is a late reply to an earlier call
+                    if response.get('id') == request_id:
+                        break
+            except (OSError, ValueError):
+                # A timed-out or broken connection is out of step; the next call reconnects
+                self._disconnect()
+                raise
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error', 'command failed'))
+        return response.get('result')
+
+    def _disconnect(self):
+        try:
+            if self.reader is not None:
+                self.reader.close()
+            if self.sock is not None:
+                self.sock.close()
+        except OSError:
+            pass
+        self.sock = None
+        self.reader = None
+
+    def close(self):
+        """Close the connection"""
+        self._disconnect()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def run_service(socket_path: Optional[str] = None, boost: bool = False, enable_ai: bool = True,
+                cycle_interval: float = 5.0, stream_port: Optional[int] = None,
+                metrics_port: Optional[int] = None, stream_origin: Optional[str] = None):
+    """Run the headless service in the foreground until SIGINT/SIGTERM"""
+    service = BoosterService(socket_path=socket_path, cycle_interval=cycle_interval, enable_ai=enable_ai,
+                             stream_port=stream_port, metrics_port=metrics_port, stream_origin=stream_origin)
+    service.start()
+    if boost:
+        service.start_boosting()
+
+    def handle_signal(signum, frame):
+        print("Stopping Zio-Booster service...")
+        service.request_shutdown()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    service.serve_forever()
+
+
+# Example usage
+if __name__ == "__main__":
+    run_service()
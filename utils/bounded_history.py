@@ -0,0 +1,204 @@
+"""
+Bounded history containers for Zio-Booster FPS Booster
+Keeps collector histories at a fixed capacity and drops entries past their time-to-live
+"""
+import sys
+import time
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class HistoryRecord:
+    """A timestamped history entry"""
+    __slots__ = ('timestamp', 'value')
+
+    def __init__(self, timestamp: float, value: Any):
+        self.timestamp = timestamp
+        self.value = value
+
+
+def _deep_sizeof(obj: Any, depth: int = 3) -> int:
+    """Approximate the memory held by an object and the containers inside it"""
+    size = sys.getsizeof(obj)
+    if depth <= 0:
+        return size
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, depth - 1) + _deep_sizeof(v, depth - 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, depth - 1) for item in obj)
+    elif hasattr(obj, '__slots__'):
+        size += sum(_deep_sizeof(getattr(obj, slot, None), depth - 1) for slot in obj.__slots__)
+    elif hasattr(obj, '__dict__'):
+        size += _deep_sizeof(vars(obj), depth - 1)
+    return size
+
+
+class BoundedHistory:
+    """
+    History of arbitrary values with a fixed capacity and optional time-to-live.
+
+    Behaves like a read-only sequence of the retained values, oldest first.
+    total_appended keeps counting after old entries are dropped.
+    """
+
+    def __init__(self, capacity: int = 1000, ttl: Optional[float] = None, name: str = ""):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.name = name
+        self.total_appended = 0
+        self._records = deque(maxlen=capacity)
+
+    def append(self, value: Any, timestamp: Optional[float] = None):
+        """Add a value, evicting the oldest entries past capacity or TTL"""
+        now = timestamp if timestamp is not None else time.time()
+        self._records.append(HistoryRecord(now, value))
+        self.total_appended += 1
+        if self.ttl is not None:
+            self.discard_older_than(now - self.ttl)
+
+    def discard_older_than(self, cutoff: float):
+        """Drop entries with a timestamp before the cutoff"""
+        records = self._records
+        while records and records[0].timestamp < cutoff:
+            records.popleft()
+
+    def prune(self, now: Optional[float] = None):
+        """Drop entries past the time-to-live"""
+        if self.ttl is not None:
+            self.discard_older_than((now if now is not None else time.time()) - self.ttl)
+
+    def since(self, cutoff: float) -> List[Any]:
+        """Values recorded at or after the cutoff, oldest first"""
+        values = []
+        for record in reversed(self._records):
+            if record.timestamp < cutoff:
+                break
+            values.append(record.value)
+        values.reverse()
+        return values
+
+    def items(self) -> List[Tuple[float, Any]]:
+        """(timestamp, value) pairs, oldest first"""
+        return [(record.timestamp, record.value) for record in self._records]
+
+    def clear(self):
+        """Remove every entry"""
+        self._records.clear()
+
+    def __iter__(self) -> Iterator[Any]:
+        return (record.value for record in self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._records[index].value
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Report how much the history holds and roughly how much memory it uses"""
+        approx_bytes = sys.getsizeof(self._records) + sum(_deep_sizeof(record) for record in self._records)
+        return {
+            'name': self.name,
+            'count': len(self._records),
+            'capacity': self.capacity,
+            'ttl': self.ttl,
+            'total_appended': self.total_appended,
+            'dropped': self.total_appended - len(self._records),
+            'approx_bytes': approx_bytes
+        }
+
+
+class NumericHistory:
+    """
+    Ring buffer of fixed-width float rows backed by preallocated arrays.
+
+    Memory is allocated once for the full capacity, so it does not change as
+    rows come and go.
+    """
+
+    def __init__(self, width: int, capacity: int = 1000, ttl: Optional[float] = None, name: str = ""):
+        self.width = width
+        self.capacity = capacity
+        self.ttl = ttl
+        self.name = name
+        self.total_appended = 0
+        self._timestamps = array('d', bytes(8 * capacity))
+        self._data = array('d', bytes(8 * capacity * width))
+        self._start = 0
+        self._count = 0
+
+    def append(self, row: Sequence[float], timestamp: Optional[float] = None):
+        """Add a row, overwriting the oldest one when full"""
+        if len(row) != self.width:
+            raise ValueError(f"row has {len(row)} values, expected {self.width}")
+        now = timestamp if timestamp is not None else time.time()
+        slot = (self._start + self._count) % self.capacity
+        if self._count == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._count += 1
+        self._timestamps[slot] = now
+        offset = slot * self.width
+        self._data[offset:offset + self.width] = array('d', row)
+        self.total_appended += 1
+        if self.ttl is not None:
+            self.discard_older_than(now - self.ttl)
+
+    def discard_older_than(self, cutoff: float):
+        """Drop rows with a timestamp before the cutoff"""
+        while self._count and self._timestamps[self._start] < cutoff:
+            self._start = (self._start + 1) % self.capacity
+            self._count -= 1
+
+    def prune(self, now: Optional[float] = None):
+        """Drop rows past the time-to-live"""
+        if self.ttl is not None:
+            self.discard_older_than((now if now is not None else time.time()) - self.ttl)
+
+    def _slot(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("history index out of range")
+        return (self._start + index) % self.capacity
+
+    def timestamp(self, index: int) -> float:
+        """Timestamp of the row at the given position"""
+        return self._timestamps[self._slot(index)]
+
+    def since(self, cutoff: float) -> List[Tuple[float, ...]]:
+        """Rows recorded at or after the cutoff, oldest first"""
+        return [self[i] for i in range(self._count) if self._timestamps[self._slot(i)] >= cutoff]
+
+    def clear(self):
+        """Remove every row"""
+        self._start = 0
+        self._count = 0
+
+    def __iter__(self) -> Iterator[Tuple[float, ...]]:
+        return (self[i] for i in range(self._count))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Tuple[float, ...]:
+        offset = self._slot(index) * self.width
+        return tuple(self._data[offset:offset + self.width])
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Report how much the history holds and how much memory it uses"""
+        return {
+            'name': self.name,
+            'count': self._count,
+            'capacity': self.capacity,
+            'ttl': self.ttl,
+            'total_appended': self.total_appended,
+            'dropped': self.total_appended - self._count,
+            'approx_bytes': sys.getsizeof(self._timestamps) + sys.getsizeof(self._data)
+        }
+
+
+def memory_report(**histories) -> Dict[str, Dict[str, Any]]:
+    """Collect the memory reports of several histories, keyed by attribute name"""
+    return {name: history.memory_report() for name, history in histories.items()}
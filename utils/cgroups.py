@@ -0,0 +1,180 @@
+"""
+cgroup v2 groups for Zio-Booster FPS Booster
+Creates child groups under one managed directory of the unified hierarchy,
+writes their interface files and moves processes in and out of them
+"""
+import errno
+import os
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_CGROUP_ROOT = "/sys/fs/cgroup"
+DEFAULT_BASE_GROUP = "zio-booster"
+CONTROLLERS = ('cpu', 'io', 'memory')
+
+
+class CgroupManager:
+    """
+    Child groups of <root>/<base>, e.g. /sys/fs/cgroup/zio-booster/game.
+
+    root can point at a plain temporary directory containing an empty
+    cgroup.controllers file: every read and write then goes to ordinary
+    files, so the groups a change creates can be checked without root.
+    """
+
+    def __init__(self, root: str = DEFAULT_CGROUP_ROOT, base: str = DEFAULT_BASE_GROUP,
+                 proc_root: str = "/proc"):
+        self.root = root
+        self.base = base
+        self.proc_root = proc_root
+
+    def available(self) -> bool:
+        """Whether root is the top of a cgroup v2 hierarchy"""
+        return os.path.isfile(os.path.join(self.root, 'cgroup.controllers'))
+
+    def writable(self) -> bool:
+        """Whether this process may create groups under the base group, e.g. False for most users"""
+        if not self.available():
+            return False
+        base = self.path()
+        directory = base if os.path.isdir(base) else self.root
+        if not os.access(directory, os.W_OK):
+            return False
+        # Controllers reach the groups through subtree_control; a stand-in tree has none
+        control = os.path.join(directory, 'cgroup.subtree_control')
+        return not os.path.exists(control) or os.access(control, os.W_OK)
+
+    def path(self, name: str = "") -> str:
+        """Directory of a managed group, or of the base group when name is empty"""
+        return os.path.join(self.root, self.base, name) if name else os.path.join(self.root, self.base)
+
+    def exists(self, name: str) -> bool:
+        return os.path.isdir(self.path(name))
+
+    def _enable_controllers(self, directory: str):
+        """Delegate the controllers to the children of a directory, where the kernel allows it"""
+        control = os.path.join(directory, 'cgroup.subtree_control')
+        try:
+            with open(os.path.join(directory, 'cgroup.controllers')) as f:
+                available = set(f.read().split())
+        except OSError:
+            available = set()
+        # A plain directory under test lists nothing, so every controller is requested
+        wanted = [c for c in CONTROLLERS if c in available or not available]
+        for controller in wanted:
+            try:
+                with open(control, 'a') as f:
+                    f.write(f"+{controller}\n")
+            except OSError:
+                pass
+
+    def create(self, name: str) -> bool:
+        """Create a managed group; returns True when it did not exist before"""
+        if self.exists(name):
+            return False
+        base = self.path()
+        if not os.path.isdir(base):
+            os.mkdir(base)
+            self._enable_controllers(self.root)
+            self._enable_controllers(base)
+        os.mkdir(self.path(name))
+        return True
+
+    def remove(self, name: str) -> bool:
+        """Remove a managed group once its processes have moved out; the base group goes with its last child"""
+        if not self._rmdir(self.path(name)):
+            return False
+        base = self.path()
+        if os.path.isdir(base) and not any(os.path.isdir(os.path.join(base, entry)) for entry in os.listdir(base)):
+            self._rmdir(base)
+        return True
+
+    def _rmdir(self, directory: str) -> bool:
+        try:
+            os.rmdir(directory)
+            return True
+        except OSError as e:
+            if e.errno == errno.ENOENT:
+                return True
+            # A stand-in group under test still holds its interface files; cgroupfs files cannot be unlinked
+            if e.errno == errno.ENOTEMPTY:
+                try:
+                    for entry in os.listdir(directory):
+                        os.unlink(os.path.join(directory, entry))
+                    os.rmdir(directory)
+                    return True
+                except OSError:
+                    pass
+            print(f"Could not remove cgroup {directory}: {e}")
+            return False
+
+    def read(self, name: str, filename: str) -> Optional[str]:
+        """Contents of a group's interface file, or None when it cannot be read"""
+        try:
+            with open(os.path.join(self.path(name), filename)) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def write(self, name: str, filename: str, value) -> bool:
+        """Write a group's interface file"""
+        try:
+            with open(os.path.join(self.path(name), filename), 'w') as f:
+                f.write(f"{value}\n")
+            return True
+        except OSError as e:
+            print(f"Could not write {filename} of cgroup {name}: {e}")
+            return False
+
+    def current_group(self, pid: int) -> Optional[str]:
+        """A process's cgroup v2 path relative to the root, e.g. /user.slice/session-2.scope"""
+        try:
+            with open(os.path.join(self.proc_root, str(pid), 'cgroup')) as f:
+                for line in f:
+                    if line.startswith('0::'):
+                        return line[3:].strip()
+        except OSError:
+            pass
+        return None
+
+    def move(self, name: str, pids: Iterable[int]) -> List[int]:
+        """Move processes into a managed group; returns the PIDs that moved"""
+        return self._write_procs(self.path(name), pids)
+
+    def move_back(self, origins: Dict[int, str]) -> List[int]:
+        """Return processes to the groups recorded by current_group()"""
+        by_group: Dict[str, List[int]] = {}
+        for pid, group in origins.items():
+            if group is not None:
+                by_group.setdefault(group, []).append(pid)
+        moved = []
+        for group, pids in by_group.items():
+            moved.extend(self._write_procs(os.path.join(self.root, group.lstrip('/')), pids))
+        return moved
+
+    def _write_procs(self, directory: str, pids: Iterable[int]) -> List[int]:
+        # The kernel takes one PID per write(), but one open file serves the whole batch
+        moved = []
+        try:
+            fd = os.open(os.path.join(directory, 'cgroup.procs'), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError as e:
+            print(f"Could not open {directory}/cgroup.procs: {e}")
+            return moved
+        try:
+            for pid in pids:
+                try:
+                    os.write(fd, f"{pid}\n".encode())
+                    moved.append(pid)
+                except OSError as e:
+                    # ESRCH: the process exited; anything else is logged and the batch continues
+                    if e.errno != errno.ESRCH:
+                        print(f"Could not move PID {pid} to {directory}: {e}")
+        finally:
+            os.close(fd)
+        return moved
+
+
+# Example usage
+if __name__ == "__main__":
+    cgroups = CgroupManager()
+    print(f"cgroup v2 at {cgroups.root}: {cgroups.available()}")
+    print(f"This process is in {cgroups.current_group(os.getpid())}")
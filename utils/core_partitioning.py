@@ -0,0 +1,169 @@
+"""
+CPU core partitioning for Zio-Booster FPS Booster
+Pins the game's threads to a cache-coherent set of cores and every other
+process to the remaining cores
+"""
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+from .cpu_topology import CpuTopology, format_cpu_list, plan_partition, read_cpu_topology
+
+# Kernel threads carry this flag in /proc/<pid>/stat; their affinity is left alone
+PF_KTHREAD = 0x00200000
+
+
+class CorePartitioner:
+    """
+    Keeps game threads and background threads on separate cores.
+
+    Affinity is set per thread (sched_setaffinity on a PID only changes
+    its main thread), and each thread's original mask is kept so
+    restore() can put it back. New threads and processes inherit the mask
+    of the thread that created them, so once the partition is in place
+    only a change in the game's thread count needs another pass; restore()
+    widens those inherited masks again, since no original was recorded.
+    """
+
+    def __init__(self, topology: Optional[CpuTopology] = None, sys_root: str = "/sys",
+                 proc_root: str = "/proc", background_share: float = 0.25):
+        self.sys_root = sys_root
+        self.proc_root = proc_root
+        self.topology = topology
+        self.background_share = background_share
+        self.game_pids: Set[int] = set()
+        self.game_cpus: List[int] = []
+        self.background_cpus: List[int] = []
+        self.thread_count = 0
+        self.original_affinity: Dict[int, Set[int]] = {}
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.game_pids)
+
+    def _tasks(self, pid: int) -> List[int]:
+        try:
+            return [int(tid) for tid in os.listdir(os.path.join(self.proc_root, str(pid), 'task'))]
+        except (OSError, ValueError):
+            return []
+
+    def _is_kernel_thread(self, pid: int) -> bool:
+        try:
+            with open(os.path.join(self.proc_root, str(pid), 'stat')) as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            return int(fields[6]) & PF_KTHREAD != 0
+        except (OSError, IndexError, ValueError):
+            return True
+
+    def _game_thread_count(self) -> int:
+        return sum(len(self._tasks(pid)) for pid in self.game_pids)
+
+    def apply(self, game_pids: Iterable[int]) -> bool:
+        """Partition the cores for these game processes"""
+        self.game_pids = set(game_pids)
+        if not self.game_pids:
+            self.restore()
+            return False
+        if self.topology is None:
+            self.topology = read_cpu_topology(self.sys_root)
+        return self._repartition(force=True)
+
+    def update(self) -> bool:
+        """Recompute the partition when game processes exit or the game's thread count changes"""
+        if not self.game_pids:
+            return False
+        self.game_pids = {pid for pid in self.game_pids if os.path.exists(os.path.join(self.proc_root, str(pid)))}
+        if not self.game_pids:
+            self.restore()
+            return False
+        return self._repartition(force=False)
+
+    def _repartition(self, force: bool) -> bool:
+        threads = self._game_thread_count()
+        if threads == self.thread_count and not force:
+            return False
+        self.thread_count = threads
+        game_cpus, background_cpus = plan_partition(self.topology, threads, self.background_share)
+        if game_cpus == background_cpus:
+            # A single core cannot be partitioned
+            return False
+        if not force and (game_cpus, background_cpus) == (self.game_cpus, self.background_cpus):
+            return False
+        self.game_cpus, self.background_cpus = game_cpus, background_cpus
+        pinned = self._pin_all()
+        print(f"Partitioned cores: game on {format_cpu_list(game_cpus)} ({threads} threads), "
+              f"background on {format_cpu_list(background_cpus)} ({pinned} threads pinned)")
+        return True
+
+    def _pin_all(self) -> int:
+        game, background = set(self.game_cpus), set(self.background_cpus)
+        pinned = 0
+        for entry in os.listdir(self.proc_root):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            if pid == os.getpid() and pid not in self.game_pids:
+                # The booster itself stays where it is
+                continue
+            if pid not in self.game_pids and self._is_kernel_thread(pid):
+                continue
+            cpus = game if pid in self.game_pids else background
+            for tid in self._tasks(pid):
+                if self._set_affinity(tid, cpus):
+                    pinned += 1
+        return pinned
+
+    def _set_affinity(self, tid: int, cpus: Set[int]) -> bool:
+        try:
+            original = os.sched_getaffinity(tid)
+            self.original_affinity.setdefault(tid, original)
+            if original != cpus:
+                os.sched_setaffinity(tid, cpus)
+            return True
+        except OSError:
+            # Exited, not permitted, or bound to a CPU by the kernel
+            return False
+
+    def _widen_inherited(self) -> int:
+        """Give threads started during the partition, still on exactly the background cores, every core"""
+        background = set(self.background_cpus)
+        if not background:
+            return 0
+        every_cpu = background | set(self.game_cpus)
+        widened = 0
+        for entry in os.listdir(self.proc_root):
+            if not entry.isdigit() or self._is_kernel_thread(int(entry)):
+                continue
+            for tid in self._tasks(int(entry)):
+                if tid in self.original_affinity:
+                    continue
+                try:
+                    if os.sched_getaffinity(tid) == background:
+                        os.sched_setaffinity(tid, every_cpu)
+                        widened += 1
+                except OSError:
+                    continue
+        return widened
+
+    def restore(self):
+        """Give every pinned thread its original affinity back"""
+        for tid, cpus in self.original_affinity.items():
+            try:
+                os.sched_setaffinity(tid, cpus)
+            except OSError:
+                continue
+        widened = self._widen_inherited()
+        if self.original_affinity or widened:
+            print(f"Restored CPU affinity of {len(self.original_affinity)} threads "
+                  f"and {widened} started during the partition")
+        self.original_affinity.clear()
+        self.game_pids.clear()
+        self.game_cpus, self.background_cpus = [], []
+        self.thread_count = 0
+
+
+# Example usage
+if __name__ == "__main__":
+    topology = read_cpu_topology()
+    print(f"{len(topology.cores)} cores in {len(topology.llc_groups())} LLC groups")
+    game, background = plan_partition(topology, game_threads=8)
+    print(f"An eight-thread game would run on {format_cpu_list(game)}, everything else on {format_cpu_list(background)}")
@@ -3,13 +3,15 @@ from ctypes import c_void_p, c_double, c_int, POINTER
 import os
 import platform
 
+from .tracing import traced
+
 class CppPerformanceOptimizer:
     """
     Python wrapper for the C++ PerformanceOptimizer class using ctypes.
     Provides fast system optimization functions for the FPS booster application.
     """
     
-    def __init__(self):
+    def __init__(self, proc_root: str = "/proc", sys_root: str = "/sys"):
         # Load the compiled C++ library
         if platform.system() == "Linux":
             lib_path = "./libcpp_performance.so"
@@ -28,6 +30,8 @@ class CppPerformanceOptimizer:
         
         # Create an instance of the C++ PerformanceOptimizer
         self.optimizer_ptr = self.lib.create_optimizer()
+        if (proc_root, sys_root) != ("/proc", "/sys"):
+            self.set_fs_roots(proc_root, sys_root)
     
     def _setup_function_signatures(self):
         """Define the argument and return types for the C functions."""
@@ -39,6 +43,11 @@ class CppPerformanceOptimizer:
         self.lib.destroy_optimizer.argtypes = [c_void_p]
         self.lib.destroy_optimizer.restype = None
         
+        # set_fs_roots (missing from libraries built before it was added)
+        if hasattr(self.lib, 'set_fs_roots'):
+            self.lib.set_fs_roots.argtypes = [c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+            self.lib.set_fs_roots.restype = None
+        
         # get_system_memory_usage
         self.lib.get_system_memory_usage.argtypes = [c_void_p]
         self.lib.get_system_memory_usage.restype = c_double
@@ -79,42 +88,59 @@ class CppPerformanceOptimizer:
         self.lib.get_system_uptime.argtypes = [c_void_p]
         self.lib.get_system_uptime.restype = c_double
     
+    def set_fs_roots(self, proc_root: str, sys_root: str):
+        """Read /proc and /sys from another tree, e.g. a synthetic fixture."""
+        if not hasattr(self.lib, 'set_fs_roots'):
+            print("C++ library does not support set_fs_roots; rebuild it to read another /proc and /sys tree")
+            return
+        self.lib.set_fs_roots(self.optimizer_ptr, proc_root.encode(), sys_root.encode())
+    
+    @traced(category="cpp")
     def get_system_memory_usage(self):
         """Get system memory usage in MB."""
         return self.lib.get_system_memory_usage(self.optimizer_ptr)
     
+    @traced(category="cpp")
     def get_system_load(self):
         """Get system load average."""
         return self.lib.get_system_load(self.optimizer_ptr)
     
+    @traced(category="cpp")
     def get_cpu_temperature(self):
         """Get CPU temperature in Celsius."""
         return self.lib.get_cpu_temperature(self.optimizer_ptr)
     
+    @traced(category="cpp")
     def optimize_for_gaming(self):
         """Optimize system settings for gaming performance."""
         self.lib.optimize_for_gaming(self.optimizer_ptr)
     
+    @traced(category="cpp")
     def restore_normal_settings(self):
         """Restore normal system settings."""
         self.lib.restore_normal_settings(self.optimizer_ptr)
     
+    @traced(category="cpp")
     def clear_system_caches(self):
         """Clear system caches to free up memory."""
         self.lib.clear_system_caches(self.optimizer_ptr)
     
+    @traced(category="cpp")
     def get_available_memory(self):
         """Get available memory in MB."""
         return self.lib.get_available_memory(self.optimizer_ptr)
     
+    @traced(category="cpp")
     def get_total_memory(self):
         """Get total memory in MB."""
         return self.lib.get_total_memory(self.optimizer_ptr)
     
+    @traced(category="cpp")
     def get_cpu_usage(self):
         """Get current CPU usage percentage."""
         return self.lib.get_cpu_usage(self.optimizer_ptr)
     
+    @traced(category="cpp")
     def get_system_uptime(self):
         """Get system uptime in seconds."""
         return self.lib.get_system_uptime(self.optimizer_ptr)
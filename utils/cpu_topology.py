@@ -0,0 +1,178 @@
+"""
+CPU topology for Zio-Booster FPS Booster
+Reads SMT siblings, last-level cache groups and performance/efficiency
+core types from sysfs
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+def parse_cpu_list(text: str) -> List[int]:
+    """CPU numbers from a sysfs list such as "0-3,8,10-11" """
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-')
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def format_cpu_list(cpus) -> str:
+    """The sysfs list form of a set of CPUs"""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+@dataclass
+class CpuCore:
+    """One physical core: its SMT sibling CPUs, last-level cache and type"""
+    cpus: Tuple[int, ...]
+    llc: int
+    performance: bool = True
+
+
+@dataclass
+class CpuTopology:
+    """Physical cores grouped by the last-level cache they share"""
+    cores: List[CpuCore] = field(default_factory=list)
+    # LLC id (its lowest CPU) -> cache size in KB
+    llc_size_kb: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def cpus(self) -> List[int]:
+        return sorted(cpu for core in self.cores for cpu in core.cpus)
+
+    def llc_groups(self) -> Dict[int, List[CpuCore]]:
+        """Cores by LLC id"""
+        groups: Dict[int, List[CpuCore]] = {}
+        for core in self.cores:
+            groups.setdefault(core.llc, []).append(core)
+        return groups
+
+    @property
+    def is_hybrid(self) -> bool:
+        return len({core.performance for core in self.cores}) > 1
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _last_level_cache(cpu_dir: str) -> Tuple[Optional[str], int]:
+    """shared_cpu_list and size in KB of the highest cache level a CPU reports"""
+    best_level, shared, size_kb = -1, None, 0
+    cache_dir = os.path.join(cpu_dir, 'cache')
+    try:
+        indexes = [name for name in os.listdir(cache_dir) if name.startswith('index')]
+    except OSError:
+        return None, 0
+    for name in indexes:
+        level = _read(os.path.join(cache_dir, name, 'level'))
+        if level is None or _read(os.path.join(cache_dir, name, 'type')) == 'Instruction':
+            continue
+        if int(level) > best_level:
+            best_level = int(level)
+            shared = _read(os.path.join(cache_dir, name, 'shared_cpu_list'))
+            size = _read(os.path.join(cache_dir, name, 'size')) or "0K"
+            size_kb = int(size.rstrip('KMG') or 0) * (1024 if size.endswith('M') else 1)
+    return shared, size_kb
+
+
+def _performance_cpus(sys_root: str, cpus: List[int]) -> Optional[set]:
+    """CPUs of the faster core type, or None when all cores are alike"""
+    # Intel hybrid parts register a PMU per core type
+    core_cpus = _read(os.path.join(sys_root, 'devices', 'cpu_core', 'cpus'))
+    if core_cpus and _read(os.path.join(sys_root, 'devices', 'cpu_atom', 'cpus')):
+        return set(parse_cpu_list(core_cpus))
+    # Arm big.LITTLE reports a relative capacity per CPU
+    capacities = {}
+    for cpu in cpus:
+        capacity = _read(os.path.join(sys_root, 'devices', 'system', 'cpu', f'cpu{cpu}', 'cpu_capacity'))
+        if capacity is not None:
+            capacities[cpu] = int(capacity)
+    if capacities and len(set(capacities.values())) > 1:
+        highest = max(capacities.values())
+        return {cpu for cpu, capacity in capacities.items() if capacity == highest}
+    return None
+
+
+def read_cpu_topology(sys_root: str = "/sys") -> CpuTopology:
+    """Read the online CPUs' topology; CPUs without topology files count as one core each"""
+    cpu_root = os.path.join(sys_root, 'devices', 'system', 'cpu')
+    online = _read(os.path.join(cpu_root, 'online'))
+    cpus = parse_cpu_list(online) if online else list(range(os.cpu_count() or 1))
+    performance = _performance_cpus(sys_root, cpus)
+
+    topology = CpuTopology()
+    seen = set()
+    for cpu in cpus:
+        if cpu in seen:
+            continue
+        cpu_dir = os.path.join(cpu_root, f'cpu{cpu}')
+        siblings = _read(os.path.join(cpu_dir, 'topology', 'thread_siblings_list'))
+        core_cpus = tuple(c for c in (parse_cpu_list(siblings) if siblings else [cpu]) if c in cpus) or (cpu,)
+        seen.update(core_cpus)
+
+        shared, size_kb = _last_level_cache(cpu_dir)
+        llc = min(parse_cpu_list(shared)) if shared else 0
+        topology.llc_size_kb.setdefault(llc, size_kb)
+        is_performance = performance is None or any(c in performance for c in core_cpus)
+        topology.cores.append(CpuCore(cpus=core_cpus, llc=llc, performance=is_performance))
+    return topology
+
+
+def plan_partition(topology: CpuTopology, game_threads: int,
+                   background_share: float = 0.25) -> Tuple[List[int], List[int]]:
+    """
+    Split the CPUs into (game, background) sets.
+
+    The game gets one physical core per thread, up to all but
+    background_share of the cores. Cores are taken whole (with their SMT
+    siblings), from a single LLC group when one is big enough, and
+    performance cores before efficiency cores. Machines with one core
+    are not partitioned.
+    """
+    cores = topology.cores
+    if len(cores) < 2:
+        return topology.cpus, topology.cpus
+    background_cores = max(1, round(len(cores) * background_share))
+    wanted = min(max(game_threads, 1), len(cores) - background_cores)
+
+    def domain_rank(item):
+        llc, domain = item
+        return (len(domain) < wanted, -sum(core.performance for core in domain),
+                -topology.llc_size_kb.get(llc, 0), llc)
+
+    chosen: List[CpuCore] = []
+    for llc, domain in sorted(topology.llc_groups().items(), key=domain_rank):
+        for core in sorted(domain, key=lambda core: (not core.performance, core.cpus)):
+            if len(chosen) >= wanted:
+                break
+            chosen.append(core)
+    game_cpus = sorted(cpu for core in chosen for cpu in core.cpus)
+    background_cpus = [cpu for cpu in topology.cpus if cpu not in game_cpus]
+    return game_cpus, background_cpus
+
+
+# Example usage
+if __name__ == "__main__":
+    topology = read_cpu_topology()
+    for llc, domain in topology.llc_groups().items():
+        print(f"LLC {llc} ({topology.llc_size_kb.get(llc, 0)} KB): "
+              + " ".join(f"[{format_cpu_list(core.cpus)}{'' if core.performance else ' E'}]" for core in domain))
+    game, background = plan_partition(topology, game_threads=6)
+    print(f"Six-thread game: {format_cpu_list(game)}, background: {format_cpu_list(background)}")
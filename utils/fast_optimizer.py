@@ -4,6 +4,7 @@ Provides high-speed system optimization functions for the FPS booster.
 """
 
 from .cpp_performance_wrapper import CppPerformanceOptimizer
+from .tracing import traced
 import time
 import threading
 from typing import Dict, List, Tuple, Optional
@@ -14,12 +15,13 @@ class FastPerformanceOptimizer:
     High-performance system optimizer using C++ backend for faster execution.
     """
     
-    def __init__(self):
-        self.cpp_optimizer = CppPerformanceOptimizer()
+    def __init__(self, proc_root: str = "/proc", sys_root: str = "/sys"):
+        self.cpp_optimizer = CppPerformanceOptimizer(proc_root, sys_root)
         self.is_gaming_mode = False
         self.optimization_count = 0
         self.last_optimization_time = 0
         
+    @traced(category="cpp")
     def get_system_info_fast(self) -> Dict[str, float]:
         """
         Get system information using fast C++ implementation.
@@ -35,6 +37,7 @@ class FastPerformanceOptimizer:
             'uptime': self.cpp_optimizer.get_system_uptime()
         }
     
+    @traced(category="cpp")
     def optimize_system_fast(self, aggressive: bool = False) -> bool:
         """
         Perform fast system optimization using C++ backend.
@@ -102,10 +105,14 @@ class FastPerformanceOptimizer:
         }
 
 
-# Global instance for shared use
-fast_optimizer_instance = FastPerformanceOptimizer()
+# Global instance for shared use, created on first use so importing this module
+# cannot fail when the C++ library is missing
+fast_optimizer_instance = None
 
 
 def get_fast_optimizer():
     """Get the global fast optimizer instance."""
+    global fast_optimizer_instance
+    if fast_optimizer_instance is None:
+        fast_optimizer_instance = FastPerformanceOptimizer()
     return fast_optimizer_instance
\ No newline at end of file
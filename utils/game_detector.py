@@ -0,0 +1,185 @@
+"""
+Automatic game detection for Zio-Booster FPS Booster
+Indexes running processes by executable and activates the matching game profile
+"""
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import psutil
+
+from .process_events import ProcessEventBus, get_process_event_bus
+from .profile_manager import GameProfile, ProfileManager
+from .profile_store import normalize_path, path_keys
+
+
+class ProcessIndex:
+    """Running PIDs keyed by normalized executable path and by basename"""
+
+    def __init__(self):
+        self.by_exe: Dict[str, Set[int]] = {}
+        self.by_name: Dict[str, Set[int]] = {}
+        self.processes: Dict[int, Tuple[str, Tuple[str, ...]]] = {}
+
+    def add(self, pid: int, exe: str, name: str):
+        exe_key = normalize_path(exe)
+        names = set(path_keys(name))
+        if exe:
+            names.update(path_keys(exe))
+        names.discard("")
+        self.remove(pid)
+        self.processes[pid] = (exe_key, tuple(names))
+        if exe_key:
+            self.by_exe.setdefault(exe_key, set()).add(pid)
+        for key in names:
+            self.by_name.setdefault(key, set()).add(pid)
+
+    def remove(self, pid: int):
+        entry = self.processes.pop(pid, None)
+        if entry is None:
+            return
+        exe_key, names = entry
+        for index, key in [(self.by_exe, exe_key)] + [(self.by_name, name) for name in names]:
+            pids = index.get(key)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del index[key]
+
+    def find(self, path_or_name: str) -> Set[int]:
+        """PIDs running this executable path, or this process name or basename"""
+        pids = self.by_exe.get(normalize_path(path_or_name))
+        if pids:
+            return set(pids)
+        found = set()
+        for key in path_keys(path_or_name):
+            found.update(self.by_name.get(key, ()))
+        return found
+
+    def __len__(self):
+        return len(self.processes)
+
+
+class GameDetector:
+    """
+    Watches process start and exit events and reports games with a profile.
+
+    A full scan seeds the index once; after that only started processes
+    are read, so detection costs one exe/name read per new process and a
+    dictionary lookup per profile match, however many profiles exist.
+
+    A fork of a game still runs the game's image until it execs, so it is
+    held back and only reported if it execs into a game. A game process
+    that execs into another program is reported as an exit.
+    """
+
+    def __init__(self, profile_manager: ProfileManager,
+                 on_game_start: Optional[Callable[[GameProfile, int], None]] = None,
+                 on_game_exit: Optional[Callable[[GameProfile, int], None]] = None,
+                 event_bus: Optional[ProcessEventBus] = None):
+        self.profile_manager = profile_manager
+        self.on_game_start = on_game_start
+        self.on_game_exit = on_game_exit
+        self.event_bus = event_bus or get_process_event_bus()
+
+        self.index = ProcessIndex()
+        self.running_games: Dict[int, GameProfile] = {}
+        # Forks of running games waiting for an exec
+        self.forked: Dict[int, GameProfile] = {}
+        self.lock = threading.RLock()
+        self.is_running = False
+
+    def start(self):
+        """Index running processes and start listening for events"""
+        if self.is_running:
+            return
+        self.is_running = True
+        # Subscribe before scanning, so a process starting in between is not missed
+        self.event_bus.subscribe(self.handle_start, self.handle_exit)
+        with self.lock:
+            for proc in psutil.process_iter(['pid', 'name', 'exe']):
+                self.handle_start(proc.info['pid'], proc.info['exe'] or "", proc.info['name'] or "")
+
+    def stop(self):
+        """Stop listening for events"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self.event_bus.unsubscribe(self.handle_start, self.handle_exit)
+
+    def handle_start(self, pid: int, exe: Optional[str] = None, name: Optional[str] = None):
+        """Index a started process; exe and name are read when not given"""
+        if exe is None or name is None:
+            try:
+                process = psutil.Process(pid)
+                name = process.name()
+                try:
+                    exe = process.exe()
+                except (psutil.AccessDenied, psutil.ZombieProcess):
+                    exe = ""
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                return
+
+        with self.lock:
+            is_new = pid not in self.index.processes
+            self.index.add(pid, exe, name)
+            # An index lookup in the profile manager, whatever the size of the library
+            profile = self.profile_manager.match_executable(exe, name)
+            previous = self.running_games.pop(pid, None)
+            self.forked.pop(pid, None)
+            if profile is not None and is_new and self._is_fork_of_game(pid, profile):
+                self.forked[pid] = profile
+                return
+            if profile is not None:
+                self.running_games[pid] = profile
+        # A process seen by both the scan and an event is reported once
+        if previous is profile:
+            return
+        # E.g. a wrapper script that execs the real binary
+        if previous is not None and self.on_game_exit:
+            self.on_game_exit(previous, pid)
+        if profile is not None and self.on_game_start:
+            self.on_game_start(profile, pid)
+
+    def _is_fork_of_game(self, pid: int, profile: GameProfile) -> bool:
+        """Whether a new process is its game parent's image, not yet replaced by an exec"""
+        try:
+            parent = psutil.Process(pid).ppid()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+        return (self.running_games.get(parent) is profile
+                and self.index.processes.get(parent) == self.index.processes[pid])
+
+    def handle_exit(self, pid: int):
+        """Drop an exited process from the index"""
+        with self.lock:
+            self.index.remove(pid)
+            self.forked.pop(pid, None)
+            profile = self.running_games.pop(pid, None)
+        if profile is not None and self.on_game_exit:
+            self.on_game_exit(profile, pid)
+
+    def find_pids(self, path_or_name: str) -> Set[int]:
+        """PIDs running an executable path or process name, without scanning processes"""
+        with self.lock:
+            return self.index.find(path_or_name)
+
+    def pids_for_profile(self, profile_name: str) -> List[int]:
+        """PIDs of running processes matched to a profile"""
+        with self.lock:
+            return [pid for pid, profile in self.running_games.items() if profile.name == profile_name]
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    manager = ProfileManager()
+    detector = GameDetector(
+        manager,
+        on_game_start=lambda profile, pid: print(f"Game started: {profile.name} (PID: {pid})"),
+        on_game_exit=lambda profile, pid: print(f"Game exited: {profile.name} (PID: {pid})")
+    )
+    detector.start()
+    print(f"Indexed {len(detector.index)} processes against {len(manager.profile_names())} profiles; watching for 30 s")
+    time.sleep(30)
+    detector.stop()
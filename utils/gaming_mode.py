@@ -2,6 +2,7 @@
 Gaming Mode for Zio-Booster FPS Booster
 Activates focused gaming mode with various optimizations
 """
+import os
 import platform
 import subprocess
 import time
@@ -9,16 +10,22 @@ from typing import Dict, List, Optional
 import psutil
 import threading
 
+from .core_partitioning import CorePartitioner
+
 class GamingMode:
     """Manages gaming mode with various optimizations"""
     
-    def __init__(self):
+    def __init__(self, sys_root: str = "/sys", partition_interval: float = 2.0):
         self.active = False
         self.original_power_plan = None
         self.background_services_disabled = []
         self.notifications_blocked = False
         self.power_savings_disabled = []
         self.optimization_thread = None
+        # Game threads on their own cores while gaming mode is active
+        self.core_partitioner = CorePartitioner(sys_root=sys_root)
+        self.partition_interval = partition_interval
+        self.partition_stop = threading.Event()
         
     def activate_gaming_mode(self):
         """Activate gaming mode with all optimizations"""
@@ -49,6 +56,7 @@ class GamingMode:
         print("Deactivating Gaming Mode...")
         
         # Restore original settings
+        self.release_cores()
         self._restore_notifications()
         self._restore_power_saving_features()
         self._restore_background_services()
@@ -252,6 +260,36 @@ class GamingMode:
     def is_active(self) -> bool:
         """Check if gaming mode is currently active"""
         return self.active
+    
+    def partition_cores(self, game_pids: List[int]) -> bool:
+        """Pin the game to its own cores and everything else to the rest, while gaming mode is active"""
+        if not self.active or platform.system() != "Linux" or not hasattr(os, 'sched_setaffinity'):
+            return False
+        if not self.core_partitioner.apply(game_pids):
+            return False
+        if not (self.optimization_thread and self.optimization_thread.is_alive()):
+            self.partition_stop.clear()
+            self.optimization_thread = threading.Thread(target=self._watch_partition, daemon=True)
+            self.optimization_thread.start()
+        return True
+    
+    def release_cores(self):
+        """Stop partitioning and restore every thread's CPU affinity"""
+        self.partition_stop.set()
+        if self.optimization_thread and self.optimization_thread is not threading.current_thread():
+            self.optimization_thread.join(timeout=2)
+        self.optimization_thread = None
+        self.core_partitioner.restore()
+    
+    def _watch_partition(self):
+        """Recompute the partition as the game's thread count changes"""
+        while not self.partition_stop.wait(self.partition_interval):
+            try:
+                self.core_partitioner.update()
+            except Exception as e:
+                print(f"Error updating core partition: {e}")
+            if not self.core_partitioner.is_active:
+                break
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,314 @@
+"""
+Prometheus metrics for Zio-Booster FPS Booster
+Counters and histograms kept as preformatted text and served at /metrics
+"""
+import math
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from sub-millisecond stages to multi-second cycles
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way the text exposition format expects"""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = "") -> str:
+    """Render {a="1",b="2"} for a set of labels"""
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """
+    Shared plumbing: labelled children, a lock and a cached text block.
+
+    Every update marks the metric dirty; render() rebuilds the block only
+    for dirty metrics, so a scrape of an idle process is a single join of
+    cached strings.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.labelnames = tuple(labelnames)
+        self.header = f"# HELP {name} {documentation}\n# TYPE {name} {self.kind}\n"
+        self.lock = threading.Lock()
+        self.children: Dict[Tuple[str, ...], object] = {}
+        self.dirty = True
+        self.block = self.header
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> str:
+        """Text block for this metric, rebuilt only after an update"""
+        if self.dirty:
+            with self.lock:
+                self.block = self.header + "".join(self._render_child(key, child)
+                                                   for key, child in self.children.items())
+                self.dirty = False
+        return self.block
+
+    def _render_child(self, key, child) -> str:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ('value', 'line_prefix', 'line')
+
+    def __init__(self, line_prefix: str):
+        self.value = 0.0
+        self.line_prefix = line_prefix
+        self.line = line_prefix + "0\n"
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        if not name.endswith("_total"):
+            name += "_total"
+        super().__init__(name, documentation, labelnames)
+        if not self.labelnames:
+            self.children[()] = _CounterChild(f"{self.name} ")
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Add to the counter"""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self.lock:
+            child = self.children.get(key)
+            if child is None:
+                child = self.children[key] = _CounterChild(
+                    f"{self.name}{_label_text(self.labelnames, key)} ")
+            child.value += amount
+            child.line = child.line_prefix + _format_value(child.value) + "\n"
+            self.dirty = True
+
+    def value(self, **labels) -> float:
+        child = self.children.get(self._key(labels))
+        return child.value if child else 0.0
+
+    def _render_child(self, key, child) -> str:
+        return child.line
+
+
+class _HistogramChild:
+    __slots__ = ('counts', 'sum', 'count', 'bucket_prefixes', 'sum_prefix', 'count_prefix')
+
+    def __init__(self, bucket_prefixes: List[str], sum_prefix: str, count_prefix: str):
+        self.counts = [0] * len(bucket_prefixes)
+        self.sum = 0.0
+        self.count = 0
+        self.bucket_prefixes = bucket_prefixes
+        self.sum_prefix = sum_prefix
+        self.count_prefix = count_prefix
+
+
+class _Timer:
+    """Context manager observing the elapsed time of a block"""
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram: 'Histogram', labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        if not self.labelnames:
+            self.children[()] = self._new_child(())
+
+    def _new_child(self, key: Tuple[str, ...]) -> _HistogramChild:
+        # Label text is formatted once per child; only the numbers change afterwards
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        bucket_prefixes = [self.name + "_bucket" + _label_text(self.labelnames, key, f'le="{bound}"') + " "
+                           for bound in bounds]
+        labels = _label_text(self.labelnames, key)
+        return _HistogramChild(bucket_prefixes, f"{self.name}_sum{labels} ", f"{self.name}_count{labels} ")
+
+    def observe(self, value: float, **labels):
+        """Record one observation"""
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            child = self.children.get(key)
+            if child is None:
+                child = self.children[key] = self._new_child(key)
+            child.counts[index] += 1
+            child.sum += value
+            child.count += 1
+            self.dirty = True
+
+    def time(self, **labels) -> _Timer:
+        """Observe the duration of a with-block, e.g. with STAGE_SECONDS.time(stage="ai"):"""
+        return _Timer(self, labels)
+
+    def _render_child(self, key, child) -> str:
+        lines = []
+        cumulative = 0
+        for prefix, count in zip(child.bucket_prefixes, child.counts):
+            cumulative += count
+            lines.append(f"{prefix}{cumulative}\n")
+        lines.append(f"{child.sum_prefix}{_format_value(child.sum)}\n")
+        lines.append(f"{child.count_prefix}{child.count}\n")
+        return "".join(lines)
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the text exposition format"""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self.lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self) -> bytes:
+        """The full /metrics payload"""
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return "".join(metric.render() for metric in metrics).encode('utf-8')
+
+
+# Global registry shared by every instrumented module
+metrics_registry_instance = MetricsRegistry()
+
+
+def get_metrics_registry():
+    """Get the global metrics registry instance."""
+    return metrics_registry_instance
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.registry.render()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every second would flood the console
+        pass
+
+
+class MetricsExporter:
+    """HTTP server exposing a registry at /metrics"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, host: str = '127.0.0.1', port: int = 9464):
+        self.registry = registry or get_metrics_registry()
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        """Serve from a background thread"""
+        if self.server:
+            return
+        self.server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.registry = self.registry
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        print(f"Prometheus metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        """Stop serving"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def benchmark_render(scrapes: int = 1000, updates_per_scrape: int = 20) -> Dict[str, float]:
+    """Time scrapes of a registry shaped like the optimizer's, with a few updates between scrapes"""
+    import random
+    rng = random.Random(11)
+    registry = MetricsRegistry()
+    stages = registry.histogram('bench_stage_seconds', 'Stage latency', ['stage'])
+    terminated = registry.counter('bench_terminated', 'Processes terminated', ['reason'])
+    idle = [registry.histogram(f'bench_idle_{i}_seconds', 'Rarely updated') for i in range(20)]
+    for histogram in idle:
+        histogram.observe(0.01)
+
+    stage_names = ['snapshot', 'fast_optimize', 'ai', 'clean_memory', 'terminate', 'network']
+    render_seconds = 0.0
+    size = 0
+    for _ in range(scrapes):
+        for _ in range(updates_per_scrape):
+            stages.observe(rng.expovariate(20), stage=rng.choice(stage_names))
+            terminated.inc(reason=rng.choice(['temperature', 'memory', 'ai']))
+        start = time.perf_counter()
+        size = len(registry.render())
+        render_seconds += time.perf_counter() - start
+
+    return {'scrapes': scrapes, 'payload_bytes': size, 'render_ms': render_seconds / scrapes * 1000}
+
+
+# Example usage
+if __name__ == "__main__":
+    result = benchmark_render()
+    print(f"{result['payload_bytes']} byte payload rendered in {result['render_ms']:.3f} ms per scrape")
@@ -0,0 +1,146 @@
+"""
+Background metrics sampling for the Zio-Booster UI
+Samples system metrics off the Tk main thread and hands them over through a queue
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+from .metrics_exporter import get_metrics_registry
+
+SAMPLER_LAG_SECONDS = get_metrics_registry().histogram(
+    'zio_sampler_lag_seconds', 'Time between a metrics sample and the consumer picking it up')
+SAMPLES_DROPPED = get_metrics_registry().counter(
+    'zio_sampler_samples_dropped', 'Samples dropped because the consumer fell behind')
+
+
+def read_system_metrics() -> Dict[str, Any]:
+    """Read CPU, memory and temperature without blocking"""
+    # interval=None reports usage since the previous call instead of sleeping
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory_percent = psutil.virtual_memory().percent
+
+    cpu_temp = None
+    try:
+        temps = psutil.sensors_temperatures()
+        for name in ('coretemp', 'cpu_thermal', 'k10temp', 'acpi'):
+            if temps.get(name):
+                cpu_temp = temps[name][0].current
+                break
+    except (AttributeError, OSError):
+        pass
+
+    return {'cpu_percent': cpu_percent, 'memory_percent': memory_percent, 'cpu_temp': cpu_temp}
+
+
+class MetricsSampler:
+    """
+    Producer thread that samples metrics and posts them to a queue.
+
+    The Tk thread calls drain() from a short root.after timer and only
+    applies the results, so no psutil call ever runs on the UI thread.
+    Messages are (kind, timestamp, data) tuples; drain() keeps the newest
+    message of each kind. When the queue is full the oldest message is
+    dropped, so a stalled UI never makes the sampler block. An optional
+    recorder (see trace_replay.TraceRecorder) receives every message too.
+    """
+
+    def __init__(self, interval: float = 2.0, system_reader: Optional[Callable[[], Dict]] = None,
+                 process_reader: Optional[Callable[[], List]] = None, process_interval: float = 5.0,
+                 max_pending: int = 32, recorder=None):
+        self.interval = interval
+        self.system_reader = system_reader or read_system_metrics
+        self.process_reader = process_reader
+        self.process_interval = process_interval
+        self.sample_processes = False
+        self.recorder = recorder
+
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+        self._process_requested = False
+
+        # Time between a sample being taken and the UI picking it up
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples_taken = 0
+        self.samples_dropped = 0
+
+    def start(self):
+        """Start the sampling thread"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the sampling thread"""
+        self.stop_event.set()
+        self.wake_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def request_processes(self):
+        """Ask for a process list sample as soon as possible"""
+        self._process_requested = True
+        self.wake_event.set()
+
+    def post(self, kind: str, data: Any):
+        """Queue a message for the UI thread; safe to call from any thread"""
+        message = (kind, time.time(), data)
+        if self.recorder:
+            self.recorder.record(*message)
+        while True:
+            try:
+                self.queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.samples_dropped += 1
+                    SAMPLES_DROPPED.inc()
+                except queue.Empty:
+                    pass
+
+    def drain(self) -> Dict[str, Any]:
+        """Collect pending messages, keeping the newest of each kind; call from the UI thread"""
+        latest = {}
+        now = time.time()
+        while True:
+            try:
+                kind, timestamp, data = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            latest[kind] = data
+            self.last_lag = now - timestamp
+            SAMPLER_LAG_SECONDS.observe(self.last_lag)
+            self.max_lag = max(self.max_lag, self.last_lag)
+        return latest
+
+    def _run(self):
+        """Sampling thread body"""
+        # Prime the non-blocking CPU counter so the first sample is meaningful
+        psutil.cpu_percent(interval=None)
+        next_process_sample = 0.0
+
+        while not self.stop_event.is_set():
+            try:
+                self.post('system', self.system_reader())
+                self.samples_taken += 1
+
+                now = time.time()
+                wants_processes = self._process_requested or (self.sample_processes and now >= next_process_sample)
+                if self.process_reader and wants_processes:
+                    self._process_requested = False
+                    self.post('processes', self.process_reader())
+                    next_process_sample = now + self.process_interval
+            except Exception as e:
+                print(f"Error sampling metrics: {e}")
+
+            self.wake_event.wait(self.interval)
+            self.wake_event.clear()
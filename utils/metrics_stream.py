@@ -0,0 +1,305 @@
+"""
+Streaming metrics endpoint for Zio-Booster FPS Booster
+Serves PerformanceMetrics snapshots to browser dashboards as Server-Sent Events
+"""
+import asyncio
+import json
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Optional, Set
+
+# Marks a field the previous state did not have
+_MISSING = object()
+
+
+def encode_event(event: str, event_id: int, data: Dict[str, Any]) -> bytes:
+    """Serialize one SSE event"""
+    body = json.dumps(data, separators=(',', ':'), default=str)
+    return f"id: {event_id}\nevent: {event}\ndata: {body}\n\n".encode('utf-8')
+
+
+class _Subscriber:
+    """Pending events for one connected client"""
+    __slots__ = ('queue', 'resyncs')
+
+    def __init__(self, max_pending: int):
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.resyncs = 0
+
+
+class MetricsStreamServer:
+    """
+    Local HTTP server pushing metric deltas to dashboards.
+
+    One sample is taken per tick and only the fields that changed since the
+    previous tick are serialized, once, into an SSE "delta" event whose bytes
+    are shared by every subscriber. New subscribers, and subscribers that
+    fall max_pending events behind, get a full "snapshot" event instead.
+
+    Endpoints: GET /events (text/event-stream) and GET /snapshot (JSON).
+    Other origins may read them only when allow_origin names the dashboard's
+    origin (e.g. "http://localhost:3000"); by default no CORS header is sent.
+    """
+
+    def __init__(self, metrics=None, host: str = '127.0.0.1', port: int = 8765, interval: float = 1.0,
+                 snapshot_source: Optional[Callable[[], Dict[str, Any]]] = None,
+                 allow_origin: Optional[str] = None, max_pending: int = 16, keepalive: float = 15.0):
+        if snapshot_source is None:
+            if metrics is None:
+                from .performance_metrics import PerformanceMetrics
+                metrics = PerformanceMetrics()
+            snapshot_source = lambda: asdict(metrics.capture_snapshot())
+        self.snapshot_source = snapshot_source
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.allow_origin = allow_origin
+        self.max_pending = max_pending
+        self.keepalive = keepalive
+
+        self.state: Dict[str, Any] = {}
+        self.sequence = 0
+        self.subscribers: Set[_Subscriber] = set()
+        self.writers: Set[asyncio.StreamWriter] = set()
+        self.loop = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.stats = {'samples_taken': 0, 'events_serialized': 0, 'events_queued': 0, 'resyncs': 0, 'connections': 0}
+
+    def start(self):
+        """Serve from a background thread with its own event loop"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.ready.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        if not self.ready.wait(5):
+            raise RuntimeError("Metrics stream server did not start")
+
+    def stop(self):
+        """Stop the server and disconnect every subscriber"""
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._stop_event.set)
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self.subscribers)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/events"
+
+    def _run(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        self.loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        server = await asyncio.start_server(self._handle_client, self.host, self.port, backlog=1024)
+        self.port = server.sockets[0].getsockname()[1]
+        ticker = asyncio.create_task(self._tick_loop())
+        self.ready.set()
+        print(f"Metrics stream serving on {self.url}")
+        try:
+            await self._stop_event.wait()
+        finally:
+            ticker.cancel()
+            server.close()
+            # Wake every stream and close every connection first: from Python 3.12.1
+            # wait_closed() also waits for open connections, and streams never end on their own
+            for subscriber in list(self.subscribers):
+                while subscriber.queue.full():
+                    subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait(None)
+            for writer in list(self.writers):
+                writer.close()
+            await server.wait_closed()
+
+    def _sample(self) -> Dict[str, Any]:
+        """Take one sample, rounding floats so noise below display precision is not a change"""
+        return {key: round(value, 2) if isinstance(value, float) else value
+                for key, value in self.snapshot_source().items()}
+
+    async def _tick_loop(self):
+        """Sample once per tick and fan the serialized delta out to every subscriber"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = time.monotonic()
+            try:
+                # Sampling may block (capture_snapshot waits on cpu_percent), so keep it off the loop
+                state = await loop.run_in_executor(None, self._sample)
+            except Exception as e:
+                print(f"Error sampling metrics for stream: {e}")
+                await asyncio.sleep(self.interval)
+                continue
+
+            self.stats['samples_taken'] += 1
+            delta = {key: value for key, value in state.items() if self.state.get(key, _MISSING) != value}
+            self.state = state
+            self.sequence += 1
+            if delta:
+                self._broadcast(encode_event('delta', self.sequence, delta))
+
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def _broadcast(self, payload: bytes):
+        """Queue the same payload for every subscriber"""
+        self.stats['events_serialized'] += 1
+        snapshot = None
+        for subscriber in self.subscribers:
+            try:
+                subscriber.queue.put_nowait(payload)
+                self.stats['events_queued'] += 1
+            except asyncio.QueueFull:
+                # Too far behind: drop its backlog and let it catch up from a full snapshot
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                if snapshot is None:
+                    snapshot = self._snapshot_event()
+                subscriber.queue.put_nowait(snapshot)
+                subscriber.resyncs += 1
+                self.stats['resyncs'] += 1
+
+    def _snapshot_event(self) -> bytes:
+        self.stats['events_serialized'] += 1
+        return encode_event('snapshot', self.sequence, self.state)
+
+    def _headers(self, status: str, content_type: str, extra: str = "") -> bytes:
+        headers = f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nCache-Control: no-cache\r\n"
+        if self.allow_origin:
+            headers += f"Access-Control-Allow-Origin: {self.allow_origin}\r\n"
+        return (headers + extra + "\r\n").encode('latin-1')
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Parse one HTTP request and serve it"""
+        self.stats['connections'] += 1
+        self.writers.add(writer)
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 5)
+            while True:
+                line = await asyncio.wait_for(reader.readline(), 5)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+            parts = request_line.decode('latin-1').split()
+            method, path = (parts[0], parts[1].split('?')[0]) if len(parts) >= 2 else ('', '')
+
+            if method != 'GET':
+                writer.write(self._headers("405 Method Not Allowed", "text/plain", "Connection: close\r\n"))
+            elif path == '/events':
+                await self._stream(writer)
+            elif path == '/snapshot':
+                body = json.dumps(self.state, default=str).encode('utf-8')
+                writer.write(self._headers("200 OK", "application/json",
+                                           f"Content-Length: {len(body)}\r\nConnection: close\r\n") + body)
+            else:
+                writer.write(self._headers("404 Not Found", "text/plain", "Connection: close\r\n"))
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter):
+        """Send events to one subscriber until it disconnects"""
+        writer.write(self._headers("200 OK", "text/event-stream", "Connection: keep-alive\r\n") + b"retry: 2000\n\n")
+        if self.state:
+            writer.write(self._snapshot_event())
+        await writer.drain()
+
+        subscriber = _Subscriber(self.max_pending)
+        self.subscribers.add(subscriber)
+        try:
+            while True:
+                try:
+                    payload = await asyncio.wait_for(subscriber.queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    payload = b": keepalive\n\n"
+                if payload is None:
+                    break
+                writer.write(payload)
+                await writer.drain()
+        finally:
+            self.subscribers.discard(subscriber)
+
+
+def load_test(subscribers: int = 300, ticks: int = 20, interval: float = 0.1) -> Dict[str, float]:
+    """
+    Connect many local SSE subscribers to a server fed by a synthetic source
+    and report how many samples were taken versus events delivered
+    """
+    import random
+    rng = random.Random(5)
+
+    def synthetic_snapshot():
+        return {
+            'timestamp': time.time(),
+            'cpu_percent': rng.uniform(0, 100),
+            'memory_percent': rng.uniform(20, 90),
+            'cpu_temp': rng.choice([None, rng.uniform(40, 90)]),
+            'processes_count': rng.randint(200, 400)
+        }
+
+    server = MetricsStreamServer(port=0, interval=interval, snapshot_source=synthetic_snapshot)
+    server.start()
+    received = [0] * subscribers
+
+    async def subscriber(index: int, stop: asyncio.Event):
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+        await writer.drain()
+        try:
+            while not stop.is_set():
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.startswith(b"event: "):
+                    received[index] += 1
+        finally:
+            writer.close()
+
+    async def run_clients():
+        stop = asyncio.Event()
+        tasks = [asyncio.create_task(subscriber(i, stop)) for i in range(subscribers)]
+        while server.subscriber_count < subscribers:
+            await asyncio.sleep(0.05)
+        # Count only what is delivered once everyone is connected
+        for i in range(subscribers):
+            received[i] = 0
+        samples_before = server.stats['samples_taken']
+        start = time.perf_counter()
+        await asyncio.sleep(ticks * interval)
+        samples = server.stats['samples_taken'] - samples_before
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return samples, elapsed
+
+    try:
+        samples, elapsed = asyncio.run(run_clients())
+    finally:
+        server.stop()
+
+    delivered = sum(received)
+    return {
+        'subscribers': subscribers,
+        'seconds': elapsed,
+        'samples_taken': samples,
+        'events_delivered': delivered,
+        'events_per_sample': delivered / samples if samples else 0.0,
+        'min_events_per_subscriber': min(received),
+        'resyncs': server.stats['resyncs']
+    }
+
+
+# Example usage
+if __name__ == "__main__":
+    result = load_test()
+    print(f"{result['subscribers']} subscribers, {result['samples_taken']} samples in {result['seconds']:.1f}s: "
+          f"{result['events_delivered']} events delivered ({result['events_per_sample']:.0f} per sample, "
+          f"at least {result['min_events_per_subscriber']} per subscriber, {result['resyncs']} resyncs)")
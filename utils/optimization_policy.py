@@ -0,0 +1,135 @@
+"""
+Optimization decision rules for Zio-Booster FPS Booster
+Threshold-based recommendations and process selection, shared by the live
+optimizers and the offline trace replay
+"""
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .process_classifier import EXPENDABLE, PROTECTED, get_process_classifier
+
+# Thresholds behind the AI optimizer's recommendations
+DEFAULT_THRESHOLDS = {
+    'cpu_high': 80.0,
+    'cpu_medium': 60.0,
+    'memory_high': 85.0,
+    'memory_medium': 70.0,
+    'disk_high': 90.0,
+    'disk_medium': 75.0,
+    'process_count_high': 200,
+    'process_count_medium': 100,
+}
+
+
+def recommend(features: Sequence[float], thresholds: Optional[Dict] = None) -> List[Dict]:
+    """
+    Recommendations for one AI feature vector
+    features: cpu %, memory %, disk %, net sent MB, net received MB, process count,
+    available memory GB, free disk GB, time of day
+    """
+    t = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+    recommendations = []
+
+    cpu_usage, memory_usage, disk_usage, net_sent, net_recv, proc_count, avail_mem, free_disk, time_of_day = features
+
+    # CPU-based recommendations
+    if cpu_usage > t['cpu_high']:
+        recommendations.append({
+            'type': 'cpu',
+            'action': 'reduce_process_priority',
+            'severity': 'high',
+            'reason': f'High CPU usage detected: {cpu_usage:.1f}%'
+        })
+    elif cpu_usage > t['cpu_medium']:
+        recommendations.append({
+            'type': 'cpu',
+            'action': 'monitor_process_usage',
+            'severity': 'medium',
+            'reason': f'Moderate CPU usage detected: {cpu_usage:.1f}%'
+        })
+
+    # Memory-based recommendations
+    if memory_usage > t['memory_high']:
+        recommendations.append({
+            'type': 'memory',
+            'action': 'clear_cache_and_swap',
+            'severity': 'high',
+            'reason': f'High memory usage detected: {memory_usage:.1f}%'
+        })
+    elif memory_usage > t['memory_medium']:
+        recommendations.append({
+            'type': 'memory',
+            'action': 'monitor_memory_usage',
+            'severity': 'medium',
+            'reason': f'Moderate memory usage detected: {memory_usage:.1f}%'
+        })
+
+    # Disk-based recommendations
+    if disk_usage > t['disk_high']:
+        recommendations.append({
+            'type': 'disk',
+            'action': 'clean_temp_files',
+            'severity': 'high',
+            'reason': f'Critical disk usage detected: {disk_usage:.1f}%'
+        })
+    elif disk_usage > t['disk_medium']:
+        recommendations.append({
+            'type': 'disk',
+            'action': 'monitor_disk_usage',
+            'severity': 'medium',
+            'reason': f'High disk usage detected: {disk_usage:.1f}%'
+        })
+
+    # Process count recommendations
+    if proc_count > t['process_count_high']:
+        recommendations.append({
+            'type': 'process',
+            'action': 'identify_unnecessary_processes',
+            'severity': 'high',
+            'reason': f'High number of processes detected: {proc_count}'
+        })
+    elif proc_count > t['process_count_medium']:
+        recommendations.append({
+            'type': 'process',
+            'action': 'monitor_process_list',
+            'severity': 'medium',
+            'reason': f'Moderate number of processes detected: {proc_count}'
+        })
+
+    return recommendations
+
+
+def is_system_critical_process(process_name: str) -> bool:
+    """Check by name alone if a process is critical to system operation"""
+    rule = get_process_classifier().classify_name(process_name)
+    return rule is not None and rule.category == PROTECTED
+
+
+def is_unnecessary_process(process_name: str) -> bool:
+    """Check by name alone if a process is a background application the optimizers may stop"""
+    rule = get_process_classifier().classify_name(process_name)
+    return rule is not None and rule.category == EXPENDABLE
+
+
+def select_high_temperature_processes(processes: List, threshold: float = 70.0, count: int = 3,
+                                      is_protected: Optional[Callable] = None) -> List:
+    """
+    Processes to terminate from ProcessRecord rows sorted by temperature score,
+    highest first. Only the top count * 2 rows are considered, as in the live optimizer.
+    is_protected decides per row; by default only the process name is checked.
+    """
+    if is_protected is None:
+        is_protected = lambda proc: is_system_critical_process(proc.name)
+    selected = []
+    for proc in processes[:count * 2]:
+        if len(selected) >= count:
+            break
+        if proc.temperature_score >= threshold and not is_protected(proc):
+            selected.append(proc)
+    return selected
+
+
+def select_cpu_intensive_processes(processes: List, cpu_threshold: float = 20.0, limit: int = 5) -> List:
+    """Top CPU consumers above cpu_threshold, whose priority the AI optimizer lowers"""
+    busy = [proc for proc in processes if proc.cpu_percent > cpu_threshold]
+    busy.sort(key=lambda proc: proc.cpu_percent, reverse=True)
+    return busy[:limit]
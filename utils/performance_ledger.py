@@ -0,0 +1,352 @@
+"""
+Append-only performance ledger for Zio-Booster FPS Booster
+Stores performance records in a hash-chained file that can be verified incrementally
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def default_ledger_path() -> str:
+    """
+    Ledger location: ZIO_LEDGER when set, otherwise the per-user data
+    directory (XDG_DATA_HOME, %APPDATA% or ~/Library/Application Support)
+    """
+    configured = os.environ.get('ZIO_LEDGER')
+    if configured:
+        return configured
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or os.path.expanduser('~')
+        data_dir = os.path.join(base, 'Zio-Booster')
+    elif sys.platform == 'darwin':
+        data_dir = os.path.expanduser('~/Library/Application Support/Zio-Booster')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+        data_dir = os.path.join(base, 'zio-booster')
+    return os.path.join(data_dir, 'performance_ledger.jsonl')
+
+
+class PerformanceLedger:
+    """
+    Tamper-evident ledger of performance records.
+
+    Every line of the ledger file is ``<sha256> <payload>`` where the hash
+    covers the previous entry's hash followed by the payload bytes, so
+    changing any entry breaks every hash after it. Appends serialize the
+    record once and hash it once; verification reads only the part of the
+    file added since the last check, plus one older checkpoint segment in
+    rotation, so the whole file is rechecked over time at a bounded cost
+    per call.
+
+    Opening an existing ledger streams it rather than loading it, and
+    resumes from the state saved beside it (``<path>.state``) by the last
+    close(), so only entries appended after that save are rehashed at
+    startup; older entries are covered by the rotating checkpoint rechecks.
+    """
+    GENESIS_HASH = "0" * 64
+    # Bytes read at a time when looking for the end of the last complete line
+    TAIL_BLOCK = 65536
+
+    def __init__(self, path: Optional[str] = None, checkpoint_interval: int = 1024,
+                 max_checkpoints: int = 4096, recent_size: int = 256):
+        self.path = path or default_ledger_path()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.checkpoint_interval = checkpoint_interval
+        self.max_checkpoints = max_checkpoints
+        self.recent_entries = deque(maxlen=recent_size)
+        self.lock = threading.Lock()
+        self.verify_lock = threading.Lock()
+
+        self.entry_count = 0
+        self.last_hash = self.GENESIS_HASH
+        self.size = 0
+        # Byte offset of the last entry, which a saved state is checked against
+        self.last_offset = 0
+        self.tampered = False
+
+        # (byte offset, entry index, hash of the entry before the offset)
+        self.checkpoints: List[Tuple[int, int, str]] = [(0, 0, self.GENESIS_HASH)]
+        self.verified_offset = 0
+        self.verified_hash = self.GENESIS_HASH
+        self._next_recheck = 0
+
+        self._recover()
+        self._file = open(self.path, "ab")
+
+    @property
+    def state_path(self) -> str:
+        return self.path + ".state"
+
+    def _recover(self):
+        """Rebuild the chain state from an existing ledger file"""
+        if not os.path.exists(self.path):
+            return
+
+        # A crash can leave a partially written last line; drop it
+        end = self._complete_size()
+        if end < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+
+        offset = self._load_state(end)
+        previous = self.last_hash
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if self.entry_count and self.entry_count % self.checkpoint_interval == 0:
+                    self._add_checkpoint(offset, self.entry_count, previous)
+                digest, payload = self._split(line)
+                if digest is None or self._hash(previous, payload) != digest:
+                    self.tampered = True
+                previous = digest or previous
+                self.last_offset = offset
+                offset += len(line)
+                self.entry_count += 1
+
+        self.last_hash = previous
+        self.size = offset
+        self.verified_offset = offset
+        self.verified_hash = previous
+        if not self.tampered:
+            self._save_state()
+
+    def _complete_size(self) -> int:
+        """Length of the file up to the end of its last complete line"""
+        with open(self.path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            while position > 0:
+                start = max(0, position - self.TAIL_BLOCK)
+                f.seek(start)
+                block = f.read(position - start)
+                newline = block.rfind(b"\n")
+                if newline >= 0:
+                    return start + newline + 1
+                position = start
+        return 0
+
+    def _load_state(self, end: int) -> int:
+        """
+        Resume from the state saved by the last close() if it still matches
+        the file; returns the byte offset to continue reading from
+        """
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+            size, last_offset, last_hash = state['size'], state['last_offset'], state['last_hash']
+            if not 0 <= last_offset < size <= end:
+                return 0
+            with open(self.path, "rb") as f:
+                f.seek(last_offset)
+                line = f.read(size - last_offset)
+            digest, payload = self._split(line)
+            if not line.endswith(b"\n") or line.count(b"\n") != 1 or digest != last_hash:
+                return 0
+            checkpoints = [tuple(checkpoint) for checkpoint in state['checkpoints']]
+            entry_count, checkpoint_interval = int(state['entry_count']), int(state['checkpoint_interval'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0
+
+        self.entry_count = entry_count
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = checkpoints
+        self.last_hash = last_hash
+        self.last_offset = last_offset
+        return size
+
+    def _save_state(self):
+        """Save what _load_state() needs to skip rehashing the entries written so far"""
+        if not self.entry_count:
+            return
+        state = {
+            'size': self.size,
+            'last_offset': self.last_offset,
+            'last_hash': self.last_hash,
+            'entry_count': self.entry_count,
+            'checkpoint_interval': self.checkpoint_interval,
+            'checkpoints': self.checkpoints,
+        }
+        temporary = self.state_path + ".tmp"
+        try:
+            with open(temporary, "w") as f:
+                json.dump(state, f)
+            os.replace(temporary, self.state_path)
+        except OSError as e:
+            print(f"Could not save ledger state: {e}")
+
+    @staticmethod
+    def _hash(previous_hash: str, payload: bytes) -> str:
+        """Hash a payload chained to the previous entry"""
+        return hashlib.sha256(previous_hash.encode() + payload).hexdigest()
+
+    @staticmethod
+    def _split(line: bytes) -> Tuple[Optional[str], bytes]:
+        """Split a ledger line into its hash and payload"""
+        if len(line) < 66 or line[64:65] != b" ":
+            return None, b""
+        return line[:64].decode("ascii", "replace"), line[65:].rstrip(b"\n")
+
+    def _add_checkpoint(self, offset: int, index: int, previous_hash: str):
+        """Record a checkpoint, thinning the list when it grows past its cap"""
+        self.checkpoints.append((offset, index, previous_hash))
+        if len(self.checkpoints) > self.max_checkpoints:
+            # Keep every other checkpoint so memory stays bounded as the file grows
+            self.checkpoints = self.checkpoints[::2]
+            self.checkpoint_interval *= 2
+
+    def append(self, data: Any, timestamp: Optional[float] = None) -> str:
+        """Append a record and return its hash"""
+        with self.lock:
+            index = self.entry_count
+            payload = json.dumps(
+                [index, timestamp if timestamp is not None else time.time(), data],
+                separators=(",", ":"), default=str
+            ).encode()
+            digest = self._hash(self.last_hash, payload)
+            line = digest.encode() + b" " + payload + b"\n"
+
+            if index and index % self.checkpoint_interval == 0:
+                self._add_checkpoint(self.size, index, self.last_hash)
+
+            self._file.write(line)
+            self.last_offset = self.size
+            self.size += len(line)
+            self.last_hash = digest
+            self.entry_count += 1
+            self.recent_entries.append((index, digest, data))
+            return digest
+
+    def flush(self):
+        """Flush buffered entries to the ledger file"""
+        with self.lock:
+            self._file.flush()
+
+    def _verify_segment(self, start: int, end: int, previous_hash: str) -> Optional[str]:
+        """
+        Re-hash the entries stored between two byte offsets.
+        Returns the hash of the last entry, or None if the segment is broken
+        """
+        offset = start
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            while offset < end:
+                line = f.readline(end - offset)
+                if not line:
+                    return None
+                digest, payload = self._split(line)
+                if digest is None or self._hash(previous_hash, payload) != digest:
+                    return None
+                previous_hash = digest
+                offset += len(line)
+        return previous_hash
+
+    def verify(self, full: bool = False) -> bool:
+        """
+        Verify the ledger.
+
+        By default this checks the entries appended since the last call and
+        one older checkpoint segment; pass full=True to rescan the whole file.
+        """
+        with self.verify_lock:
+            return self._verify(full)
+
+    def _verify(self, full: bool) -> bool:
+        """Verification body; the caller holds verify_lock"""
+        with self.lock:
+            self._file.flush()
+            size = self.size
+            last_hash = self.last_hash
+            checkpoints = list(self.checkpoints)
+
+        if self.tampered:
+            return False
+
+        if full:
+            result = self._verify_segment(0, size, self.GENESIS_HASH)
+            if result != last_hash:
+                self.tampered = True
+                return False
+        else:
+            # New entries are checked exactly once
+            if self.verified_offset < size:
+                result = self._verify_segment(self.verified_offset, size, self.verified_hash)
+                if result != last_hash:
+                    self.tampered = True
+                    return False
+
+            # Lazily recheck one closed checkpoint segment per call
+            closed = [cp for cp in checkpoints if cp[0] <= self.verified_offset]
+            if len(closed) > 1:
+                k = self._next_recheck % (len(closed) - 1)
+                start, _, start_hash = closed[k]
+                end, _, end_hash = closed[k + 1]
+                if self._verify_segment(start, end, start_hash) != end_hash:
+                    self.tampered = True
+                    return False
+                self._next_recheck = k + 1
+
+        self.verified_offset = size
+        self.verified_hash = last_hash
+        return True
+
+    def read_entries(self, start_index: int = 0, limit: int = 100) -> List[Dict]:
+        """Read decoded entries from the file, seeking from the nearest checkpoint"""
+        self.flush()
+        offset, index = 0, 0
+        for cp_offset, cp_index, _ in self.checkpoints:
+            if cp_index <= start_index:
+                offset, index = cp_offset, cp_index
+
+        entries = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if index >= start_index:
+                    digest, payload = self._split(line)
+                    entry_index, timestamp, data = json.loads(payload)
+                    entries.append({'index': entry_index, 'timestamp': timestamp, 'data': data, 'hash': digest})
+                    if len(entries) >= limit:
+                        break
+                index += 1
+        return entries
+
+    def close(self):
+        """Flush and close the ledger file"""
+        with self.lock:
+            if not self._file.closed:
+                self._file.flush()
+                self._file.close()
+                if not self.tampered:
+                    self._save_state()
+
+    def __len__(self) -> int:
+        return self.entry_count
+
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), "ledger.jsonl")
+    ledger = PerformanceLedger(path)
+
+    count = 50000
+    start = time.perf_counter()
+    for i in range(count):
+        ledger.append({'cpu_usage': 42.0, 'memory_usage': 61.5, 'cycle': i})
+    ledger.flush()
+    elapsed = time.perf_counter() - start
+    print(f"Appended {count} entries in {elapsed:.2f}s ({count / elapsed:.0f} entries/s)")
+
+    start = time.perf_counter()
+    print(f"Incremental verification: {ledger.verify()} ({time.perf_counter() - start:.3f}s)")
+    start = time.perf_counter()
+    print(f"Lazy recheck: {ledger.verify()} ({time.perf_counter() - start:.4f}s)")
+    print(f"Checkpoints held in memory: {len(ledger.checkpoints)}")
+    ledger.close()
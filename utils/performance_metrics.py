@@ -1,6 +1,7 @@
 """
 Advanced Performance Metrics for Zio-Booster FPS Booster
 """
+import sys
 import time
 import psutil
 import platform
@@ -9,7 +10,14 @@ from dataclasses import dataclass
 from datetime import datetime
 import statistics
 
-@dataclass
+from .bounded_history import BoundedHistory, memory_report
+from .temperature_monitor import read_thermal_zone_temperature
+from .tracing import traced
+
+# An hour of history is thousands of snapshots; slots keep each one a fixed-size record (Python 3.10+)
+SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**SLOTS)
 class PerformanceSnapshot:
     """A snapshot of system performance metrics at a specific time"""
     timestamp: float
@@ -26,11 +34,13 @@ class PerformanceSnapshot:
 class PerformanceMetrics:
     """Manages collection and analysis of performance metrics"""
     
-    def __init__(self):
-        self.snapshots: List[PerformanceSnapshot] = []
+    def __init__(self, history_capacity: int = 3600, history_ttl: float = 3600.0, sys_root: str = "/sys"):
+        self.sys_root = sys_root
+        self.snapshots = BoundedHistory(capacity=history_capacity, ttl=history_ttl, name='snapshots')
         self.network_baseline = psutil.net_io_counters()
         self.disk_baseline = psutil.disk_io_counters()
         
+    @traced
     def capture_snapshot(self) -> PerformanceSnapshot:
         """Capture a snapshot of current system performance"""
         # Get network I/O since last baseline
@@ -68,11 +78,17 @@ class PerformanceMetrics:
             active_optimizations=0  # This would be updated by the optimizer
         )
         
-        self.snapshots.append(snapshot)
+        self.snapshots.append(snapshot, timestamp=snapshot.timestamp)
         return snapshot
     
     def _get_cpu_temperature(self) -> Optional[float]:
         """Get CPU temperature if available"""
+        if self.sys_root != "/sys":
+            try:
+                return read_thermal_zone_temperature(self.sys_root)
+            except Exception:
+                return None
+        
         try:
             temps = psutil.sensors_temperatures()
             if temps:
@@ -96,28 +112,28 @@ class PerformanceMetrics:
     def get_cpu_trend(self, minutes: int = 5) -> List[Tuple[float, float]]:
         """Get CPU usage trend over the last specified minutes"""
         cutoff_time = time.time() - (minutes * 60)
-        recent_snapshots = [s for s in self.snapshots if s.timestamp >= cutoff_time]
+        recent_snapshots = self.snapshots.since(cutoff_time)
         
         return [(s.timestamp, s.cpu_percent) for s in recent_snapshots]
     
     def get_memory_trend(self, minutes: int = 5) -> List[Tuple[float, float]]:
         """Get memory usage trend over the last specified minutes"""
         cutoff_time = time.time() - (minutes * 60)
-        recent_snapshots = [s for s in self.snapshots if s.timestamp >= cutoff_time]
+        recent_snapshots = self.snapshots.since(cutoff_time)
         
         return [(s.timestamp, s.memory_percent) for s in recent_snapshots]
     
     def get_temperature_trend(self, minutes: int = 5) -> List[Tuple[float, Optional[float]]]:
         """Get temperature trend over the last specified minutes"""
         cutoff_time = time.time() - (minutes * 60)
-        recent_snapshots = [s for s in self.snapshots if s.timestamp >= cutoff_time]
+        recent_snapshots = self.snapshots.since(cutoff_time)
         
         return [(s.timestamp, s.cpu_temp) for s in recent_snapshots if s.cpu_temp is not None]
     
     def get_average_metrics(self, minutes: int = 5) -> Dict[str, float]:
         """Get average metrics over the last specified minutes"""
         cutoff_time = time.time() - (minutes * 60)
-        recent_snapshots = [s for s in self.snapshots if s.timestamp >= cutoff_time]
+        recent_snapshots = self.snapshots.since(cutoff_time)
         
         if not recent_snapshots:
             return {}
@@ -156,7 +172,7 @@ class PerformanceMetrics:
     def get_peak_metrics(self, minutes: int = 5) -> Dict[str, float]:
         """Get peak metrics over the last specified minutes"""
         cutoff_time = time.time() - (minutes * 60)
-        recent_snapshots = [s for s in self.snapshots if s.timestamp >= cutoff_time]
+        recent_snapshots = self.snapshots.since(cutoff_time)
         
         if not recent_snapshots:
             return {}
@@ -177,7 +193,11 @@ class PerformanceMetrics:
     def clear_old_snapshots(self, minutes: int = 60):
         """Clear snapshots older than specified minutes"""
         cutoff_time = time.time() - (minutes * 60)
-        self.snapshots = [s for s in self.snapshots if s.timestamp >= cutoff_time]
+        self.snapshots.discard_older_than(cutoff_time)
+    
+    def get_memory_report(self) -> Dict[str, Dict]:
+        """Report the size of the snapshot history"""
+        return memory_report(snapshots=self.snapshots)
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,299 @@
+"""
+Process classification for Zio-Booster FPS Booster
+Decides which processes are protected and which the optimizers may throttle or
+terminate, from rules matched against a process's name, executable, cgroup,
+UID and parent chain
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import psutil
+
+from .profile_store import normalize_path
+
+PROTECTED = 'protected'
+EXPENDABLE = 'expendable'
+CATEGORIES = (PROTECTED, EXPENDABLE)
+FIELDS = ('name', 'exe', 'cgroup', 'uid', 'parent')
+
+# Ancestors checked by 'parent' rules
+MAX_PARENT_DEPTH = 8
+
+
+@dataclass
+class ProcessRule:
+    """
+    One classification rule. The pattern is a regular expression that must
+    match the whole field value, case-insensitively: the process name, the
+    executable path (lowercase, forward slashes), the cgroup v2 path, the
+    real UID as a decimal string, or the name of any ancestor process.
+    """
+    category: str
+    field: str
+    pattern: str
+    description: str = ""
+
+
+def _rules(category: str, field: str, patterns: Iterable[str], description: str) -> List[ProcessRule]:
+    return [ProcessRule(category, field, pattern, description) for pattern in patterns]
+
+
+DEFAULT_RULES: List[ProcessRule] = (
+    _rules(PROTECTED, 'name', [
+        r'init', r'systemd(-[a-z0-9-]+)?', r'kthreadd', r'(kworker|ksoftirqd|migration|watchdog|cpuhp)/.*',
+        r'rcu_.*', r'kernel_task', r'launchd', r'windowserver', r'dbus-(daemon|broker)', r'sshd',
+        r'x|xorg|xwayland', r'gnome-shell', r'kwin_(x11|wayland)', r'pipewire(-pulse)?', r'pulseaudio',
+        r'system', r'registry', r'explorer\.exe', r'svchost\.exe', r'wininit\.exe', r'csrss\.exe',
+        r'lsass\.exe', r'services\.exe', r'dwm\.exe', r'winlogon\.exe', r'spoolsv\.exe',
+        r'taskhostw?\.exe', r'smss\.exe',
+    ], "operating system process")
+    + _rules(PROTECTED, 'exe', [r'(/usr)?/lib/systemd/.*', r'c:/windows/system32/.*'], "operating system binary")
+    + _rules(PROTECTED, 'cgroup', [r'/(init\.scope|system\.slice)(/.*)?'], "system service")
+    + _rules(PROTECTED, 'uid', [r'[0-9]{1,3}'], "root or system account")
+    + _rules(PROTECTED, 'parent', [r'kthreadd'], "kernel thread")
+    + _rules(EXPENDABLE, 'name', [
+        r'dropbox', r'onedrive(\.exe)?', r'google ?drive(fs|sync)?(\.exe)?', r'spotify(\.exe)?', r'vlc(\.exe)?',
+        r'steamwebhelper(\.exe)?', r'code helper.*', r'(ms-)?teams(\.exe)?', r'slack(\.exe)?', r'skype(\.exe)?',
+        r'chrome(\.exe)?', r'google-chrome.*', r'chromium(-browser)?', r'firefox(-bin|\.exe)?',
+        r'msedge(\.exe)?', r'brave(-browser)?(\.exe)?', r'opera(\.exe)?', r'vivaldi(-bin|\.exe)?',
+    ], "background application")
+    + _rules(EXPENDABLE, 'cgroup', [
+        r'.*/app-(flatpak-)?(com\.spotify\.client|org\.mozilla\.firefox|com\.google\.chrome|com\.slack\.slack)[-.@].*',
+    ], "background application")
+    + _rules(EXPENDABLE, 'parent', [
+        r'chrome(\.exe)?', r'firefox(-bin|\.exe)?', r'msedge(\.exe)?', r'steamwebhelper(\.exe)?',
+    ], "helper of a background application")
+)
+
+
+def rule_from_dict(data: Union[Dict, ProcessRule]) -> ProcessRule:
+    """A rule from a profile's process_rules entry"""
+    if isinstance(data, ProcessRule):
+        return data
+    # Malformed entries become rules RuleSet rejects, so one bad entry cannot stop a profile applying
+    return ProcessRule(data.get('category', ""), data.get('field', ""), data.get('pattern', ""),
+                       data.get('description', "profile rule"))
+
+
+class RuleSet:
+    """
+    Rules compiled to one regular expression per category and field.
+
+    Each rule's pattern becomes a capturing group of an alternation, and the
+    outermost group that matched (Match.lastindex) identifies the rule, so a
+    field value is tested against every rule of a kind in one match call.
+    A pattern that is valid alone but cannot share an alternation (inline
+    global flags such as (?i), or a group name another rule also uses) is
+    matched on its own after the combined expression.
+    """
+
+    def __init__(self, rules: Iterable[ProcessRule]):
+        self.rules: List[ProcessRule] = []
+        grouped: Dict[Tuple[str, str], List[ProcessRule]] = {}
+        for rule in rules:
+            if rule.category not in CATEGORIES or rule.field not in FIELDS:
+                print(f"Ignoring process rule {rule.pattern!r}: unknown category or field")
+                continue
+            try:
+                re.compile(rule.pattern)
+            except re.error as e:
+                print(f"Ignoring process rule {rule.pattern!r}: {e}")
+                continue
+            self.rules.append(rule)
+            grouped.setdefault((rule.category, rule.field), []).append(rule)
+
+        self.matchers: Dict[Tuple[str, str], List[Tuple[re.Pattern, Dict[int, ProcessRule]]]] = {}
+        for key, group in grouped.items():
+            combined, alone = [], []
+            for rule in group:
+                try:
+                    self._compile(combined + [rule])
+                    combined.append(rule)
+                except re.error:
+                    alone.append(rule)
+            matchers = [self._compile(combined)] if combined else []
+            # Unwrapped, since inline global flags must open the whole expression
+            matchers += [(re.compile(rule.pattern, re.IGNORECASE), {1: rule}) for rule in alone]
+            self.matchers[key] = matchers
+
+    @staticmethod
+    def _compile(rules: List[ProcessRule]) -> Tuple[re.Pattern, Dict[int, ProcessRule]]:
+        """One alternation of the rules, and the rule behind each top-level group"""
+        parts, by_group, index = [], {}, 1
+        for rule in rules:
+            parts.append(f"({rule.pattern})")
+            by_group[index] = rule
+            index += 1 + re.compile(rule.pattern).groups
+        return re.compile("|".join(parts), re.IGNORECASE), by_group
+
+    @property
+    def fields(self) -> set:
+        return {field for _, field in self.matchers}
+
+    def match(self, category: str, field: str, values: Iterable[str]) -> Optional[ProcessRule]:
+        matchers = self.matchers.get((category, field))
+        if matchers is None:
+            return None
+        for value in values:
+            for regex, by_group in matchers:
+                match = regex.fullmatch(value)
+                if match:
+                    # A rule matched alone may have no groups at all
+                    return by_group[match.lastindex] if len(by_group) > 1 else by_group[1]
+        return None
+
+
+class ProcessFacts:
+    """Field values of one process, read on first use"""
+
+    def __init__(self, process: psutil.Process, proc_root: str):
+        self.process = process
+        self.proc_root = proc_root
+        self.values: Dict[str, List[str]] = {}
+
+    def get(self, field: str) -> List[str]:
+        if field not in self.values:
+            try:
+                self.values[field] = [value for value in self._read(field) if value]
+            except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+                self.values[field] = []
+        return self.values[field]
+
+    def _read(self, field: str) -> List[str]:
+        if field == 'name':
+            return [self.process.name()]
+        if field == 'exe':
+            return [normalize_path(self.process.exe())]
+        if field == 'uid':
+            return [str(self.process.uids().real)] if hasattr(self.process, 'uids') else []
+        if field == 'cgroup':
+            with open(os.path.join(self.proc_root, str(self.process.pid), 'cgroup')) as f:
+                return [line[3:].strip() for line in f if line.startswith('0::')]
+        return self._parent_names()
+
+    def _parent_names(self) -> List[str]:
+        names, pid = [], self.process.ppid()
+        while pid > 0 and len(names) < MAX_PARENT_DEPTH:
+            try:
+                parent = psutil.Process(pid)
+                names.append(parent.name())
+                pid = parent.ppid()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                break
+        return names
+
+
+class ProcessClassifier:
+    """
+    Classifies processes as protected, expendable or neither.
+
+    Rules come in two layers: the active profile's rules, then the default
+    rules. The first layer with a matching rule decides, and within a layer
+    protected rules win over expendable ones, so a profile can both protect
+    an application the defaults would stop (a voice chat during a match)
+    and mark its own extra background processes as expendable. The booster
+    itself is always protected. Results are cached per (PID, start time),
+    so each process is read and matched once however often it is scanned.
+    """
+
+    def __init__(self, rules: Optional[Iterable[ProcessRule]] = None, proc_root: str = "/proc",
+                 cache_size: int = 8192):
+        self.proc_root = proc_root
+        self.default_rules = RuleSet(DEFAULT_RULES if rules is None else rules)
+        self.profile_rules = RuleSet([])
+        self.cache_size = cache_size
+        self.cache: "OrderedDict[Tuple[int, float], Optional[ProcessRule]]" = OrderedDict()
+        self.name_cache: Dict[str, Optional[ProcessRule]] = {}
+        self.lock = threading.Lock()
+
+    def set_profile_rules(self, rules: Iterable[Union[Dict, ProcessRule]] = ()):
+        """Replace the profile layer, e.g. when a game profile is applied or cleared"""
+        profile_rules = RuleSet(rule_from_dict(rule) for rule in rules)
+        with self.lock:
+            self.profile_rules = profile_rules
+            self.cache.clear()
+            self.name_cache.clear()
+
+    def _layers(self) -> List[RuleSet]:
+        return [self.profile_rules, self.default_rules]
+
+    def _decide(self, values: Callable[[str], List[str]], fields: Iterable[str]) -> Optional[ProcessRule]:
+        for layer in self._layers():
+            for category in CATEGORIES:
+                for field in fields:
+                    if field in layer.fields:
+                        rule = layer.match(category, field, values(field))
+                        if rule:
+                            return rule
+        return None
+
+    def classify(self, process: Union[int, psutil.Process]) -> Optional[ProcessRule]:
+        """The rule deciding a process's class, or None when no rule matches or the process is gone"""
+        try:
+            if not isinstance(process, psutil.Process):
+                process = psutil.Process(process)
+            key = (process.pid, process.create_time())
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, ValueError):
+            return None
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+        if process.pid == os.getpid():
+            rule = ProcessRule(PROTECTED, 'name', re.escape(process.name()), "the booster itself")
+        else:
+            facts = ProcessFacts(process, self.proc_root)
+            rule = self._decide(facts.get, FIELDS)
+        with self.lock:
+            self.cache[key] = rule
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return rule
+
+    def category(self, process: Union[int, psutil.Process]) -> Optional[str]:
+        rule = self.classify(process)
+        return rule.category if rule else None
+
+    def is_protected(self, process: Union[int, psutil.Process]) -> bool:
+        return self.category(process) == PROTECTED
+
+    def is_expendable(self, process: Union[int, psutil.Process]) -> bool:
+        return self.category(process) == EXPENDABLE
+
+    def classify_name(self, name: str) -> Optional[ProcessRule]:
+        """Classify by process name alone, e.g. for recorded traces that keep nothing else"""
+        if name in self.name_cache:
+            return self.name_cache[name]
+        rule = self._decide(lambda field: [name] if name else [], ('name',))
+        if len(self.name_cache) >= self.cache_size:
+            self.name_cache.clear()
+        self.name_cache[name] = rule
+        return rule
+
+
+# Global instance
+_process_classifier = None
+
+
+def get_process_classifier() -> ProcessClassifier:
+    """Get the global process classifier instance"""
+    global _process_classifier
+    if _process_classifier is None:
+        _process_classifier = ProcessClassifier()
+    return _process_classifier
+
+
+# Example usage
+if __name__ == "__main__":
+    classifier = get_process_classifier()
+    counts = {PROTECTED: 0, EXPENDABLE: 0, None: 0}
+    for proc in psutil.process_iter(['pid', 'name']):
+        rule = classifier.classify(proc)
+        counts[rule.category if rule else None] += 1
+        if rule and rule.category == EXPENDABLE:
+            print(f"{proc.info['name']} ({proc.info['pid']}): {rule.description} [{rule.field} {rule.pattern}]")
+    print(f"{counts[PROTECTED]} protected, {counts[EXPENDABLE]} expendable, {counts[None]} unclassified")
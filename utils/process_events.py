@@ -0,0 +1,350 @@
+"""
+Process start and exit events for Zio-Booster FPS Booster
+Turns the process table into a stream of start/exit callbacks, from the
+Linux netlink process connector when available and PID-list diffs otherwise
+"""
+import errno
+import socket
+import struct
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import psutil
+
+ProcessCallback = Callable[[int], None]
+
+# Netlink process connector constants from linux/connector.h and linux/cn_proc.h
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+NLMSG_DONE = 3
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+
+NLMSG_HEADER = struct.Struct('=IHHII')
+CN_MSG_HEADER = struct.Struct('=IIIIHH')
+PROC_EVENT_HEADER = struct.Struct('=IIQ')
+# parent pid, parent tgid, child pid, child tgid
+FORK_EVENT = struct.Struct('=IIII')
+# pid, tgid; the leading fields of both exec and exit events
+PID_TGID = struct.Struct('=II')
+
+
+class PidDiffEventSource:
+    """
+    Polls the PID list and reports the difference since the last poll.
+
+    Listing /proc is much cheaper than reading every process, so a short
+    interval is affordable; a process that starts and exits between two
+    polls is never reported. (procfs does not raise inotify events, so
+    this is the fallback when the netlink connector is unavailable.)
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.on_start: Optional[ProcessCallback] = None
+        self.on_exit: Optional[ProcessCallback] = None
+        self.known: Set[int] = set()
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def start(self, on_start: ProcessCallback, on_exit: ProcessCallback):
+        """Deliver events from a background thread; PIDs running now are not reported"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.on_start = on_start
+        self.on_exit = on_exit
+        self.known = set(psutil.pids())
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop delivering events"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def poll(self):
+        """Compare the PID list with the previous one and deliver the changes"""
+        current = set(psutil.pids())
+        for pid in current - self.known:
+            self.on_start(pid)
+        for pid in self.known - current:
+            self.on_exit(pid)
+        self.known = current
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error polling process list: {e}")
+
+
+class NetlinkProcEventSource:
+    """
+    Process events pushed by the kernel through the netlink process connector.
+
+    Only processes (thread group leaders) are reported: a fork is reported
+    as a start, an exec as a start again so listeners can re-read the new
+    executable, and an exit as an exit. Subscribing needs CAP_NET_ADMIN;
+    open() raises OSError when the connector cannot be used. If the kernel
+    drops events because the socket buffer overflowed, the known PID set is
+    resynchronized with a PID-list diff.
+    """
+
+    def __init__(self, receive_buffer: int = 4 * 1024 * 1024):
+        self.receive_buffer = receive_buffer
+        self.sock = None
+        self.on_start: Optional[ProcessCallback] = None
+        self.on_exit: Optional[ProcessCallback] = None
+        self.known: Set[int] = set()
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.events_received = 0
+        self.resyncs = 0
+
+    def _control_message(self, op: int) -> bytes:
+        payload = struct.pack('=I', op)
+        body = CN_MSG_HEADER.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        port_id = self.sock.getsockname()[0]
+        return NLMSG_HEADER.pack(NLMSG_HEADER.size + len(body), NLMSG_DONE, 0, 0, port_id) + body
+
+    def open(self):
+        """Connect and subscribe to process events"""
+        if not hasattr(socket, 'AF_NETLINK'):
+            raise OSError("netlink sockets are only available on Linux")
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer)
+            # Port id 0 lets the kernel pick one, so several sources can coexist in one process
+            sock.bind((0, CN_IDX_PROC))
+            self.sock = sock
+            sock.send(self._control_message(PROC_CN_MCAST_LISTEN))
+            sock.settimeout(0.5)
+        except OSError:
+            sock.close()
+            self.sock = None
+            raise
+
+    def start(self, on_start: ProcessCallback, on_exit: ProcessCallback):
+        """Deliver events from a background thread"""
+        if self.thread and self.thread.is_alive():
+            return
+        if self.sock is None:
+            self.open()
+        self.on_start = on_start
+        self.on_exit = on_exit
+        self.known = set(psutil.pids())
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Unsubscribe and close the socket"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+        if self.sock is not None:
+            try:
+                self.sock.send(self._control_message(PROC_CN_MCAST_IGNORE))
+            except OSError:
+                pass
+            self.sock.close()
+            self.sock = None
+
+    def parse(self, data: bytes) -> List[Tuple[str, int]]:
+        """Decode a datagram into ('start' | 'exit', pid) events"""
+        events = []
+        offset = 0
+        while offset + NLMSG_HEADER.size <= len(data):
+            length = NLMSG_HEADER.unpack_from(data, offset)[0]
+            if length < NLMSG_HEADER.size:
+                break
+            cn_offset = offset + NLMSG_HEADER.size
+            idx, val = CN_MSG_HEADER.unpack_from(data, cn_offset)[:2]
+            event_offset = cn_offset + CN_MSG_HEADER.size
+            if idx == CN_IDX_PROC and val == CN_VAL_PROC:
+                what = PROC_EVENT_HEADER.unpack_from(data, event_offset)[0]
+                body = event_offset + PROC_EVENT_HEADER.size
+                if what == PROC_EVENT_FORK:
+                    child_pid, child_tgid = FORK_EVENT.unpack_from(data, body)[2:]
+                    if child_pid == child_tgid:
+                        events.append(('start', child_pid))
+                elif what == PROC_EVENT_EXEC:
+                    pid, tgid = PID_TGID.unpack_from(data, body)
+                    if pid == tgid:
+                        events.append(('start', pid))
+                elif what == PROC_EVENT_EXIT:
+                    pid, tgid = PID_TGID.unpack_from(data, body)
+                    if pid == tgid:
+                        events.append(('exit', pid))
+            # Messages are aligned to four bytes
+            offset += (length + 3) & ~3
+        return events
+
+    def resync(self):
+        """Recover from dropped events by diffing the PID list"""
+        self.resyncs += 1
+        current = set(psutil.pids())
+        for pid in current - self.known:
+            self.on_start(pid)
+        for pid in self.known - current:
+            self.on_exit(pid)
+        self.known = current
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                data = self.sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    self.resync()
+                    continue
+                if self.stop_event.is_set():
+                    break
+                print(f"Error reading process events: {e}")
+                break
+
+            for kind, pid in self.parse(data):
+                self.events_received += 1
+                try:
+                    if kind == 'start':
+                        self.known.add(pid)
+                        self.on_start(pid)
+                    else:
+                        self.known.discard(pid)
+                        self.on_exit(pid)
+                except Exception as e:
+                    print(f"Error handling process event: {e}")
+
+
+def create_event_source(poll_interval: float = 0.1):
+    """The netlink connector when this process may use it, PID-list polling otherwise"""
+    source = NetlinkProcEventSource()
+    try:
+        source.open()
+        return source
+    except OSError as e:
+        print(f"Process connector unavailable ({e}); polling the process list every {poll_interval} s")
+        return PidDiffEventSource(interval=poll_interval)
+
+
+class ProcessEventBus:
+    """
+    Shares one event source between every listener.
+
+    The source starts with the first subscriber and stops with the last,
+    so the game detector and the process table cost one socket (or one
+    poller) between them.
+    """
+
+    def __init__(self, source_factory: Callable[[], object] = create_event_source):
+        self.source_factory = source_factory
+        self.source = None
+        self.subscribers: List[Tuple[ProcessCallback, ProcessCallback]] = []
+        self.lock = threading.Lock()
+
+    def subscribe(self, on_start: ProcessCallback, on_exit: ProcessCallback):
+        with self.lock:
+            self.subscribers.append((on_start, on_exit))
+            if self.source is None:
+                self.source = self.source_factory()
+                self.source.start(self._dispatch_start, self._dispatch_exit)
+
+    def unsubscribe(self, on_start: ProcessCallback, on_exit: ProcessCallback):
+        with self.lock:
+            if (on_start, on_exit) in self.subscribers:
+                self.subscribers.remove((on_start, on_exit))
+            if not self.subscribers and self.source is not None:
+                self.source.stop()
+                self.source = None
+
+    def _dispatch_start(self, pid: int):
+        for on_start, _ in list(self.subscribers):
+            on_start(pid)
+
+    def _dispatch_exit(self, pid: int):
+        for _, on_exit in list(self.subscribers):
+            on_exit(pid)
+
+
+# Global bus shared by all process event listeners
+process_event_bus_instance = ProcessEventBus()
+
+
+def get_process_event_bus():
+    """Get the global process event bus instance."""
+    return process_event_bus_instance
+
+
+class ProcessTable:
+    """
+    psutil.Process objects for every running process, kept current from events.
+
+    Scanning the table skips listing /proc and checking which PIDs are new
+    or reused, and each Process keeps its CPU-time baseline between scans
+    so cpu_percent() is meaningful without a blocking interval.
+    """
+
+    def __init__(self, event_bus: Optional[ProcessEventBus] = None):
+        self.event_bus = event_bus or get_process_event_bus()
+        self.table: Dict[int, psutil.Process] = {}
+        self.lock = threading.Lock()
+        self.is_running = False
+
+    def start(self):
+        """Load running processes and follow start/exit events"""
+        if self.is_running:
+            return
+        # Subscribe before listing, so a process starting in between is not missed
+        self.event_bus.subscribe(self._on_start, self._on_exit)
+        for pid in psutil.pids():
+            self._on_start(pid)
+        self.is_running = True
+
+    def stop(self):
+        """Stop following events"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self.event_bus.unsubscribe(self._on_start, self._on_exit)
+
+    def _on_start(self, pid: int):
+        try:
+            process = psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return
+        with self.lock:
+            # An exec keeps the PID; keep the existing object and its CPU baseline
+            if pid not in self.table:
+                self.table[pid] = process
+
+    def _on_exit(self, pid: int):
+        with self.lock:
+            self.table.pop(pid, None)
+
+    def processes(self) -> List[psutil.Process]:
+        """Snapshot of the tracked processes"""
+        with self.lock:
+            return list(self.table.values())
+
+    def __len__(self):
+        return len(self.table)
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    source = create_event_source()
+    print(f"Using {type(source).__name__}; watching process events for 10 s")
+    source.start(lambda pid: print(f"start {pid}"), lambda pid: print(f"exit  {pid}"))
+    time.sleep(10)
+    source.stop()
@@ -0,0 +1,165 @@
+"""
+Background process throttling for Zio-Booster FPS Booster
+Confines offending processes to a cgroup v2 group with CPU, memory and I/O
+limits instead of terminating them
+"""
+import errno
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+import psutil
+
+from .cgroups import CgroupManager
+
+THROTTLE_GROUP = "throttled"
+CPU_PERIOD_US = 100000
+# Virtual and in-memory block devices are left without I/O limits
+IGNORED_BLOCK_DEVICES = ('loop', 'ram', 'zram')
+
+
+def block_devices(sys_root: str = "/sys") -> List[str]:
+    """major:minor of the whole disks io.max can limit (it rejects partitions)"""
+    devices = []
+    block_dir = os.path.join(sys_root, 'block')
+    try:
+        names = sorted(os.listdir(block_dir))
+    except OSError:
+        return devices
+    for name in names:
+        if name.startswith(IGNORED_BLOCK_DEVICES):
+            continue
+        try:
+            with open(os.path.join(block_dir, name, 'dev')) as f:
+                devices.append(f.read().strip())
+        except OSError:
+            continue
+    return devices
+
+
+class ProcessThrottle:
+    """
+    A managed cgroup holding the processes the optimizer would have terminated.
+
+    Throttled processes keep running, so no user work is lost and nothing
+    respawns; they only get a small CPU quota (cpu.max), are pushed to
+    reclaim memory above memory.high, and read and write slowly (io.max).
+    Limits are per group, so one write covers every process in it. The
+    limits loosen while no game runs and tighten again when one starts;
+    release() returns every process to its original cgroup.
+    """
+
+    def __init__(self, cgroups: Optional[CgroupManager] = None, cpu_limit: float = 0.25,
+                 memory_high_mb: int = 1024, io_limit_mb: int = 10, sys_root: str = "/sys"):
+        self.cgroups = cgroups or CgroupManager()
+        # CPUs' worth of time the whole group may use
+        self.cpu_limit = cpu_limit
+        self.memory_high_mb = memory_high_mb
+        # Read and write bandwidth per disk, in MB/s
+        self.io_limit_mb = io_limit_mb
+        self.sys_root = sys_root
+        self.origins: Dict[int, Optional[str]] = {}
+        # Limits currently written, and limits wanted; only tighten() and loosen() change the latter
+        self.is_tight = False
+        self.want_tight = True
+        # Cleared when the kernel refuses to create the group despite the permission check
+        self.permitted = True
+
+    def available(self) -> bool:
+        """Whether processes can be throttled on this system by this user"""
+        return self.permitted and self.cgroups.writable()
+
+    @property
+    def pids(self) -> Set[int]:
+        """Processes moved into the group (some may have exited since)"""
+        return set(self.origins)
+
+    def _limits(self, tight: bool) -> Dict[str, List[str]]:
+        if tight:
+            quota = max(int(self.cpu_limit * CPU_PERIOD_US), 1000)
+            io_bytes = self.io_limit_mb * 1024 * 1024
+            return {
+                'cpu.max': [f"{quota} {CPU_PERIOD_US}"],
+                'memory.high': [str(self.memory_high_mb * 1024 * 1024)],
+                'io.max': [f"{device} rbps={io_bytes} wbps={io_bytes}" for device in block_devices(self.sys_root)],
+            }
+        return {
+            'cpu.max': [f"max {CPU_PERIOD_US}"],
+            'memory.high': ["max"],
+            'io.max': [f"{device} rbps=max wbps=max" for device in block_devices(self.sys_root)],
+        }
+
+    def _write_limits(self, tight: bool):
+        for filename, lines in self._limits(tight).items():
+            # io.max takes one device per write
+            for line in lines:
+                self.cgroups.write(THROTTLE_GROUP, filename, line)
+        self.is_tight = tight
+
+    def throttle(self, pids: Iterable[int]) -> List[int]:
+        """Move processes into the throttled group; returns the PIDs that moved"""
+        # Forget exited processes, so a reused PID can be throttled again
+        self.origins = {pid: group for pid, group in self.origins.items() if psutil.pid_exists(pid)}
+        pids = [pid for pid in pids if pid not in self.origins]
+        if not pids:
+            return []
+        if not self.available():
+            print(f"Cannot throttle processes: no writable cgroup v2 hierarchy at {self.cgroups.root}")
+            return []
+        try:
+            self.cgroups.create(THROTTLE_GROUP)
+        except OSError as e:
+            if e.errno in (errno.EACCES, errno.EPERM, errno.EROFS):
+                # Not worth retrying every cycle; available() now reports False
+                self.permitted = False
+            print(f"Could not create cgroup {THROTTLE_GROUP}: {e}")
+            return []
+        if self.is_tight != self.want_tight:
+            self._write_limits(self.want_tight)
+
+        origins = {pid: self.cgroups.current_group(pid) for pid in pids}
+        moved = self.cgroups.move(THROTTLE_GROUP, pids)
+        for pid in moved:
+            self.origins[pid] = origins[pid]
+        return moved
+
+    def loosen(self):
+        """Lift the limits while keeping the processes grouped, e.g. when the game exits"""
+        self.want_tight = False
+        if self.origins and self.is_tight:
+            self._write_limits(False)
+            print(f"Loosened limits of {len(self.origins)} throttled processes")
+
+    def tighten(self):
+        """Restore the limits, e.g. when a game starts again"""
+        self.want_tight = True
+        if self.origins and not self.is_tight:
+            self._write_limits(True)
+            print(f"Tightened limits of {len(self.origins)} throttled processes")
+
+    def release(self) -> int:
+        """Return every throttled process to its original cgroup and remove the group"""
+        if not self.origins:
+            return 0
+        self._write_limits(False)
+        returned = self.cgroups.move_back(self.origins)
+        self.origins.clear()
+        self.cgroups.remove(THROTTLE_GROUP)
+        return len(returned)
+
+
+# Example usage
+if __name__ == "__main__":
+    import subprocess
+    import tempfile
+
+    # Throttle a child process against a stand-in cgroup tree
+    root = tempfile.mkdtemp()
+    open(os.path.join(root, 'cgroup.controllers'), 'w').close()
+    throttle = ProcessThrottle(CgroupManager(root=root))
+    child = subprocess.Popen(['sleep', '5'])
+    print(f"Throttled: {throttle.throttle([child.pid])}")
+    print(f"cpu.max: {throttle.cgroups.read(THROTTLE_GROUP, 'cpu.max')}")
+    throttle.loosen()
+    print(f"cpu.max after loosening: {throttle.cgroups.read(THROTTLE_GROUP, 'cpu.max')}")
+    print(f"Released: {throttle.release()}")
+    child.kill()
@@ -0,0 +1,341 @@
+"""
+Synthetic /proc and /sys trees for Zio-Booster FPS Booster
+Builds a fake procfs/sysfs that evolves over simulated time so scans,
+snapshots and temperature readers can be benchmarked reproducibly
+"""
+import math
+import os
+import random
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import psutil
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+PROCESS_NAMES = ['chrome', 'firefox', 'steam', 'discord', 'code', 'python3', 'java', 'node',
+                 'pulseaudio', 'kworker/0:1', 'obs', 'spotify', 'game.exe', 'wine64', 'dockerd']
+
+AMBIENT_TEMP = 35.0
+# Degrees above ambient at full load, and how quickly the package follows the load
+LOAD_TEMP_RISE = 50.0
+THERMAL_TIME_CONSTANT = 8.0
+
+
+class FixtureProcess:
+    """One synthetic process and its accumulated CPU time"""
+    __slots__ = ('pid', 'ppid', 'name', 'uid', 'load', 'rss_pages', 'threads',
+                 'utime', 'stime', 'start_ticks')
+
+    def __init__(self, pid: int, ppid: int, name: str, uid: int, load: float, rss_pages: int,
+                 threads: int, start_ticks: int):
+        self.pid = pid
+        self.ppid = ppid
+        self.name = name
+        self.uid = uid
+        self.load = load
+        self.rss_pages = rss_pages
+        self.threads = threads
+        self.utime = 0.0
+        self.stime = 0.0
+        self.start_ticks = start_ticks
+
+
+class ProcfsFixture:
+    """
+    A fake procfs/sysfs tree under root.
+
+    Point readers at it with psutil.PROCFS_PATH (see activate()) and the
+    proc_root/sys_root arguments of TemperatureMonitor, PerformanceMetrics
+    and CppPerformanceOptimizer. advance() moves simulated time forward:
+    busy processes accumulate CPU time, processes exit and spawn, and the
+    thermal zones follow the load and any scheduled thermal storms.
+    """
+
+    def __init__(self, root: Optional[str] = None, process_count: int = 1000, cpu_count: int = 8,
+                 thermal_zones: int = 2, mem_total_kb: int = 16 * 1024 * 1024, busy_share: float = 0.1,
+                 churn_per_second: float = 2.0, seed: int = 1):
+        self.owns_root = root is None
+        self.root = root or tempfile.mkdtemp(prefix="zio_procfs_")
+        self.proc_root = os.path.join(self.root, "proc")
+        self.sys_root = os.path.join(self.root, "sys")
+        self.cpu_count = cpu_count
+        self.mem_total_kb = mem_total_kb
+        self.busy_share = busy_share
+        self.churn_per_second = churn_per_second
+        self.rng = random.Random(seed)
+        # Size processes so the initial table fills about half the memory and 40% of the CPUs
+        self.mean_rss_kb = mem_total_kb * 0.5 / max(1, process_count)
+        self.mean_busy_load = min(1.0, 0.4 * cpu_count / max(1.0, busy_share * process_count))
+
+        self.uptime = 1000.0
+        self.boot_time = 1700000000
+        self.next_pid = 300
+        self.processes: Dict[int, FixtureProcess] = {}
+        self.cpu_ticks = {'user': self.uptime * cpu_count * CLOCK_TICKS * 0.1, 'system': 0.0,
+                          'idle': self.uptime * cpu_count * CLOCK_TICKS * 0.9}
+        self.net_bytes = [0, 0]
+        self.disk_sectors = [0, 0]
+        self.zone_temps = [AMBIENT_TEMP + 5.0 * i for i in range(thermal_zones)]
+        self.storms: List[tuple] = []
+
+        self._build(process_count)
+
+    # Construction
+
+    def _build(self, process_count: int):
+        os.makedirs(self.proc_root, exist_ok=True)
+        os.makedirs(self.sys_root, exist_ok=True)
+        self._spawn_process('systemd', ppid=0, pid=1, load=0.0)
+        for _ in range(process_count - 1):
+            self.spawn()
+        self._write_cpu_sysfs()
+        self._write_system_files()
+        self._write_thermal_zones()
+
+    def _random_load(self) -> float:
+        if self.rng.random() < self.busy_share:
+            return min(1.0, self.rng.expovariate(1.0 / self.mean_busy_load))
+        return 0.0
+
+    def _spawn_process(self, name: str, ppid: int, pid: Optional[int] = None,
+                       load: Optional[float] = None, rss_kb: Optional[int] = None) -> FixtureProcess:
+        if pid is None:
+            pid = self.next_pid
+            self.next_pid += 1
+        if rss_kb is None:
+            # Log-normal with mean 1, so the table averages mean_rss_kb per process
+            rss_kb = int(self.mean_rss_kb * self.rng.lognormvariate(-0.72, 1.2))
+        process = FixtureProcess(
+            pid=pid, ppid=ppid, name=name, uid=self.rng.choice([0, 1000]),
+            load=self._random_load() if load is None else load,
+            rss_pages=max(1, rss_kb * 1024 // PAGE_SIZE), threads=self.rng.randint(1, 32),
+            start_ticks=int(self.uptime * CLOCK_TICKS)
+        )
+        self.processes[pid] = process
+        os.makedirs(os.path.join(self.proc_root, str(pid)), exist_ok=True)
+        self._write_process(process, static=True)
+        return process
+
+    def spawn(self, name: Optional[str] = None, load: Optional[float] = None,
+              rss_kb: Optional[int] = None) -> int:
+        """Start a process; load is the share of one CPU it keeps busy"""
+        if name is None:
+            name = self.rng.choice(PROCESS_NAMES)
+        return self._spawn_process(name, ppid=1, load=load, rss_kb=rss_kb).pid
+
+    def kill(self, pid: int):
+        """Make a process exit"""
+        if pid == 1 or self.processes.pop(pid, None) is None:
+            return
+        shutil.rmtree(os.path.join(self.proc_root, str(pid)), ignore_errors=True)
+
+    def set_load(self, pid: int, load: float):
+        """Change how busy a process is from now on"""
+        self.processes[pid].load = load
+
+    def thermal_storm(self, duration: float, extra: float = 40.0, start_in: float = 0.0):
+        """Heat every zone by up to extra degrees for duration simulated seconds"""
+        start = self.uptime + start_in
+        self.storms.append((start, start + duration, extra))
+
+    # Simulation
+
+    def advance(self, seconds: float = 1.0):
+        """Move simulated time forward and rewrite the files that changed"""
+        rng = self.rng
+        hz_seconds = CLOCK_TICKS * seconds
+
+        # Process churn
+        for _ in range(self._poisson(self.churn_per_second * seconds)):
+            candidates = list(self.processes)
+            pid = candidates[rng.randrange(len(candidates))]
+            if pid != 1:
+                self.kill(pid)
+                self.spawn()
+
+        busy = 0.0
+        for process in self.processes.values():
+            if not process.load:
+                continue
+            process.load = min(1.0, process.load * math.exp(rng.gauss(0, 0.1)))
+            process.utime += process.load * hz_seconds * 0.85
+            process.stime += process.load * hz_seconds * 0.15
+            process.rss_pages = max(1, process.rss_pages + rng.randint(-8, 8))
+            busy += process.load
+            self._write_process(process)
+        busy = min(float(self.cpu_count), busy)
+
+        self.uptime += seconds
+        self.cpu_ticks['user'] += busy * hz_seconds * 0.85
+        self.cpu_ticks['system'] += busy * hz_seconds * 0.15
+        self.cpu_ticks['idle'] += (self.cpu_count - busy) * hz_seconds
+        self.net_bytes[0] += int(rng.uniform(0, 2e6) * seconds)
+        self.net_bytes[1] += int(rng.uniform(0, 5e5) * seconds)
+        self.disk_sectors[0] += int(rng.uniform(0, 4e3) * seconds)
+        self.disk_sectors[1] += int(rng.uniform(0, 2e3) * seconds)
+
+        # The package relaxes towards a target set by the load and any active storm
+        utilisation = busy / self.cpu_count
+        extra = sum(peak for start, end, peak in self.storms if start <= self.uptime < end)
+        self.storms = [storm for storm in self.storms if storm[1] > self.uptime]
+        follow = 1.0 - math.exp(-seconds / THERMAL_TIME_CONSTANT)
+        for i, temp in enumerate(self.zone_temps):
+            target = AMBIENT_TEMP + 5.0 * i + LOAD_TEMP_RISE * utilisation + extra
+            self.zone_temps[i] = temp + (target - temp) * follow
+
+        self._write_system_files()
+        self._write_thermal_zones()
+
+    def _poisson(self, mean: float) -> int:
+        # Knuth's method; means here are small
+        limit, count, product = math.exp(-mean), 0, self.rng.random()
+        while product > limit:
+            count += 1
+            product *= self.rng.random()
+        return count
+
+    # File writers
+
+    @staticmethod
+    def _write(path: str, text: str):
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def _write_process(self, process: FixtureProcess, static: bool = False):
+        directory = os.path.join(self.proc_root, str(process.pid))
+        vsize_pages = process.rss_pages * 3
+        comm = process.name[:15]
+        # Fields after the command name, as documented in proc(5)
+        fields = ['S', process.ppid, process.pid, process.pid, 0, -1, 4194304, 100, 0, 0, 0,
+                  int(process.utime), int(process.stime), 0, 0, 20, 0, process.threads, 0,
+                  process.start_ticks, vsize_pages * PAGE_SIZE, process.rss_pages, 18446744073709551615,
+                  1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 17, process.pid % self.cpu_count, 0, 0, 0,
+                  0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        self._write(os.path.join(directory, "stat"),
+                    f"{process.pid} ({comm}) " + " ".join(str(field) for field in fields) + "\n")
+        self._write(os.path.join(directory, "statm"),
+                    f"{vsize_pages} {process.rss_pages} {process.rss_pages // 4} 1 0 {process.rss_pages} 0\n")
+        rss_kb = process.rss_pages * PAGE_SIZE // 1024
+        self._write(os.path.join(directory, "status"), (
+            f"Name:\t{comm}\nState:\tS (sleeping)\nTgid:\t{process.pid}\nPid:\t{process.pid}\n"
+            f"PPid:\t{process.ppid}\nUid:\t{process.uid}\t{process.uid}\t{process.uid}\t{process.uid}\n"
+            f"Gid:\t{process.uid}\t{process.uid}\t{process.uid}\t{process.uid}\n"
+            f"VmSize:\t{vsize_pages * PAGE_SIZE // 1024} kB\nVmRSS:\t{rss_kb} kB\n"
+            f"Threads:\t{process.threads}\nvoluntary_ctxt_switches:\t0\nnonvoluntary_ctxt_switches:\t0\n"))
+        if static:
+            self._write(os.path.join(directory, "comm"), comm + "\n")
+            self._write(os.path.join(directory, "cmdline"), f"/usr/bin/{process.name}\0")
+
+    def _write_system_files(self):
+        ticks = self.cpu_ticks
+        total_line = "cpu  {} 0 {} {} 0 0 0 0 0 0\n".format(
+            int(ticks['user']), int(ticks['system']), int(ticks['idle']))
+        per_cpu = "".join("cpu{} {} 0 {} {} 0 0 0 0 0 0\n".format(
+            i, int(ticks['user'] / self.cpu_count), int(ticks['system'] / self.cpu_count),
+            int(ticks['idle'] / self.cpu_count)) for i in range(self.cpu_count))
+        running = sum(1 for process in self.processes.values() if process.load > 0.5)
+        self._write(os.path.join(self.proc_root, "stat"), (
+            total_line + per_cpu + f"intr 0\nctxt {int(self.uptime * 5000)}\nbtime {self.boot_time}\n"
+            f"processes {self.next_pid}\nprocs_running {running + 1}\nprocs_blocked 0\n"))
+
+        used_kb = sum(process.rss_pages for process in self.processes.values()) * PAGE_SIZE // 1024
+        cached_kb = self.mem_total_kb // 8
+        free_kb = max(0, self.mem_total_kb - used_kb - cached_kb)
+        self._write(os.path.join(self.proc_root, "meminfo"), (
+            f"MemTotal:       {self.mem_total_kb} kB\nMemFree:        {free_kb} kB\n"
+            f"MemAvailable:   {free_kb + cached_kb} kB\nBuffers:        0 kB\nCached:         {cached_kb} kB\n"
+            f"SwapCached:     0 kB\nActive:         {used_kb} kB\nInactive:       {cached_kb} kB\n"
+            f"Active(file):   {cached_kb // 2} kB\nInactive(file): {cached_kb // 2} kB\n"
+            f"SwapTotal:      0 kB\nSwapFree:       0 kB\nShmem:          0 kB\n"
+            f"Slab:           0 kB\nSReclaimable:   0 kB\n"))
+
+        idle_seconds = ticks['idle'] / CLOCK_TICKS
+        self._write(os.path.join(self.proc_root, "uptime"), f"{self.uptime:.2f} {idle_seconds:.2f}\n")
+        load = sum(process.load for process in self.processes.values())
+        self._write(os.path.join(self.proc_root, "loadavg"),
+                    f"{load:.2f} {load:.2f} {load:.2f} {running + 1}/{len(self.processes)} {self.next_pid - 1}\n")
+
+        os.makedirs(os.path.join(self.proc_root, "net"), exist_ok=True)
+        received, sent = self.net_bytes
+        self._write(os.path.join(self.proc_root, "net", "dev"), (
+            "Inter-|   Receive                                                |  Transmit\n"
+            " face |bytes    packets errs drop fifo frame compressed multicast|"
+            "bytes    packets errs drop fifo colls carrier compressed\n"
+            f"  eth0: {received} {received // 1000} 0 0 0 0 0 0 {sent} {sent // 1000} 0 0 0 0 0 0\n"))
+        read, written = self.disk_sectors
+        self._write(os.path.join(self.proc_root, "diskstats"),
+                    f"   8       0 sda {read // 8} 0 {read} 0 {written // 8} 0 {written} 0 0 0 0\n")
+
+    def _write_thermal_zones(self):
+        for i, temp in enumerate(self.zone_temps):
+            zone = os.path.join(self.sys_root, "class", "thermal", f"thermal_zone{i}")
+            if not os.path.isdir(zone):
+                os.makedirs(zone)
+                self._write(os.path.join(zone, "type"), "x86_pkg_temp\n" if i == 0 else f"acpitz{i}\n")
+            self._write(os.path.join(zone, "temp"), f"{int(temp * 1000)}\n")
+
+        hwmon = os.path.join(self.sys_root, "class", "hwmon", "hwmon0")
+        if not os.path.isdir(hwmon):
+            os.makedirs(hwmon)
+            self._write(os.path.join(hwmon, "name"), "coretemp\n")
+            self._write(os.path.join(hwmon, "temp1_label"), "Package id 0\n")
+        self._write(os.path.join(hwmon, "temp1_input"), f"{int(self.zone_temps[0] * 1000)}\n")
+
+    def _write_cpu_sysfs(self):
+        cpu_root = os.path.join(self.sys_root, "devices", "system", "cpu")
+        os.makedirs(cpu_root, exist_ok=True)
+        self._write(os.path.join(cpu_root, "online"), f"0-{self.cpu_count - 1}\n")
+        for i in range(self.cpu_count):
+            cpufreq = os.path.join(cpu_root, f"cpu{i}", "cpufreq")
+            os.makedirs(cpufreq, exist_ok=True)
+            for name, value in (('scaling_cur_freq', 2400000), ('scaling_min_freq', 800000),
+                                ('scaling_max_freq', 4800000), ('cpuinfo_max_freq', 4800000),
+                                ('scaling_governor', 'powersave')):
+                self._write(os.path.join(cpufreq, name), f"{value}\n")
+
+    # Integration
+
+    @contextmanager
+    def activate(self):
+        """Make psutil read processes and system counters from this tree"""
+        previous = psutil.PROCFS_PATH
+        psutil.PROCFS_PATH = self.proc_root
+        psutil.process_iter.cache_clear()
+        try:
+            yield self
+        finally:
+            psutil.PROCFS_PATH = previous
+            psutil.process_iter.cache_clear()
+
+    def cleanup(self):
+        """Delete the tree if this fixture created it"""
+        if self.owns_root:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+    from utils.temperature_monitor import TemperatureMonitor
+
+    with ProcfsFixture(process_count=10000, cpu_count=16) as fixture:
+        monitor = TemperatureMonitor(sys_root=fixture.sys_root)
+        with fixture.activate():
+            start = time.perf_counter()
+            processes = monitor.get_process_temperatures()
+            print(f"Scanned {len(processes)} synthetic processes in {time.perf_counter() - start:.2f} s")
+
+        fixture.thermal_storm(duration=20, extra=40)
+        for second in range(0, 40, 5):
+            print(f"t={second:2d}s  CPU temperature {monitor.get_cpu_temperature():.1f} C")
+            fixture.advance(5)
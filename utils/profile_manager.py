@@ -1,12 +1,17 @@
 """
 Game Profile Management for Zio-Booster FPS Booster
 """
+import atexit
 import json
 import os
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+import threading
+import time
+from typing import Dict, List, Optional, Set
+from dataclasses import dataclass, asdict, field, fields
 from datetime import datetime
 
+from .profile_store import SqliteProfileStore, is_sqlite_path, normalize_path, path_keys, write_json_atomic
+
 @dataclass
 class GameProfile:
     """Represents a game profile with custom optimization settings"""
@@ -18,6 +23,22 @@ class GameProfile:
     auto_optimize: bool = True
     created_at: str = ""
     last_used: str = ""
+    # Scheduling while the profile is active; None or an empty list leaves the setting alone
+    cpu_affinity: List[int] = field(default_factory=list)
+    nice: Optional[int] = None
+    ionice_class: Optional[str] = None  # 'realtime', 'best-effort' or 'idle'
+    ionice_level: Optional[int] = None  # 0 (highest) to 7
+    cpu_weight: Optional[int] = None  # cgroup v2 weights of the game group, 1 to 10000
+    io_weight: Optional[int] = None
+    # The same settings for background applications while the game runs
+    background_affinity: List[int] = field(default_factory=list)
+    background_nice: Optional[int] = None
+    background_ionice_class: Optional[str] = None
+    background_cpu_weight: Optional[int] = None
+    background_io_weight: Optional[int] = None
+    # Extra process_classifier rules while the profile is active, checked before the defaults:
+    # {'category': 'protected' or 'expendable', 'field': 'name', 'exe', 'cgroup', 'uid' or 'parent', 'pattern': regex}
+    process_rules: List[Dict] = field(default_factory=list)
     
     def __post_init__(self):
         if not self.created_at:
@@ -25,44 +46,147 @@ class GameProfile:
         if not self.last_used:
             self.last_used = self.created_at
 
+
+def profile_from_dict(data: Dict) -> GameProfile:
+    """Convert a stored dict back to a GameProfile; fields added since it was written keep their defaults"""
+    known_fields = {f.name for f in fields(GameProfile)}
+    return GameProfile(**{key: value for key, value in data.items() if key in known_fields})
+
+
+class ProfileIndex:
+    """Game profiles keyed by normalized executable path and by basename"""
+
+    def __init__(self, profiles: List[GameProfile] = ()):
+        self.by_exe: Dict[str, GameProfile] = {}
+        self.by_name: Dict[str, GameProfile] = {}
+        for profile in profiles:
+            if not profile.executable_path:
+                continue
+            self.by_exe[normalize_path(profile.executable_path)] = profile
+            for key in path_keys(profile.executable_path):
+                # The first profile claiming a basename keeps it
+                self.by_name.setdefault(key, profile)
+
+    def match(self, exe: str, name: str) -> Optional[GameProfile]:
+        """Profile for a process: exact executable path first, then basename"""
+        profile = self.by_exe.get(normalize_path(exe)) if exe else None
+        if profile:
+            return profile
+        for candidate in (exe, name):
+            if not candidate:
+                continue
+            for key in path_keys(candidate):
+                profile = self.by_name.get(key)
+                if profile:
+                    return profile
+        return None
+
+
 class ProfileManager:
     """Manages game profiles and their optimization settings"""
     
-    def __init__(self, profiles_file: str = "game_profiles.json"):
-        self.profiles_file = profiles_file
+    def __init__(self, profiles_file: Optional[str] = None, save_delay: float = 1.0,
+                 max_save_delay: float = 10.0):
+        # ZIO_PROFILES=profiles.db switches to an indexed SQLite store for large shared libraries
+        self.profiles_file = profiles_file or os.environ.get('ZIO_PROFILES', "game_profiles.json")
+        self.store = SqliteProfileStore(self.profiles_file) if is_sqlite_path(self.profiles_file) else None
+        # Every profile for a JSON file; with a store, the profiles read so far
         self.profiles: Dict[str, GameProfile] = {}
+        # Names created, changed or deleted since the last save, written one by one to a store
+        self.pending: Set[str] = set()
+        self.index = None
+        self.index_version = None
+        # Bumped on every change so indexes built from the profiles know to rebuild
+        self.version = 0
+        # Changes are written once they have been quiet for save_delay seconds,
+        # or max_save_delay seconds after the first unsaved change
+        self.save_delay = save_delay
+        self.max_save_delay = max_save_delay
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.first_change = 0.0
+        self.last_change = 0.0
+        self.save_timer = None
         self.load_profiles()
+        # Pending changes still reach the disk when the program exits
+        atexit.register(self.flush)
     
     def load_profiles(self):
-        """Load game profiles from file"""
+        """Load game profiles from file; a store is read lazily, profile by profile"""
+        if self.store is not None:
+            with self.lock:
+                self.profiles.clear()
+                self.pending.clear()
+                self.version += 1
+            return
         if os.path.exists(self.profiles_file):
             try:
                 with open(self.profiles_file, 'r') as f:
                     data = json.load(f)
                     for name, profile_data in data.items():
-                        # Convert dict back to GameProfile
-                        profile = GameProfile(
-                            name=profile_data['name'],
-                            executable_path=profile_data['executable_path'],
-                            temp_threshold=profile_data['temp_threshold'],
-                            optimize_network=profile_data['optimize_network'],
-                            high_priority=profile_data['high_priority'],
-                            auto_optimize=profile_data['auto_optimize'],
-                            created_at=profile_data['created_at'],
-                            last_used=profile_data['last_used']
-                        )
-                        self.profiles[name] = profile
+                        self.profiles[name] = profile_from_dict(profile_data)
+                self.version += 1
             except Exception as e:
                 print(f"Error loading profiles: {e}")
     
     def save_profiles(self):
-        """Save game profiles to file"""
-        try:
-            data = {name: asdict(profile) for name, profile in self.profiles.items()}
-            with open(self.profiles_file, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving profiles: {e}")
+        """Save game profiles now; a crash never leaves the file or the store half-written"""
+        with self.lock:
+            self.dirty = False
+            try:
+                if self.store is not None:
+                    # Only the changed profiles, in one transaction
+                    self.store.write(
+                        upserts=[asdict(self.profiles[name]) for name in self.pending if name in self.profiles],
+                        deletes=[name for name in self.pending if name not in self.profiles])
+                    self.pending.clear()
+                else:
+                    # A temporary file is renamed over the old one
+                    write_json_atomic(self.profiles_file,
+                                      {name: asdict(profile) for name, profile in self.profiles.items()})
+            except Exception as e:
+                print(f"Error saving profiles: {e}")
+                self.dirty = True
+    
+    def _schedule_save(self, name: str):
+        """Mark a profile changed and write the changes after the debounce delay"""
+        with self.lock:
+            self.pending.add(name)
+            now = time.monotonic()
+            if not self.dirty:
+                self.first_change = now
+            self.dirty = True
+            self.last_change = now
+            # One timer at a time; it re-arms itself while changes keep coming
+            if self.save_timer is None:
+                self._start_timer(self.save_delay)
+    
+    def _start_timer(self, delay: float):
+        self.save_timer = threading.Timer(delay, self._on_save_timer)
+        self.save_timer.daemon = True
+        self.save_timer.start()
+    
+    def _on_save_timer(self):
+        with self.lock:
+            self.save_timer = None
+            if not self.dirty:
+                return
+            now = time.monotonic()
+            quiet = now - self.last_change
+            waited = now - self.first_change
+            if quiet < self.save_delay and waited < self.max_save_delay:
+                self._start_timer(min(self.save_delay - quiet, self.max_save_delay - waited))
+                return
+            self.save_profiles()
+    
+    def flush(self):
+        """Write pending changes now"""
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if self.dirty:
+                self.save_profiles()
     
     def create_profile(self, name: str, executable_path: str = "", **kwargs) -> GameProfile:
         """Create a new game profile"""
@@ -71,46 +195,89 @@ class ProfileManager:
             executable_path=executable_path,
             **kwargs
         )
-        self.profiles[name] = profile
-        self.save_profiles()
+        with self.lock:
+            self.profiles[name] = profile
+            self.version += 1
+            self._schedule_save(name)
         return profile
     
     def get_profile(self, name: str) -> Optional[GameProfile]:
         """Get a game profile by name"""
-        return self.profiles.get(name)
+        with self.lock:
+            profile = self.profiles.get(name)
+            if profile is None and self.store is not None and name not in self.pending:
+                data = self.store.get(name)
+                if data is not None:
+                    profile = self.profiles[name] = profile_from_dict(data)
+            return profile
     
     def update_profile(self, name: str, **kwargs) -> bool:
         """Update a game profile with new settings"""
-        if name in self.profiles:
-            profile = self.profiles[name]
+        with self.lock:
+            profile = self.get_profile(name)
+            if profile is None:
+                return False
             for key, value in kwargs.items():
                 if hasattr(profile, key):
                     setattr(profile, key, value)
+            self.version += 1
+            self._schedule_save(name)
+            return True
+    
+    def mark_used(self, name: str) -> bool:
+        """Record that a profile was just applied"""
+        with self.lock:
+            profile = self.get_profile(name)
+            if profile is None:
+                return False
             profile.last_used = datetime.now().isoformat()
-            self.save_profiles()
+            self._schedule_save(name)
             return True
-        return False
     
     def delete_profile(self, name: str) -> bool:
         """Delete a game profile"""
-        if name in self.profiles:
+        with self.lock:
+            if self.get_profile(name) is None:
+                return False
             del self.profiles[name]
-            self.save_profiles()
+            self.version += 1
+            self._schedule_save(name)
             return True
-        return False
+    
+    def profile_names(self) -> List[str]:
+        """Names of all game profiles, without loading them"""
+        with self.lock:
+            if self.store is None:
+                return list(self.profiles)
+            self.flush()
+            return self.store.names()
     
     def list_profiles(self) -> List[GameProfile]:
-        """List all game profiles"""
-        return list(self.profiles.values())
+        """List all game profiles; with a store this reads the whole library"""
+        with self.lock:
+            if self.store is None:
+                return list(self.profiles.values())
+            return [profile for profile in map(self.get_profile, self.profile_names()) if profile]
+    
+    def match_executable(self, exe: str, name: str = "") -> Optional[GameProfile]:
+        """Profile for a process by executable path, then by basename with or without extension"""
+        with self.lock:
+            if self.store is not None:
+                # Unsaved changes must be visible to the indexed lookup
+                if self.dirty:
+                    self.flush()
+                profile_name = self.store.match(exe, name)
+                return self.get_profile(profile_name) if profile_name else None
+            if self.index_version != self.version:
+                self.index = ProfileIndex(self.list_profiles())
+                self.index_version = self.version
+            return self.index.match(exe, name)
     
     def apply_profile_settings(self, name: str, optimizer) -> bool:
         """Apply optimization settings from a profile to the system optimizer"""
-        profile = self.get_profile(name)
-        if profile:
-            # Update optimizer settings based on profile
-            # For now, we'll just return True to indicate the profile exists
-            # In a real implementation, we'd modify the optimizer's behavior
-            return True
+        if self.get_profile(name):
+            # The optimizer activates the profile and applies its scheduling policies
+            return optimizer.apply_profile(name)
         return False
 
 # Example usage
@@ -129,4 +296,7 @@ if __name__ == "__main__":
     )
     
     print(f"Created profile: {profile.name}")
-    print(f"All profiles: {[p.name for p in pm.list_profiles()]}")
\ No newline at end of file
+    print(f"All profiles: {[p.name for p in pm.list_profiles()]}")
+    
+    # Changes are written in the background; flush() writes them right away
+    pm.flush()
\ No newline at end of file
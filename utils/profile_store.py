@@ -0,0 +1,176 @@
+"""
+SQLite profile store for Zio-Booster FPS Booster
+Keeps large shared profile libraries in an embedded database indexed by
+name and executable, and converts to and from the game_profiles.json format
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Profile files with these extensions are opened as SQLite stores
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name TEXT PRIMARY KEY,
+    exe_key TEXT NOT NULL,
+    base_key TEXT NOT NULL,
+    stem_key TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_exe ON profiles (exe_key);
+CREATE INDEX IF NOT EXISTS profiles_base ON profiles (base_key);
+CREATE INDEX IF NOT EXISTS profiles_stem ON profiles (stem_key);
+"""
+
+
+def normalize_path(path: str) -> str:
+    """Compare paths case-insensitively with forward slashes, as profiles come from Windows too"""
+    return path.replace('\\', '/').lower() if path else ""
+
+
+def path_keys(path_or_name: str) -> Tuple[str, str]:
+    """Lowercase basename with and without its extension"""
+    base = normalize_path(path_or_name).rsplit('/', 1)[-1]
+    return base, os.path.splitext(base)[0]
+
+
+def write_json_atomic(path: str, data, indent: Optional[int] = 2):
+    """Write JSON through a temporary file renamed over path, so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file private; keep the permissions the target had
+        mode = os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def is_sqlite_path(path: str) -> bool:
+    return path.lower().endswith(SQLITE_EXTENSIONS)
+
+
+class SqliteProfileStore:
+    """
+    Profiles as JSON documents in one SQLite table.
+
+    Opening the store reads nothing but the schema; each profile is parsed
+    when asked for, and executable lookups use the indexes, so startup and
+    matching cost do not grow with the library. Profiles are plain dicts in
+    the game_profiles.json layout.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Shared by the UI, the event thread and the save timer; calls are serialized by the lock
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _row(data: Dict) -> Tuple[str, str, str, str, str]:
+        exe = data.get('executable_path', "")
+        base, stem = path_keys(exe) if exe else ("", "")
+        return data['name'], normalize_path(exe), base, stem, json.dumps(data)
+
+    def get(self, name: str) -> Optional[Dict]:
+        with self.lock:
+            row = self.connection.execute("SELECT data FROM profiles WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def names(self) -> List[str]:
+        with self.lock:
+            return [row[0] for row in self.connection.execute("SELECT name FROM profiles ORDER BY rowid")]
+
+    def all(self) -> Dict[str, Dict]:
+        """Every profile; parses the whole library"""
+        with self.lock:
+            rows = self.connection.execute("SELECT name, data FROM profiles ORDER BY rowid").fetchall()
+        return {name: json.loads(data) for name, data in rows}
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def match(self, exe: str, name: str) -> Optional[str]:
+        """
+        Name of the profile for a process: exact executable path first, then
+        basename with or without extension; the oldest profile wins a tie
+        """
+        with self.lock:
+            if exe:
+                row = self.connection.execute(
+                    "SELECT name FROM profiles WHERE exe_key = ? ORDER BY rowid LIMIT 1",
+                    (normalize_path(exe),)).fetchone()
+                if row:
+                    return row[0]
+            for candidate in (exe, name):
+                if not candidate:
+                    continue
+                for key in path_keys(candidate):
+                    if not key:
+                        continue
+                    row = self.connection.execute(
+                        "SELECT name FROM profiles WHERE base_key = ? OR stem_key = ? ORDER BY rowid LIMIT 1",
+                        (key, key)).fetchone()
+                    if row:
+                        return row[0]
+        return None
+
+    def write(self, upserts: Iterable[Dict] = (), deletes: Iterable[str] = ()):
+        """Apply changes in one transaction"""
+        with self.lock, self.connection:
+            self.connection.executemany("DELETE FROM profiles WHERE name = ?", [(name,) for name in deletes])
+            # An update keeps the row, and with it the profile's place in tie-breaks
+            self.connection.executemany(
+                "INSERT INTO profiles (name, exe_key, base_key, stem_key, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET exe_key = excluded.exe_key, base_key = excluded.base_key, "
+                "stem_key = excluded.stem_key, data = excluded.data",
+                [self._row(data) for data in upserts])
+
+    def import_json(self, path: str) -> int:
+        """Add or replace the profiles of a game_profiles.json file"""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        self.write(upserts=data.values())
+        return len(data)
+
+    def export_json(self, path: str) -> int:
+        """Write every profile to a file in the game_profiles.json format"""
+        data = self.all()
+        write_json_atomic(path, data)
+        return len(data)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert between game_profiles.json and a SQLite profile store")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("json_file", help="profiles in the game_profiles.json format")
+    parser.add_argument("database", help="SQLite store, e.g. profiles.db")
+    options = parser.parse_args()
+
+    store = SqliteProfileStore(options.database)
+    if options.action == "import":
+        print(f"Imported {store.import_json(options.json_file)} profiles into {options.database}")
+    else:
+        print(f"Exported {store.export_json(options.json_file)} profiles to {options.json_file}")
+    store.close()
@@ -0,0 +1,209 @@
+"""
+Scheduling policies from game profiles for Zio-Booster FPS Booster
+Applies a profile's CPU affinity, nice, ionice and cgroup v2 weights to the
+game and to background processes, and rolls every change back together
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import psutil
+
+from .cgroups import CgroupManager
+from .profile_manager import GameProfile
+
+GAME_GROUP = "game"
+BACKGROUND_GROUP = "background"
+
+# ionice classes by the names profiles use; psutil only defines them on Linux
+IONICE_CLASSES = {
+    'realtime': getattr(psutil, 'IOPRIO_CLASS_RT', None),
+    'best-effort': getattr(psutil, 'IOPRIO_CLASS_BE', None),
+    'idle': getattr(psutil, 'IOPRIO_CLASS_IDLE', None),
+}
+
+
+def has_background_scheduling(profile: GameProfile) -> bool:
+    """Whether a profile sets a policy for background processes"""
+    return any(value not in (None, []) for value in (
+        profile.background_affinity, profile.background_nice, profile.background_ionice_class,
+        profile.background_cpu_weight, profile.background_io_weight))
+
+
+def has_scheduling(profile: Optional[GameProfile]) -> bool:
+    """Whether a profile sets any scheduling policy"""
+    if profile is None:
+        return False
+    return (any(value not in (None, []) for value in (
+        profile.cpu_affinity, profile.nice, profile.ionice_class, profile.cpu_weight, profile.io_weight))
+        or has_background_scheduling(profile))
+
+
+class ProfileScheduler:
+    """
+    Applies the scheduling settings of one profile at a time.
+
+    Every change records how to undo it, so rollback() returns affinity,
+    nice and ionice values, cgroup weights and cgroup membership to what
+    they were before the profile, newest change first. Processes added
+    later (a game spawning helpers) join the same batch and roll back
+    with it.
+    """
+
+    def __init__(self, cgroups: Optional[CgroupManager] = None):
+        self.cgroups = cgroups or CgroupManager()
+        self.profile: Optional[GameProfile] = None
+        self.undo: List[Callable[[], None]] = []
+        self.scheduled_pids: Set[int] = set()
+        self.groups_prepared: Set[str] = set()
+        self.failures = 0
+
+    @property
+    def is_active(self) -> bool:
+        return self.profile is not None
+
+    def apply(self, profile: GameProfile, game_pids: Iterable[int],
+              background_pids: Iterable[int] = ()) -> Dict[str, int]:
+        """Roll back the previous profile, then apply this one to the given processes"""
+        self.rollback()
+        self.profile = profile
+        self.add_game_pids(game_pids)
+        self.add_background_pids(background_pids)
+        summary = {'changes': len(self.undo), 'processes': len(self.scheduled_pids), 'failures': self.failures}
+        print(f"Applied scheduling for profile {profile.name}: {summary['changes']} changes "
+              f"across {summary['processes']} processes, {summary['failures']} failed")
+        return summary
+
+    def add_game_pids(self, pids: Iterable[int]) -> int:
+        """Apply the active profile's game settings to processes not scheduled yet"""
+        profile = self.profile
+        if profile is None:
+            return 0
+        return self._apply_batch(pids, profile.cpu_affinity, profile.nice, profile.ionice_class,
+                                 profile.ionice_level, GAME_GROUP, profile.cpu_weight, profile.io_weight)
+
+    def add_background_pids(self, pids: Iterable[int]) -> int:
+        """Apply the active profile's background settings to processes not scheduled yet"""
+        profile = self.profile
+        if profile is None:
+            return 0
+        return self._apply_batch(pids, profile.background_affinity, profile.background_nice,
+                                 profile.background_ionice_class, None, BACKGROUND_GROUP,
+                                 profile.background_cpu_weight, profile.background_io_weight)
+
+    def rollback(self):
+        """Undo every change of the active profile, newest first"""
+        while self.undo:
+            action = self.undo.pop()
+            try:
+                action()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            except Exception as e:
+                print(f"Error rolling back scheduling change: {e}")
+        self.profile = None
+        self.scheduled_pids.clear()
+        self.groups_prepared.clear()
+        self.failures = 0
+
+    def _apply_batch(self, pids: Iterable[int], affinity: List[int], nice: Optional[int],
+                     ionice_class: Optional[str], ionice_level: Optional[int],
+                     group: str, cpu_weight: Optional[int], io_weight: Optional[int]) -> int:
+        new_pids = [pid for pid in pids if pid not in self.scheduled_pids]
+        if not new_pids:
+            return 0
+        self.scheduled_pids.update(new_pids)
+        changes = len(self.undo)
+
+        cpus = self._valid_cpus(affinity)
+        ioclass = IONICE_CLASSES.get(ionice_class) if ionice_class else None
+        if ionice_class and ioclass is None:
+            print(f"Unsupported ionice class: {ionice_class}")
+        for pid in new_pids:
+            try:
+                proc = psutil.Process(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            if cpus:
+                self._change(proc, lambda p: p.cpu_affinity(), lambda p, v: p.cpu_affinity(v), cpus)
+            if nice is not None:
+                self._change(proc, lambda p: p.nice(), lambda p, v: p.nice(v), nice)
+            if ioclass is not None:
+                # Only realtime and best-effort take a level
+                level = ionice_level if ioclass in (IONICE_CLASSES['realtime'], IONICE_CLASSES['best-effort']) else None
+                self._change(proc, lambda p: tuple(p.ionice()), lambda p, v: p.ionice(*v), (ioclass, level))
+
+        if cpu_weight is not None or io_weight is not None:
+            self._apply_group(group, new_pids, cpu_weight, io_weight)
+        return len(self.undo) - changes
+
+    def _valid_cpus(self, cpus: List[int]) -> List[int]:
+        if not cpus:
+            return []
+        count = psutil.cpu_count() or 1
+        valid = sorted({cpu for cpu in cpus if 0 <= cpu < count})
+        if len(valid) != len(set(cpus)):
+            print(f"Ignoring CPUs outside 0-{count - 1} in affinity {cpus}")
+        return valid
+
+    def _change(self, proc: psutil.Process, get: Callable, set_: Callable, value):
+        """Set one process attribute, recording how to restore it"""
+        try:
+            original = get(proc)
+            if original == value:
+                return
+            set_(proc, value)
+            self.undo.append(lambda: set_(proc, original))
+        except psutil.NoSuchProcess:
+            pass
+        except (psutil.AccessDenied, ValueError, OSError) as e:
+            self.failures += 1
+            print(f"Could not change scheduling of PID {proc.pid}: {e}")
+
+    def _apply_group(self, group: str, pids: List[int], cpu_weight: Optional[int], io_weight: Optional[int]):
+        """Set the group's weights on first use, then move the processes into it"""
+        if not self.cgroups.available():
+            self.failures += 1
+            print(f"cgroup v2 is not mounted at {self.cgroups.root}; skipping {group} group weights")
+            return
+        if group not in self.groups_prepared:
+            try:
+                created = self.cgroups.create(group)
+            except OSError as e:
+                self.failures += 1
+                print(f"Could not create cgroup {group}: {e}")
+                return
+            self.groups_prepared.add(group)
+            if created:
+                # Runs after the processes have moved back out
+                self.undo.append(lambda: self.cgroups.remove(group))
+            for filename, value in (('cpu.weight', cpu_weight), ('io.weight', io_weight)):
+                if value is None:
+                    continue
+                weight = min(max(int(value), 1), 10000)
+                original = None if created else self.cgroups.read(group, filename)
+                text = f"default {weight}" if filename == 'io.weight' else weight
+                if not self.cgroups.write(group, filename, text):
+                    self.failures += 1
+                elif original is not None:
+                    self.undo.append(lambda f=filename, v=original: self.cgroups.write(group, f, v))
+
+        origins = {pid: self.cgroups.current_group(pid) for pid in pids}
+        moved = self.cgroups.move(group, pids)
+        if moved:
+            self.undo.append(lambda: self.cgroups.move_back({pid: origins[pid] for pid in moved}))
+
+
+# Example usage
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    # Apply a profile to this process against a stand-in cgroup tree
+    root = tempfile.mkdtemp()
+    open(os.path.join(root, 'cgroup.controllers'), 'w').close()
+    scheduler = ProfileScheduler(CgroupManager(root=root))
+    profile = GameProfile(name="Demo", cpu_affinity=[0], nice=5, ionice_class='best-effort', ionice_level=7,
+                          cpu_weight=800, io_weight=500)
+    scheduler.apply(profile, [os.getpid()])
+    print(f"cpu.weight: {scheduler.cgroups.read(GAME_GROUP, 'cpu.weight')}, nice: {psutil.Process().nice()}")
+    scheduler.rollback()
+    print(f"After rollback: nice {psutil.Process().nice()}, game group exists: {scheduler.cgroups.exists(GAME_GROUP)}")
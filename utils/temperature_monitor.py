@@ -6,19 +6,82 @@ import psutil
 import platform
 import subprocess
 import os
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
+
+
+def read_thermal_zone_temperature(sys_root: str = "/sys", zones: int = 10) -> Optional[float]:
+    """Temperature of the first readable thermal zone under sys_root, in Celsius"""
+    for i in range(zones):
+        thermal_path = f"{sys_root}/class/thermal/thermal_zone{i}/temp"
+        if os.path.exists(thermal_path):
+            with open(thermal_path, 'r') as f:
+                return float(f.read().strip()) / 1000.0  # Convert from millidegrees
+    return None
+
+
+def temperature_score(cpu_percent: float, rss: int) -> float:
+    """
+    Simulated temperature of a process from its resource usage, 0-100.
+    Direct process temperature isn't available, so CPU usage is the main proxy
+    """
+    return round(min(100, cpu_percent * 0.7 + (rss / 1024 / 1024 / 100) * 0.3), 2)
+
+
+class ProcessRecord:
+    """
+    One row of a process scan.
+
+    Slotted, so a scan of thousands of processes keeps six fields per row
+    instead of a dict and a memory_info tuple.
+    """
+    __slots__ = ('pid', 'name', 'cpu_percent', 'memory_percent', 'rss', 'temperature_score')
+
+    def __init__(self, pid: int, name: str, cpu_percent: float = 0.0, memory_percent: float = 0.0,
+                 rss: int = 0, temperature_score: float = 0.0):
+        self.pid = pid
+        self.name = name
+        self.cpu_percent = cpu_percent
+        self.memory_percent = memory_percent
+        self.rss = rss  # resident memory in bytes
+        self.temperature_score = temperature_score
+
+    @classmethod
+    def from_info(cls, info: Dict[str, Any]) -> 'ProcessRecord':
+        """Build a scored record from psutil.Process.as_dict() output"""
+        cpu_percent = info.get('cpu_percent') or 0.0
+        memory_info = info.get('memory_info')
+        rss = memory_info.rss if memory_info else 0
+        return cls(info['pid'], info.get('name') or '', cpu_percent, info.get('memory_percent') or 0.0,
+                   rss, temperature_score(cpu_percent, rss))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self):
+        return f"ProcessRecord(pid={self.pid}, name={self.name!r}, temperature_score={self.temperature_score})"
+
 
 class TemperatureMonitor:
     """Class to monitor system temperatures and related metrics"""
     
-    def __init__(self):
+    def __init__(self, sys_root: str = "/sys", process_table=None):
         self.system = platform.system()
+        # Optional process_events.ProcessTable scanned instead of listing every process
+        self.process_table = process_table
+        # psutil always reads the live /sys, so a redirected root is read directly
+        self.sys_root = sys_root
     
     def get_cpu_temperature(self) -> Optional[float]:
         """
         Get CPU temperature if available
         Returns temperature in Celsius or None if not available
         """
+        if self.sys_root != "/sys":
+            try:
+                return read_thermal_zone_temperature(self.sys_root)
+            except Exception:
+                return None
+        
         try:
             # Try psutil sensors (works on some systems)
             temps = psutil.sensors_temperatures()
@@ -42,12 +105,9 @@ class TemperatureMonitor:
         if self.system == "Linux":
             try:
                 # Try to read from thermal zone
-                for i in range(10):  # Check first 10 thermal zones
-                    thermal_path = f"/sys/class/thermal/thermal_zone{i}/temp"
-                    if os.path.exists(thermal_path):
-                        with open(thermal_path, 'r') as f:
-                            temp = float(f.read().strip()) / 1000.0  # Convert from millidegrees
-                            return temp
+                temp = read_thermal_zone_temperature(self.sys_root)
+                if temp is not None:
+                    return temp
             except Exception:
                 pass
         
@@ -73,35 +133,30 @@ class TemperatureMonitor:
         
         return None
     
-    def get_process_temperatures(self) -> List[Dict]:
+    def get_process_temperatures(self) -> List[ProcessRecord]:
         """
-        Get temperature-related information for processes
+        Get temperature-related information for processes, hottest first
         Since direct process temperature isn't available, we'll use CPU usage as a proxy
         """
+        attrs = ['pid', 'name', 'cpu_percent', 'memory_percent', 'memory_info']
         processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'memory_info']):
+        if self.process_table is not None and self.process_table.is_running:
+            candidates, prefetched = self.process_table.processes(), False
+        else:
+            # process_iter reads the attributes itself, so they are not read a second time below
+            candidates, prefetched = psutil.process_iter(attrs), True
+        for proc in candidates:
             try:
-                pinfo = proc.as_dict(attrs=['pid', 'name', 'cpu_percent', 'memory_percent', 'memory_info'])
-                
-                # Calculate a "temperature score" based on resource usage
-                # Higher CPU usage = higher temperature
-                cpu_usage = pinfo['cpu_percent'] or 0
-                memory_usage = (pinfo['memory_info'].rss / 1024 / 1024) if pinfo['memory_info'] else 0  # MB
-                
-                # Create a simulated temperature based on resource usage
-                temp_score = min(100, cpu_usage * 0.7 + (memory_usage / 100) * 0.3)
-                
-                pinfo['temperature_score'] = round(temp_score, 2)
-                processes.append(pinfo)
-                
+                info = proc.info if prefetched else proc.as_dict(attrs=attrs)
+                processes.append(ProcessRecord.from_info(info))
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 continue
         
         # Sort by temperature score (highest first)
-        processes.sort(key=lambda x: x['temperature_score'], reverse=True)
+        processes.sort(key=lambda record: record.temperature_score, reverse=True)
         return processes
     
-    def get_highest_temperature_processes(self, limit: int = 10) -> List[Dict]:
+    def get_highest_temperature_processes(self, limit: int = 10) -> List[ProcessRecord]:
         """Get the processes with the highest temperature scores"""
         all_processes = self.get_process_temperatures()
         return all_processes[:limit]
@@ -0,0 +1,236 @@
+"""
+Per-thread analysis of the game for Zio-Booster FPS Booster
+Samples /proc/<pid>/task/*/stat to find the threads doing most of the work
+(usually the main and render threads) and gives them their own cores
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .cpu_topology import CpuTopology, read_cpu_topology
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+@dataclass
+class ThreadSample:
+    """One thread's CPU use between two samples"""
+    tid: int
+    name: str
+    share: float  # CPUs' worth of time, e.g. 0.9 for 90% of one core
+    cpu: int  # CPU it last ran on
+
+
+def read_thread_times(pid: int, proc_root: str = "/proc") -> Dict[int, Tuple[str, int, int]]:
+    """tid -> (name, utime + stime in clock ticks, last CPU) for every thread of a process"""
+    threads = {}
+    task_dir = os.path.join(proc_root, str(pid), 'task')
+    try:
+        tids = os.listdir(task_dir)
+    except OSError:
+        return threads
+    for tid in tids:
+        try:
+            with open(os.path.join(task_dir, tid, 'stat')) as f:
+                data = f.read()
+        except OSError:
+            continue
+        name = data[data.find('(') + 1:data.rfind(')')]
+        fields = data[data.rfind(')') + 2:].split()
+        try:
+            threads[int(tid)] = (name, int(fields[11]) + int(fields[12]), int(fields[36]))
+        except (IndexError, ValueError):
+            continue
+    return threads
+
+
+class ThreadSampler:
+    """CPU share of each thread of one process, from the difference between two reads"""
+
+    def __init__(self, pid: int, proc_root: str = "/proc"):
+        self.pid = pid
+        self.proc_root = proc_root
+        self.previous: Dict[int, Tuple[str, int, int]] = {}
+        self.previous_time = 0.0
+
+    def sample(self) -> List[ThreadSample]:
+        """Threads sorted by CPU share since the previous call; the first call only sets the baseline"""
+        now = time.monotonic()
+        current = read_thread_times(self.pid, self.proc_root)
+        elapsed = now - self.previous_time
+        samples = []
+        if self.previous and elapsed > 0:
+            for tid, (name, ticks, cpu) in current.items():
+                before = self.previous.get(tid)
+                # A thread born since the last read counts from zero
+                delta = ticks - (before[1] if before else 0)
+                samples.append(ThreadSample(tid, name, delta / CLOCK_TICKS / elapsed, cpu))
+            samples.sort(key=lambda sample: sample.share, reverse=True)
+        self.previous, self.previous_time = current, now
+        return samples
+
+
+class HotThreadPinner:
+    """
+    Gives the game's hottest threads a core each, at a low re-check rate.
+
+    Every interval seconds the game's threads are sampled; up to
+    hot_count threads using at least min_share of a CPU are pinned to
+    separate physical cores and reniced, and the other game threads are
+    kept off those cores. A thread that cools down gets its original
+    affinity and priority back. Between checks nothing is read, so the
+    cost is one pass over /proc/<pid>/task per interval.
+    """
+
+    def __init__(self, interval: float = 5.0, hot_count: int = 2, min_share: float = 0.25,
+                 nice: int = -15, allowed_cpus: Optional[Callable[[], List[int]]] = None,
+                 proc_root: str = "/proc", sys_root: str = "/sys"):
+        self.interval = interval
+        self.hot_count = hot_count
+        self.min_share = min_share
+        self.nice = nice
+        # CPUs the game may use, e.g. its core partition; defaults to the game's own affinity
+        self.allowed_cpus = allowed_cpus
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self.topology: Optional[CpuTopology] = None
+        self.pid: Optional[int] = None
+        self.sampler: Optional[ThreadSampler] = None
+        self.pinned: Dict[int, int] = {}  # tid -> CPU
+        self.original: Dict[int, Tuple[Set[int], int]] = {}  # tid -> (affinity, nice)
+        self.base_cpus: List[int] = []
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, pid: int) -> bool:
+        """Begin sampling a game process"""
+        if not hasattr(os, 'sched_setaffinity'):
+            return False
+        self.stop()
+        try:
+            self.base_cpus = sorted(os.sched_getaffinity(pid))
+        except OSError:
+            return False
+        if self.topology is None:
+            self.topology = read_cpu_topology(self.sys_root)
+        self.pid = pid
+        self.sampler = ThreadSampler(pid, self.proc_root)
+        self.sampler.sample()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Stop sampling and restore the pinned threads"""
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
+        self.thread = None
+        with self.lock:
+            self._restore_all()
+        self.pid = None
+        self.sampler = None
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            if not os.path.exists(os.path.join(self.proc_root, str(self.pid))):
+                break
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error checking game threads: {e}")
+
+    def _cpus(self) -> List[int]:
+        allowed = self.allowed_cpus() if self.allowed_cpus else None
+        return sorted(allowed) if allowed else self.base_cpus
+
+    def _core_cpus(self, cpus: List[int]) -> List[List[int]]:
+        """The given CPUs grouped by physical core, performance cores first"""
+        wanted = set(cpus)
+        cores = []
+        for core in sorted(self.topology.cores, key=lambda core: (not core.performance, core.cpus)):
+            core_cpus = [cpu for cpu in core.cpus if cpu in wanted]
+            if core_cpus:
+                cores.append(core_cpus)
+        return cores
+
+    def check(self) -> List[ThreadSample]:
+        """Sample the threads once and move the pins to the current hot threads"""
+        with self.lock:
+            samples = self.sampler.sample() if self.sampler else []
+            hot = [sample for sample in samples[:self.hot_count] if sample.share >= self.min_share]
+            cores = self._core_cpus(self._cpus())
+            # Keep at least one core for the other threads
+            hot = hot[:max(len(cores) - 1, 0)]
+            if not hot:
+                self._restore_all()
+                return samples
+            for tid in list(self.pinned):
+                if tid not in {sample.tid for sample in hot}:
+                    self._restore(tid)
+
+            previous = dict(self.pinned)
+            dedicated = set()
+            for sample, core in zip(hot, cores):
+                cpu = core[0]
+                # Siblings stay idle, so the hot thread has the whole core
+                dedicated.update(core)
+                self._pin(sample.tid, {cpu}, self.nice)
+                self.pinned[sample.tid] = cpu
+            rest = {cpu for cpu in self._cpus() if cpu not in dedicated}
+            for tid in read_thread_times(self.pid, self.proc_root):
+                if tid not in self.pinned:
+                    self._pin(tid, rest, None)
+            if self.pinned == previous:
+                return samples
+            labels = ", ".join(f"{'main' if sample.tid == self.pid else sample.name} ({sample.share:.0%}) -> CPU {self.pinned[sample.tid]}"
+                               for sample in hot)
+            print(f"Pinned hot game threads: {labels}")
+            return samples
+
+    def _pin(self, tid: int, cpus: Set[int], nice: Optional[int]):
+        try:
+            if tid not in self.original:
+                self.original[tid] = (os.sched_getaffinity(tid), os.getpriority(os.PRIO_PROCESS, tid))
+            if os.sched_getaffinity(tid) != cpus:
+                os.sched_setaffinity(tid, cpus)
+            if nice is not None:
+                # On Linux a thread ID renices just that thread
+                os.setpriority(os.PRIO_PROCESS, tid, nice)
+        except OSError:
+            pass
+
+    def _restore(self, tid: int):
+        self.pinned.pop(tid, None)
+        original = self.original.pop(tid, None)
+        if original is None:
+            return
+        try:
+            os.sched_setaffinity(tid, original[0])
+            os.setpriority(os.PRIO_PROCESS, tid, original[1])
+        except OSError:
+            pass
+
+    def _restore_all(self):
+        for tid in list(self.original):
+            self._restore(tid)
+
+
+# Example usage
+if __name__ == "__main__":
+    import sys
+
+    # Show the hottest threads of a process, e.g. python -m utils.thread_sampler <pid>
+    sampler = ThreadSampler(int(sys.argv[1]) if len(sys.argv) > 1 else os.getpid())
+    sampler.sample()
+    time.sleep(2)
+    for sample in sampler.sample()[:5]:
+        print(f"{sample.tid:>8} {sample.name:<16} {sample.share:6.1%}  CPU {sample.cpu}")
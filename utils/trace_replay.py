@@ -0,0 +1,368 @@
+"""
+Trace record and replay for Zio-Booster FPS Booster
+Records sampler streams to a compact binary file and replays them through
+the optimization policy faster than real time, with actions simulated
+"""
+import itertools
+import math
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+from .optimization_policy import (DEFAULT_THRESHOLDS, is_unnecessary_process, recommend,
+                                  select_cpu_intensive_processes, select_high_temperature_processes)
+from .temperature_monitor import ProcessRecord, temperature_score
+
+MAGIC = b'ZIOTRACE1\n'
+
+# System sample fields, stored as float32 after a float64 timestamp; NaN marks a missing value
+SYSTEM_FIELDS = ('cpu_percent', 'memory_percent', 'cpu_temp', 'disk_percent', 'net_sent_mb',
+                 'net_recv_mb', 'process_count', 'available_memory_gb', 'free_disk_gb')
+
+SYSTEM_RECORD = struct.Struct('<d9f')
+PROCESS_HEAD = struct.Struct('<dI')
+# pid, name id, cpu %, memory %, RSS MB, temperature score
+PROCESS_ROW = struct.Struct('<IIffff')
+NAME_HEAD = struct.Struct('<IH')
+
+KIND_SYSTEM = b'S'
+KIND_PROCESSES = b'P'
+KIND_NAME = b'N'
+
+# Policy parameters swept by replay: the AI thresholds plus the temperature kill rule
+DEFAULT_POLICY = {**DEFAULT_THRESHOLDS, 'temp_threshold': 70.0, 'terminate_count': 3, 'cycle_interval': 30.0}
+
+
+def read_trace_sample() -> Dict[str, Any]:
+    """Non-blocking system sample carrying every field the policy looks at"""
+    from .metrics_sampler import read_system_metrics
+    sample = read_system_metrics()
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+    network = psutil.net_io_counters()
+    sample.update({
+        'disk_percent': disk.percent,
+        'net_sent_mb': network.bytes_sent / 1024 / 1024,
+        'net_recv_mb': network.bytes_recv / 1024 / 1024,
+        'process_count': len(psutil.pids()),
+        'available_memory_gb': memory.available / 1024 / 1024 / 1024,
+        'free_disk_gb': disk.free / 1024 / 1024 / 1024
+    })
+    return sample
+
+
+def _number(value) -> float:
+    return float('nan') if value is None else float(value)
+
+
+class TraceRecorder:
+    """
+    Appends sampler messages to a trace file.
+
+    Pass it as MetricsSampler(recorder=...) or call record() directly.
+    Process names are written once and referenced by id afterwards, and
+    only the process_limit hottest rows of each process sample are kept.
+    """
+
+    def __init__(self, path: str, process_limit: int = 50):
+        self.path = path
+        self.process_limit = process_limit
+        self.names: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+        self.records = 0
+
+    def record(self, kind: str, timestamp: float, data: Any):
+        """Record one sampler message; kinds other than system and processes are ignored"""
+        if kind == 'system':
+            self.record_system(timestamp, data)
+        elif kind == 'processes':
+            self.record_processes(timestamp, data)
+
+    def record_system(self, timestamp: float, sample: Dict[str, Any]):
+        values = [_number(sample.get(field)) for field in SYSTEM_FIELDS]
+        with self.lock:
+            self.file.write(KIND_SYSTEM + SYSTEM_RECORD.pack(timestamp, *values))
+            self.records += 1
+
+    def record_processes(self, timestamp: float, processes: List[ProcessRecord]):
+        rows = processes[:self.process_limit]
+        with self.lock:
+            parts = []
+            for proc in rows:
+                name = proc.name
+                if name not in self.names:
+                    name_id = self.names[name] = len(self.names)
+                    encoded = name.encode('utf-8')[:65535]
+                    parts.append(KIND_NAME + NAME_HEAD.pack(name_id, len(encoded)) + encoded)
+            parts.append(KIND_PROCESSES + PROCESS_HEAD.pack(timestamp, len(rows)))
+            for proc in rows:
+                parts.append(PROCESS_ROW.pack(proc.pid, self.names[proc.name], proc.cpu_percent,
+                                              proc.memory_percent, proc.rss / 1024 / 1024, proc.temperature_score))
+            self.file.write(b''.join(parts))
+            self.records += 1
+
+    def flush(self):
+        with self.lock:
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_trace(path: str) -> List[Tuple[str, float, Any]]:
+    """
+    Load a trace as (kind, timestamp, data) events. System data is a dict
+    of SYSTEM_FIELDS with None for missing values; process data is a list
+    of ProcessRecord rows, hottest first, like TemperatureMonitor output.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a Zio-Booster trace")
+
+    events = []
+    names: Dict[int, str] = {}
+    offset = len(MAGIC)
+    end = len(data)
+    # A killed recorder leaves a record cut off anywhere; stop at the last complete one
+    while offset < end:
+        kind = data[offset:offset + 1]
+        body = offset + 1
+        if kind == KIND_SYSTEM:
+            if body + SYSTEM_RECORD.size > end:
+                break
+            values = SYSTEM_RECORD.unpack_from(data, body)
+            offset = body + SYSTEM_RECORD.size
+            sample = {field: (None if math.isnan(value) else value)
+                      for field, value in zip(SYSTEM_FIELDS, values[1:])}
+            events.append(('system', values[0], sample))
+        elif kind == KIND_PROCESSES:
+            if body + PROCESS_HEAD.size > end:
+                break
+            timestamp, count = PROCESS_HEAD.unpack_from(data, body)
+            rows_start = body + PROCESS_HEAD.size
+            rows_end = rows_start + count * PROCESS_ROW.size
+            if rows_end > end:
+                break
+            rows = []
+            for pid, name_id, cpu, memory, rss_mb, score in PROCESS_ROW.iter_unpack(data[rows_start:rows_end]):
+                rows.append(ProcessRecord(pid, names.get(name_id, ''), cpu, memory, int(rss_mb * 1024 * 1024), score))
+            offset = rows_end
+            events.append(('processes', timestamp, rows))
+        elif kind == KIND_NAME:
+            if body + NAME_HEAD.size > end:
+                break
+            name_id, length = NAME_HEAD.unpack_from(data, body)
+            name_start = body + NAME_HEAD.size
+            if name_start + length > end:
+                break
+            names[name_id] = data[name_start:name_start + length].decode('utf-8', 'replace')
+            offset = name_start + length
+        else:
+            # Garbage where a record kind should be
+            break
+    return events
+
+
+def record_trace(path: str, duration: float, interval: float = 2.0, process_interval: float = 10.0,
+                 process_limit: int = 50) -> int:
+    """Record this machine's sampler stream for duration seconds; returns the record count"""
+    from .metrics_sampler import MetricsSampler
+    from .temperature_monitor import TemperatureMonitor
+
+    with TraceRecorder(path, process_limit=process_limit) as recorder:
+        sampler = MetricsSampler(interval=interval, system_reader=read_trace_sample,
+                                 process_reader=TemperatureMonitor().get_process_temperatures,
+                                 process_interval=process_interval, recorder=recorder)
+        sampler.sample_processes = True
+        sampler.start()
+        try:
+            time.sleep(duration)
+        finally:
+            sampler.stop()
+        return recorder.records
+
+
+def _features(timestamp: float, sample: Dict[str, Any]) -> Optional[List[float]]:
+    """AI feature vector for a system sample, or None if a field is missing"""
+    values = [sample.get(field) for field in ('cpu_percent', 'memory_percent', 'disk_percent', 'net_sent_mb',
+                                              'net_recv_mb', 'process_count', 'available_memory_gb',
+                                              'free_disk_gb')]
+    if any(value is None for value in values):
+        return None
+    return values + [timestamp % 86400]
+
+
+def replay(events: Iterable[Tuple[str, float, Any]], policy: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    Run recorded samples through the optimization policy with simulated actions.
+
+    An optimization cycle runs every cycle_interval seconds of trace time,
+    using the latest system and process samples. Terminated processes stay
+    dead for the rest of the replay; the CPU they would have used is
+    estimated from their share in later process samples.
+    """
+    policy = {**DEFAULT_POLICY, **(policy or {})}
+    killed: Dict[int, str] = {}
+    stats = {'cycles': 0, 'processes_killed': 0, 'temperature_kills': 0, 'ai_kills': 0,
+             'reniced': 0, 'cache_drops': 0, 'temp_cleanups': 0, 'high_recommendations': 0,
+             'cpu_seconds_reclaimed': 0.0}
+
+    latest_sample = None
+    latest_processes: List[ProcessRecord] = []
+    last_process_time = None
+    next_cycle = None
+    first_time = last_time = None
+
+    for kind, timestamp, data in events:
+        if first_time is None:
+            first_time = timestamp
+        last_time = timestamp
+
+        if kind == 'processes':
+            # CPU the killed processes would have used since the previous process sample
+            if last_process_time is not None and killed:
+                elapsed = timestamp - last_process_time
+                stats['cpu_seconds_reclaimed'] += sum(
+                    row.cpu_percent for row in data if killed.get(row.pid) == row.name) / 100.0 * elapsed
+            last_process_time = timestamp
+            latest_processes = [row for row in data if killed.get(row.pid) != row.name]
+            continue
+
+        if kind != 'system':
+            continue
+        latest_sample = (timestamp, data)
+        if next_cycle is not None and timestamp < next_cycle:
+            continue
+        next_cycle = timestamp + policy['cycle_interval']
+        stats['cycles'] += 1
+
+        features = _features(*latest_sample)
+        if features is not None:
+            for rec in recommend(features, policy):
+                if rec['severity'] != 'high':
+                    continue
+                stats['high_recommendations'] += 1
+                if rec['action'] == 'reduce_process_priority':
+                    stats['reniced'] += len(select_cpu_intensive_processes(latest_processes))
+                elif rec['action'] == 'clear_cache_and_swap':
+                    stats['cache_drops'] += 1
+                elif rec['action'] == 'clean_temp_files':
+                    stats['temp_cleanups'] += 1
+                elif rec['action'] == 'identify_unnecessary_processes':
+                    victims = [row for row in latest_processes if is_unnecessary_process(row.name)]
+                    for row in victims:
+                        killed[row.pid] = row.name
+                    stats['ai_kills'] += len(victims)
+
+        victims = select_high_temperature_processes(
+            [row for row in latest_processes if killed.get(row.pid) != row.name],
+            policy['temp_threshold'], int(policy['terminate_count']))
+        for row in victims:
+            killed[row.pid] = row.name
+        stats['temperature_kills'] += len(victims)
+        latest_processes = [row for row in latest_processes if killed.get(row.pid) != row.name]
+
+    stats['processes_killed'] = stats['temperature_kills'] + stats['ai_kills']
+    stats['unique_processes_killed'] = len(killed)
+    stats['trace_seconds'] = (last_time - first_time) if first_time is not None else 0.0
+    stats['cpu_seconds_per_kill'] = (stats['cpu_seconds_reclaimed'] / stats['processes_killed']
+                                     if stats['processes_killed'] else 0.0)
+    return stats
+
+
+def sweep(events: List[Tuple[str, float, Any]], grid: Dict[str, List], base: Optional[Dict] = None) -> List[Dict]:
+    """
+    Replay every combination of the parameter values in grid, e.g.
+    {'temp_threshold': [50, 70, 90], 'cpu_high': [70, 80, 90]}. Results
+    are sorted by CPU reclaimed per process killed, best first.
+    """
+    names = list(grid)
+    results = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        stats = replay(events, {**(base or {}), **params})
+        results.append({'params': params, **stats})
+    results.sort(key=lambda result: (result['cpu_seconds_per_kill'], -result['processes_killed']), reverse=True)
+    return results
+
+
+def synthetic_trace(path: str, hours: float = 2.0, interval: float = 2.0, process_interval: float = 10.0,
+                    seed: int = 1) -> int:
+    """Write a trace of a simulated gaming session, for trying the replay without recording"""
+    import random
+    rng = random.Random(seed)
+    names = ['game.exe', 'chrome', 'discord', 'spotify', 'obs', 'steamwebhelper', 'code', 'python3', 'systemd']
+    processes = [{'pid': 1000 + i, 'name': names[i % len(names)], 'base': rng.expovariate(0.1)}
+                 for i in range(60)]
+
+    start = 1700000000.0
+    with TraceRecorder(path) as recorder:
+        next_processes = start
+        for step in range(int(hours * 3600 / interval)):
+            timestamp = start + step * interval
+            # Load comes in waves, as in matches separated by menus
+            wave = 0.5 + 0.5 * math.sin(step * interval / 600.0)
+            rows = []
+            for proc in processes:
+                cpu = max(0.0, proc['base'] * wave + rng.gauss(0, 2))
+                rss = int(proc['base'] * 40 * 1024 * 1024)
+                rows.append(ProcessRecord(proc['pid'], proc['name'], cpu, rss / (16 * 1024 ** 3) * 100, rss,
+                                          temperature_score(cpu, rss)))
+            rows.sort(key=lambda row: row.temperature_score, reverse=True)
+            recorder.record_system(timestamp, {
+                'cpu_percent': min(100.0, sum(row.cpu_percent for row in rows) / 8),
+                'memory_percent': 60 + 30 * wave + rng.gauss(0, 2),
+                'cpu_temp': 45 + 40 * wave, 'disk_percent': 70.0, 'net_sent_mb': step * 0.1,
+                'net_recv_mb': step * 0.5, 'process_count': 180 + int(60 * wave),
+                'available_memory_gb': 6 - 4 * wave, 'free_disk_gb': 120.0
+            })
+            if timestamp >= next_processes:
+                recorder.record_processes(timestamp, rows)
+                next_processes = timestamp + process_interval
+        return recorder.records
+
+
+# Example usage
+if __name__ == "__main__":
+    import argparse
+    import os
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Record and replay Zio-Booster sampler traces")
+    parser.add_argument('trace', nargs='?', help="Trace file; a synthetic one is generated when omitted")
+    parser.add_argument('--record', type=float, metavar='SECONDS', help="Record this machine for SECONDS first")
+    args = parser.parse_args()
+
+    path = args.trace or os.path.join(tempfile.gettempdir(), "zio_synthetic.trace")
+    if args.record:
+        print(f"Recording {args.record:.0f} s to {path}...")
+        record_trace(path, args.record)
+    elif not args.trace:
+        synthetic_trace(path)
+
+    start = time.perf_counter()
+    events = read_trace(path)
+    print(f"Loaded {len(events)} events ({os.path.getsize(path)} bytes) in {time.perf_counter() - start:.3f} s")
+
+    grid = {'temp_threshold': [50, 60, 70, 80, 90], 'terminate_count': [1, 3, 5],
+            'cpu_high': [70, 80, 90], 'process_count_high': [200, 250]}
+    start = time.perf_counter()
+    results = sweep(events, grid)
+    print(f"Replayed {len(results)} policies in {time.perf_counter() - start:.2f} s")
+    for result in results[:5]:
+        print(f"{result['params']}: {result['cpu_seconds_reclaimed']:.0f} CPU-s reclaimed, "
+              f"{result['processes_killed']} kills, {result['reniced']} renices")
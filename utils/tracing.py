@@ -0,0 +1,247 @@
+"""
+Lightweight tracing for Zio-Booster FPS Booster
+Records timed spans into per-thread ring buffers and exports them as Chrome trace JSON
+"""
+import functools
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Callable, Dict, List, Optional
+
+_enabled = False
+_capacity = 65536
+_buffers: List['_ThreadBuffer'] = []
+_buffers_lock = threading.Lock()
+# Buffers kept at once; beyond this the oldest ones of finished threads are dropped first
+_max_buffers = 256
+_local = threading.local()
+_generation = 0
+
+
+class _ThreadBuffer:
+    """
+    Fixed-size ring of finished spans owned by one thread.
+
+    Only the owning thread writes, so recording needs no lock; the dump
+    reads a snapshot of the slots, which may miss a span written at the
+    same moment.
+    """
+    __slots__ = ('thread', 'thread_id', 'thread_name', 'slots', 'index', 'generation')
+
+    def __init__(self, capacity: int, generation: int):
+        thread = threading.current_thread()
+        self.thread = weakref.ref(thread)
+        self.thread_id = threading.get_ident()
+        self.thread_name = thread.name
+        self.slots = [None] * capacity
+        self.index = 0
+        self.generation = generation
+
+    def record(self, entry: tuple):
+        slots = self.slots
+        slots[self.index % len(slots)] = entry
+        self.index += 1
+
+    def retired(self) -> bool:
+        """True once nothing will write here again: the thread ended or tracing restarted"""
+        thread = self.thread()
+        return thread is None or not thread.is_alive() or self.generation != _generation
+
+    def entries(self) -> List[tuple]:
+        """Recorded spans, oldest first"""
+        slots = list(self.slots)
+        index = self.index
+        if index <= len(slots):
+            return slots[:index]
+        start = index % len(slots)
+        return slots[start:] + slots[:start]
+
+
+def _buffer() -> _ThreadBuffer:
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is None or buffer.generation != _generation:
+        buffer = _ThreadBuffer(_capacity, _generation)
+        _local.buffer = buffer
+        with _buffers_lock:
+            _buffers.append(buffer)
+            if len(_buffers) > _max_buffers:
+                _drop_oldest_buffer()
+    return buffer
+
+
+def _drop_oldest_buffer():
+    """Make room for a new buffer; caller holds _buffers_lock"""
+    for index, buffer in enumerate(_buffers):
+        if buffer.retired():
+            del _buffers[index]
+            return
+    del _buffers[0]
+
+
+class _NullSpan:
+    """Shared no-op span returned while tracing is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'category', 'args', 'start')
+
+    def __init__(self, name: str, category: str, args: Optional[Dict]):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter_ns()
+        _buffer().record((self.name, self.category, self.start, end - self.start, self.args))
+        return False
+
+
+def span(name: str, category: str = "zio", **args):
+    """Time a with-block, e.g. with span("ai.train_model"):"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args or None)
+
+
+def traced(func: Optional[Callable] = None, *, name: Optional[str] = None, category: str = "zio"):
+    """Decorator recording a span per call; usable as @traced or @traced(category="cpp")"""
+    def decorate(function: Callable) -> Callable:
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _buffer().record((span_name, category, start, time.perf_counter_ns() - start, None))
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+def enable(capacity: int = 65536):
+    """Start recording spans; each thread keeps at most capacity of them"""
+    global _enabled, _capacity, _generation
+    with _buffers_lock:
+        _capacity = capacity
+        # Threads start new buffers of the new capacity; spans already recorded are kept until exported
+        _generation += 1
+    _enabled = True
+
+
+def disable():
+    """Stop recording spans; recorded spans are kept until clear()"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def clear():
+    """Drop every recorded span"""
+    global _generation
+    with _buffers_lock:
+        _generation += 1
+        _buffers.clear()
+
+
+def collect_events() -> List[Dict]:
+    """Recorded spans as Chrome trace events; buffers no thread will write again are released"""
+    pid = os.getpid()
+    events = []
+    with _buffers_lock:
+        buffers = list(_buffers)
+        _buffers[:] = [buffer for buffer in _buffers if not buffer.retired()]
+    for buffer in buffers:
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': buffer.thread_id,
+                       'args': {'name': buffer.thread_name}})
+        for span_name, category, start, duration, args in buffer.entries():
+            event = {'name': span_name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': buffer.thread_id,
+                     'ts': start / 1000.0, 'dur': duration / 1000.0}
+            if args:
+                event['args'] = args
+            events.append(event)
+    return events
+
+
+def dump_chrome_trace(path: str = "zio_trace.json") -> int:
+    """Write recorded spans to a file loadable in chrome://tracing or Perfetto; returns the span count"""
+    events = collect_events()
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, default=str)
+    return sum(1 for event in events if event['ph'] == 'X')
+
+
+def benchmark_overhead(calls: int = 200000) -> Dict[str, float]:
+    """Nanoseconds added per call by span() and @traced, disabled and enabled"""
+    was_enabled = _enabled
+
+    def plain():
+        return None
+
+    decorated = traced(plain, name="benchmark")
+
+    def measure(body) -> float:
+        start = time.perf_counter_ns()
+        body()
+        return (time.perf_counter_ns() - start) / calls
+
+    def run_plain():
+        for _ in range(calls):
+            plain()
+
+    def run_span():
+        for _ in range(calls):
+            with span("benchmark"):
+                plain()
+
+    def run_decorated():
+        for _ in range(calls):
+            decorated()
+
+    results = {}
+    try:
+        baseline = measure(run_plain)
+        disable()
+        results['disabled_span_ns'] = measure(run_span) - baseline
+        results['disabled_traced_ns'] = measure(run_decorated) - baseline
+        enable()
+        results['enabled_span_ns'] = measure(run_span) - baseline
+        results['enabled_traced_ns'] = measure(run_decorated) - baseline
+    finally:
+        clear()
+        if not was_enabled:
+            disable()
+    return results
+
+
+# Tracing can be switched on for a whole run from the environment
+if os.environ.get('ZIO_TRACE'):
+    enable()
+
+
+# Example usage
+if __name__ == "__main__":
+    for label, cost in benchmark_overhead().items():
+        print(f"{label}: {cost:.0f} ns per call")
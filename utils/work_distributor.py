@@ -0,0 +1,443 @@
+"""
+Local work distribution for Zio-Booster FPS Booster
+Spreads CPU-heavy analysis across worker processes, optionally reached over localhost sockets
+"""
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from functools import partial
+from multiprocessing.connection import Client, Listener, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+def _serve(conn):
+    """Run (index, function, chunk) requests from the coordinator until told to stop"""
+    try:
+        # Analysis work should never compete with the game for CPU
+        os.nice(10)
+    except (OSError, AttributeError):
+        pass
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        index, function, chunk = message
+        try:
+            conn.send((index, True, function(chunk)))
+        except Exception as e:
+            conn.send((index, False, repr(e)))
+    conn.close()
+
+
+def _worker_context():
+    """
+    Start workers from a clean interpreter rather than by forking the booster,
+    whose threads (sampler, monitor, Tk) may hold locks at fork time
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def _socket_worker_main(port_conn, authkey: bytes):
+    """Entry point of a worker that stands in for a remote node"""
+    listener = Listener(('127.0.0.1', 0), authkey=authkey)
+    port_conn.send(listener.address[1])
+    port_conn.close()
+    conn = listener.accept()
+    listener.close()
+    _serve(conn)
+
+
+class WorkerProcess:
+    """A worker process and the connection used to reach it"""
+
+    def __init__(self, node_id: str, kind: str = "local", authkey: Optional[bytes] = None):
+        self.node_id = node_id
+        self.kind = kind
+        self.authkey = authkey or os.urandom(16)
+        self.process = None
+        self.conn = None
+        self.tasks_completed = 0
+        self.restarts = 0
+        self.start()
+
+    def start(self):
+        """Start the worker process and connect to it"""
+        context = _worker_context()
+        if self.kind == "socket":
+            port_parent, port_child = context.Pipe(duplex=False)
+            self.process = context.Process(target=_socket_worker_main, args=(port_child, self.authkey), daemon=True)
+            self.process.start()
+            port_child.close()
+            if not port_parent.poll(10):
+                self.process.terminate()
+                raise RuntimeError(f"Worker {self.node_id} did not report its port")
+            port = port_parent.recv()
+            port_parent.close()
+            self.conn = Client(('127.0.0.1', port), authkey=self.authkey)
+        else:
+            parent, child = context.Pipe()
+            self.process = context.Process(target=_serve, args=(child,), daemon=True)
+            self.process.start()
+            child.close()
+            self.conn = parent
+
+    def stop(self, timeout: float = 1.0):
+        """Ask the worker to exit, terminating it if it does not"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.conn.close()
+
+    def restart(self):
+        """Kill the worker (e.g. a straggler) and start a fresh one"""
+        self.process.terminate()
+        self.process.join(1.0)
+        self.conn.close()
+        self.restarts += 1
+        self.start()
+
+    def describe(self) -> Dict:
+        """Describe the worker in the edge node format"""
+        return {
+            'id': self.node_id,
+            'type': 'local_process' if self.kind == "local" else 'localhost_socket',
+            'pid': self.process.pid,
+            'status': 'available' if self.process.is_alive() else 'down',
+            'tasks_completed': self.tasks_completed,
+            'restarts': self.restarts
+        }
+
+
+def partition_items(items: Sequence, partitions: int) -> List[Sequence]:
+    """Split items into at most the given number of contiguous, similarly sized chunks"""
+    partitions = max(1, min(partitions, len(items)))
+    size, remainder = divmod(len(items), partitions)
+    chunks = []
+    start = 0
+    for i in range(partitions):
+        end = start + size + (1 if i < remainder else 0)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
+
+
+class LocalWorkDistributor:
+    """
+    Runs a function over partitions of a work list on a set of worker processes.
+
+    Chunks are handed out as workers become free, so fast workers take more
+    of the load. When the deadline passes, or once enough of the partitions
+    have finished, workers still busy are treated as stragglers: they are
+    terminated and restarted, and their partitions are left out of the merge.
+
+    Jobs with fewer than serial_below items run in the calling process:
+    shipping chunks to workers has a fixed cost per run and a cost per item,
+    and small jobs finish sooner than that overhead is paid back.
+    benchmark_distribution() measures where the pool starts to pay off.
+    """
+
+    def __init__(self, local_workers: Optional[int] = None, socket_workers: int = 0, serial_below: int = 50000):
+        cpu_count = os.cpu_count() or 1
+        self.local_workers = local_workers if local_workers is not None else max(1, cpu_count // 2)
+        self.socket_workers = socket_workers
+        self.serial_below = serial_below
+        self.workers: List[WorkerProcess] = []
+        self.lock = threading.Lock()
+        self.stats = {'tasks': 0, 'serial_tasks': 0, 'partitions_completed': 0, 'stragglers_cancelled': 0,
+                      'errors': 0}
+
+    def start(self):
+        """Start the worker processes"""
+        if self.workers:
+            return
+        for i in range(self.local_workers):
+            self.workers.append(WorkerProcess(f"local_{i:03d}", "local"))
+        for i in range(self.socket_workers):
+            self.workers.append(WorkerProcess(f"socket_{i:03d}", "socket"))
+
+    def shutdown(self):
+        """Stop every worker process"""
+        with self.lock:
+            for worker in self.workers:
+                worker.stop()
+            self.workers = []
+
+    def nodes(self) -> List[Dict]:
+        """Describe the available workers"""
+        return [worker.describe() for worker in self.workers]
+
+    @staticmethod
+    def _worker_failed(worker: WorkerProcess, index: int, chunks: List[Sequence], pending: deque,
+                       idle: List[WorkerProcess], retried: set, errors: List[str]):
+        """The worker died; restart it and give its partition one more chance"""
+        worker.restart()
+        idle.append(worker)
+        if index not in retried:
+            retried.add(index)
+            pending.append((index, chunks[index]))
+        else:
+            errors.append(f"partition {index}: worker {worker.node_id} died")
+
+    def run(self, function: Callable, items: Sequence, merge: Optional[Callable[[List], Any]] = None,
+            partitions: Optional[int] = None, deadline: Optional[float] = None,
+            min_fraction: float = 1.0, serial_below: Optional[int] = None) -> Dict:
+        """
+        Run function over partitions of items and merge the partial results.
+
+        function and merge must be picklable (module-level functions or partials).
+        deadline is an absolute time.time() value. With min_fraction below 1.0
+        the run finishes as soon as that share of partitions is done.
+        serial_below overrides the instance's size limit for this run.
+        """
+        serial_below = self.serial_below if serial_below is None else serial_below
+        if len(items) < serial_below:
+            return self._run_serial(function, items, merge)
+
+        with self.lock:
+            self.start()
+            start_time = time.time()
+            chunks = partition_items(items, partitions or len(self.workers) * 4)
+            needed = max(1, int(len(chunks) * min_fraction + 0.999999))
+
+            pending = deque(enumerate(chunks))
+            idle = list(self.workers)
+            busy: Dict[Any, tuple] = {}
+            results: Dict[int, Any] = {}
+            errors = []
+            retried = set()
+
+            while (pending or busy) and len(results) < needed:
+                while idle and pending:
+                    worker = idle.pop()
+                    index, chunk = pending.popleft()
+                    try:
+                        worker.conn.send((index, function, chunk))
+                    except (BrokenPipeError, OSError):
+                        self._worker_failed(worker, index, chunks, pending, idle, retried, errors)
+                        continue
+                    busy[worker.conn] = (worker, index)
+
+                timeout = None if deadline is None else deadline - time.time()
+                if timeout is not None and timeout <= 0:
+                    break
+
+                for conn in wait(list(busy), timeout):
+                    worker, index = busy.pop(conn)
+                    try:
+                        _, ok, value = conn.recv()
+                    except (EOFError, OSError):
+                        self._worker_failed(worker, index, chunks, pending, idle, retried, errors)
+                        continue
+
+                    worker.tasks_completed += 1
+                    idle.append(worker)
+                    if ok:
+                        results[index] = value
+                    else:
+                        errors.append(f"partition {index}: {value}")
+
+            # Anything still running is a straggler
+            stragglers = list(busy.values())
+            for worker, _ in stragglers:
+                worker.restart()
+
+            ordered = [results[i] for i in sorted(results)]
+            merged = merge(ordered) if merge else ordered
+
+            self.stats['tasks'] += 1
+            self.stats['partitions_completed'] += len(results)
+            self.stats['stragglers_cancelled'] += len(stragglers)
+            self.stats['errors'] += len(errors)
+
+            return {
+                'result': merged,
+                'partitions': len(chunks),
+                'completed': len(results),
+                'cancelled': len(stragglers),
+                'errors': errors,
+                'complete': len(results) == len(chunks),
+                'distributed': True,
+                'duration': time.time() - start_time
+            }
+
+    def _run_serial(self, function: Callable, items: Sequence, merge: Optional[Callable[[List], Any]]) -> Dict:
+        """Run a small job in the calling process, reporting it like a distributed one"""
+        start_time = time.time()
+        results, errors = [], []
+        try:
+            results.append(function(items))
+        except Exception as e:
+            errors.append(f"partition 0: {e!r}")
+
+        with self.lock:
+            self.stats['tasks'] += 1
+            self.stats['serial_tasks'] += 1
+            self.stats['partitions_completed'] += len(results)
+            self.stats['errors'] += len(errors)
+
+        return {
+            'result': merge(results) if merge else results,
+            'partitions': 1,
+            'completed': len(results),
+            'cancelled': 0,
+            'errors': errors,
+            'complete': not errors,
+            'distributed': False,
+            'duration': time.time() - start_time
+        }
+
+
+# Workloads used by the optimizer and the benchmark
+
+def fit_feature_statistics(rows: Sequence[Sequence[float]]) -> tuple:
+    """Accumulate count, sum and sum of squares per feature (StandardScaler training)"""
+    if not rows:
+        return 0, [], []
+    width = len(rows[0])
+    sums = [0.0] * width
+    squares = [0.0] * width
+    for row in rows:
+        for j in range(width):
+            value = row[j]
+            sums[j] += value
+            squares[j] += value * value
+    return len(rows), sums, squares
+
+
+def merge_feature_statistics(parts: List[tuple]) -> Dict[str, List[float]]:
+    """Combine partial statistics into per-feature mean and standard deviation"""
+    parts = [part for part in parts if part[0]]
+    if not parts:
+        return {'count': 0, 'mean': [], 'std': []}
+    count = sum(part[0] for part in parts)
+    width = len(parts[0][1])
+    sums = [sum(part[1][j] for part in parts) for j in range(width)]
+    squares = [sum(part[2][j] for part in parts) for j in range(width)]
+    mean = [s / count for s in sums]
+    std = [max(0.0, squares[j] / count - mean[j] * mean[j]) ** 0.5 for j in range(width)]
+    return {'count': count, 'mean': mean, 'std': std}
+
+
+def replay_threshold_sweep(samples: Sequence[Sequence[float]], thresholds: Sequence[tuple]) -> List[List[int]]:
+    """
+    Replay (cpu, memory) samples against (cpu_threshold, memory_threshold) pairs
+    and count the actions each pair would have triggered
+    """
+    counts = [[0, 0] for _ in thresholds]
+    for cpu, memory in samples:
+        for k, (cpu_threshold, memory_threshold) in enumerate(thresholds):
+            if cpu > cpu_threshold:
+                counts[k][0] += 1
+            if memory > memory_threshold:
+                counts[k][1] += 1
+    return counts
+
+
+def merge_threshold_sweeps(parts: List[List[List[int]]]) -> List[List[int]]:
+    """Sum the action counts of replayed trace partitions"""
+    if not parts:
+        return []
+    merged = [list(pair) for pair in parts[0]]
+    for part in parts[1:]:
+        for k, (cpu_actions, memory_actions) in enumerate(part):
+            merged[k][0] += cpu_actions
+            merged[k][1] += memory_actions
+    return merged
+
+
+def benchmark_distribution(local_workers: Optional[int] = None, socket_workers: int = 2,
+                           sizes: Sequence[int] = (5000, 50000, 200000),
+                           seed: int = 42) -> Dict[str, Dict[str, Any]]:
+    """
+    Time the training and trace-replay workloads serially and distributed at
+    several sizes, and estimate the break-even size for this machine.
+
+    Serial time grows as a * n; distributed time as c + b * n, where c is the
+    fixed cost of a run and b the per-item cost of pickling plus the work
+    shared across workers. The pool pays off above c / (a - b) items, and
+    never when b >= a (e.g. on a single CPU, or when an item is cheaper to
+    process than to send).
+    """
+    import random
+    rng = random.Random(seed)
+    rows = max(sizes)
+    training_rows = [[rng.uniform(0, 100) for _ in range(9)] for _ in range(rows)]
+    trace = [(rng.uniform(0, 100), rng.uniform(20, 100)) for _ in range(rows)]
+    thresholds = [(cpu, memory) for cpu in range(50, 100, 5) for memory in range(60, 100, 5)]
+    replay = partial(replay_threshold_sweep, thresholds=thresholds)
+
+    workloads = {
+        'model_training': (fit_feature_statistics, merge_feature_statistics, training_rows),
+        'trace_replay': (replay, merge_threshold_sweeps, trace),
+    }
+
+    distributor = LocalWorkDistributor(local_workers=local_workers, socket_workers=socket_workers)
+    distributor.start()
+    results = {}
+    try:
+        for name, (function, merge, items) in workloads.items():
+            timings = []
+            for size in sorted(sizes):
+                subset = items[:size]
+                start = time.perf_counter()
+                merge([function(subset)])
+                serial = time.perf_counter() - start
+
+                start = time.perf_counter()
+                outcome = distributor.run(function, subset, merge=merge, serial_below=0)
+                distributed = time.perf_counter() - start
+
+                timings.append({
+                    'rows': size,
+                    'serial_seconds': serial,
+                    'distributed_seconds': distributed,
+                    'speedup': serial / distributed if distributed else 0.0,
+                    'complete': outcome['complete']
+                })
+
+            first, last = timings[0], timings[-1]
+            serial_per_item = last['serial_seconds'] / last['rows']
+            span = (last['rows'] - first['rows']) or 1
+            distributed_per_item = (last['distributed_seconds'] - first['distributed_seconds']) / span
+            fixed_cost = max(0.0, first['distributed_seconds'] - distributed_per_item * first['rows'])
+            break_even = (int(fixed_cost / (serial_per_item - distributed_per_item))
+                          if serial_per_item > distributed_per_item else None)
+
+            results[name] = {
+                'workers': len(distributor.workers),
+                'timings': timings,
+                'serial_us_per_item': serial_per_item * 1e6,
+                'distributed_us_per_item': distributed_per_item * 1e6,
+                'fixed_cost_ms': fixed_cost * 1e3,
+                'break_even_rows': break_even
+            }
+    finally:
+        distributor.shutdown()
+    return results
+
+
+# Example usage
+if __name__ == "__main__":
+    for workload, report in benchmark_distribution().items():
+        print(f"{workload} on {report['workers']} workers ({os.cpu_count()} CPUs):")
+        for timing in report['timings']:
+            print(f"  {timing['rows']:>7} rows: serial {timing['serial_seconds']:.3f}s, "
+                  f"distributed {timing['distributed_seconds']:.3f}s (speedup {timing['speedup']:.2f}x)")
+        break_even = report['break_even_rows']
+        print(f"  {report['serial_us_per_item']:.2f} us/row serial, {report['distributed_us_per_item']:.2f} us/row "
+              f"distributed + {report['fixed_cost_ms']:.1f} ms per run; "
+              + (f"break-even at about {break_even} rows" if break_even is not None
+                 else "the pool never pays off on this machine"))